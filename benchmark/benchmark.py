@@ -44,6 +44,62 @@ for i in range({n}):
     t_deque_pop = timeit.timeit(deque_pop_stmt, setup=deque_setup, number=10)
     print(f"  deque:    {t_deque_pop:.5f} sec")
 
+    print(f"Build from values (n={n}):")
+    t_dllist_build = timeit.timeit(
+        f"Dllist.from_iterable(0, range({n}))", setup=dlist_setup, number=100
+    )
+    print(f"  Dllist:  {t_dllist_build:.5f} sec")
+    t_dllist_loop = timeit.timeit(
+        f"d = Dllist(0)\nfor i in range({n}):\n    d.append(Dllink(i))",
+        setup=dlist_setup,
+        number=100,
+    )
+    print(f"  Dllist (append loop):  {t_dllist_loop:.5f} sec")
+    t_deque_build = timeit.timeit(f"deque(range({n}))", setup=deque_setup, number=100)
+    print(f"  deque:    {t_deque_build:.5f} sec")
+
+    print(f"Full forward scan (n={n}):")
+    t_dllist_iter = timeit.timeit(
+        "for node in dlist: pass", setup=dlist_setup, number=100
+    )
+    print(f"  Dllist:  {t_dllist_iter:.5f} sec")
+    t_deque_iter = timeit.timeit("for x in dque: pass", setup=deque_setup, number=100)
+    print(f"  deque:    {t_deque_iter:.5f} sec")
+
+
+def benchmark_dllink_pool():
+    """Compare fresh Dllink allocation with recycling through DllinkPool."""
+
+    print("\n=== Dllink churn: fresh nodes vs DllinkPool ===")
+
+    n = 1000
+
+    setup = """
+import gc
+from mywheel import Dllist, Dllink, DllinkPool
+dlist = Dllist(0)
+pool = DllinkPool()
+"""
+    fresh_stmt = f"""
+for i in range({n}):
+    dlist.append(Dllink(i))
+while not dlist.is_empty():
+    dlist.popleft()
+"""
+    pool_stmt = f"""
+for i in range({n}):
+    dlist.append(pool.acquire(i))
+while not dlist.is_empty():
+    pool.release(dlist.popleft())
+"""
+
+    # timeit turns the garbage collector off, which would hide the allocation cost.
+    # Running the statement once in the setup also fills the pool.
+    print(f"Append then pop {n} nodes, 1000 rounds:")
+    for name, stmt in [("fresh", fresh_stmt), ("pool", pool_stmt)]:
+        t = timeit.timeit(stmt, setup=setup + stmt + "gc.enable()", number=1000)
+        print(f"  {name}:    {t:.5f} sec")
+
 
 def benchmark_bpqueue_vs_heapq():
     """Compare BPQueue with heapq for bounded integer keys."""
@@ -54,6 +110,45 @@ def benchmark_bpqueue_vs_heapq():
     print("      See documentation for performance characteristics.")
 
 
+def benchmark_dial_vs_heapq():
+    """Compare Dial's bucket-based shortest paths with a heapq-based Dijkstra."""
+
+    print("\n=== dial_shortest_paths vs heapq Dijkstra (weights <= 64) ===")
+
+    n = 20000
+    setup = f"""
+import heapq
+import random
+from mywheel import dial_shortest_paths
+
+rng = random.Random(42)
+graph = [
+    {{rng.randrange({n}): rng.randint(1, 64) for _ in range(6)}} for _ in range({n})
+]
+
+def dijkstra(graph, source):
+    dist = [None] * len(graph)
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d != dist[u]:
+            continue
+        for v, w in graph[u].items():
+            old = dist[v]
+            if old is None or d + w < old:
+                dist[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+    return dist
+"""
+
+    print(f"Single-source distances (n={n}, degree 6):")
+    t_dial = timeit.timeit("dial_shortest_paths(graph, 0, 64)", setup=setup, number=5)
+    print(f"  Dial:     {t_dial:.5f} sec")
+    t_heapq = timeit.timeit("dijkstra(graph, 0)", setup=setup, number=5)
+    print(f"  heapq:    {t_heapq:.5f} sec")
+
+
 def benchmark_robin_iteration():
     """Benchmark Robin round-robin iteration."""
 
@@ -83,7 +178,9 @@ def run_all_benchmarks():
     print()
 
     benchmark_dllist_vs_deque()
+    benchmark_dllink_pool()
     benchmark_bpqueue_vs_heapq()
+    benchmark_dial_vs_heapq()
     benchmark_robin_iteration()
 
     print("\n" + "=" * 50)
@@ -1,9 +1,27 @@
 from importlib.metadata import PackageNotFoundError, version
 
+from .array_bpqueue import ArrayBPQueue
 from .array_like import RepeatArray, ShiftArray
-from .bpqueue import BPQueue, BPQueueIterator, Item
-from .dllist import Dllink, Dllist, DllIterator
+from .bpqueue import (
+    BitmapBPQueue,
+    BPQueue,
+    BPQueueIterator,
+    CountingBPQueue,
+    DoubleEndedBPQueue,
+    GrowableBPQueue,
+    Item,
+    PolicyBPQueue,
+)
+from .bpqueue_set import BPQueueSet
+from .dial import dial_shortest_paths
+from .dllist import Dllink, DllinkPool, Dllist, DllIterator, DllPool
+from .indexed_dllist import IndexedDllist
+from .instrument import InstrumentedBPQueue, InstrumentedDllist, OpStats
+from .journal import Journal, JournaledBPQueue, JournaledDllist
 from .map_adapter import MapAdapter
+from .multi_dllist import MultiDllink, MultiDllist
+from .quantized_bpqueue import QItem, QuantizedBPQueue
+from .radix_heap import RadixHeap
 from .robin import Robin, RobinIterator, SlNode
 
 try:
@@ -24,10 +42,36 @@ __all__ = [
     "Dllist",
     "Dllink",
     "DllIterator",
+    "DllPool",
+    "DllinkPool",
+    "IndexedDllist",
+    "MultiDllink",
+    "MultiDllist",
     # Bounded priority queue
     "BPQueue",
+    "BitmapBPQueue",
+    "DoubleEndedBPQueue",
+    "GrowableBPQueue",
+    "CountingBPQueue",
+    "PolicyBPQueue",
     "BPQueueIterator",
     "Item",
+    "ArrayBPQueue",
+    "BPQueueSet",
+    "QuantizedBPQueue",
+    "QItem",
+    # Undo log
+    "Journal",
+    "JournaledDllist",
+    "JournaledBPQueue",
+    # Instrumentation
+    "OpStats",
+    "InstrumentedBPQueue",
+    "InstrumentedDllist",
+    # Radix heap
+    "RadixHeap",
+    # Shortest paths
+    "dial_shortest_paths",
     # Map adapter
     "MapAdapter",
     # Array-like utilities
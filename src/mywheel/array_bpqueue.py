@@ -0,0 +1,498 @@
+"""
+ArrayBPQueue (Struct-of-Arrays Bounded Priority Queue)
+
+This code implements a variant of the Bounded Priority Queue (BPQueue) in which the items are
+plain integer handles instead of doubly-linked list node objects. It is meant for the same
+kind of workload as BPQueue, such as the gain buckets of the FM partitioning algorithm, but
+for problems that are large enough that the memory spent on one Python object (and one
+two-element list) per item starts to matter.
+
+The ArrayBPQueue takes three inputs when initialized: a lower bound (a) and an upper bound (b)
+for the priority range, and the number of items (n). Items are identified by the integers
+0 to n - 1, so a vertex id can be used directly as an item.
+
+Instead of keeping the next and previous pointers and the key inside every node, the queue
+keeps three columns: `_next`, `_prev` and `_key`, each stored in an `array.array`. The first n
+slots of the link columns belong to the items, and the remaining slots are the heads of the
+buckets, one per priority level. A bucket is therefore a circular doubly-linked list threaded
+through the same arrays, and linking or unlinking an item only touches a few array cells.
+
+Apart from the handles, the public interface mirrors BPQueue: items can be appended at either
+end of their bucket, the item with the highest key can be popped, keys can be modified, and
+the queue can be iterated in descending key order. As with Dllink, an item whose next pointer
+refers to itself is considered locked, and `modify_key` leaves it alone.
+"""
+
+from array import array
+from typing import Iterator
+
+__all__ = ["ArrayBPQueue"]
+
+
+class ArrayBPQueue:
+    r"""The `ArrayBPQueue` class is a bounded priority queue over integer handles, with the
+    doubly-linked bucket lists stored as parallel integer arrays.
+
+    Bounded Priority Queue with integer keys in [a..b] and items in [0..n).
+    The `next`/`prev` links of the items and of the bucket heads live in the
+    same arrays: slot `i < n` is item `i`, and slot `n + k` is the head of
+    the bucket with internal key `k`. Bucket 0 is the sentinel, which is
+    marked as non-empty so that the downward scans stop there.
+
+    .. svgbob::
+       :align: center
+
+                  0    1    2         n-1   n   n+1        n+high
+                +----+----+----+ ... +----+----+----+ ... +----+
+          _next |    |    |    |     |    | -1 |    |     |    |
+                +----+----+----+ ... +----+----+----+ ... +----+
+          _prev |    |    |    |     |    |    |    |     |    |
+                +----+----+----+ ... +----+----+----+ ... +----+
+                 \_________ items _________/ \_____ buckets ____/
+                +----+----+----+ ... +----+
+           _key |    |    |    |     |    |
+                +----+----+----+ ... +----+
+
+    Examples:
+        >>> bpq = ArrayBPQueue(-3, 3, 10)
+        >>> bpq.append(4, 2)
+        >>> bpq.append(7, -1)
+        >>> bpq.popleft()
+        4
+        >>> bpq.get_max()
+        -1
+    """
+
+    __slots__ = ("_max", "_offset", "_high", "_num", "_next", "_prev", "_key")
+
+    _max: int
+    _offset: int
+    _high: int
+    _num: int
+    _next: "array[int]"
+    _prev: "array[int]"
+    _key: "array[int]"
+
+    def __init__(self, a: int, b: int, n: int) -> None:
+        """
+        The function initializes an ArrayBPQueue object with a lower bound, an upper bound and the
+        number of items.
+
+        :param a: The lower bound of the range
+        :type a: int
+        :param b: The parameter `b` represents the upper bound of the range
+        :type b: int
+        :param n: The number of items. The items are the integer handles 0 to n - 1
+        :type n: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.is_empty()
+            True
+            >>> bpq.is_locked(2)
+            True
+        """
+        assert a <= b
+        self._max = 0
+        self._offset = a - 1
+        self._high = b - self._offset
+        self._num = n
+        size = n + self._high + 1
+        # every slot refers to itself: items are locked, buckets are empty
+        self._next = array("l", range(size))
+        self._prev = array("l", range(size))
+        self._key = array("l", bytes(self._next.itemsize * n))
+        self._next[n] = -1  # sentinel
+
+    def is_empty(self) -> bool:
+        """
+        The `is_empty` function checks if an ArrayBPQueue object is empty.
+
+        :return: The method is returning a boolean value, indicating whether the object is empty or not.
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.is_empty()
+            True
+        """
+        return self._max == 0
+
+    def get_max(self) -> int:
+        """
+        The `get_max` function returns the maximum key in an ArrayBPQueue object.
+
+        :return: The method `get_max` returns the maximum key, which is an integer.
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.get_max()
+            -4
+        """
+        return self._max + self._offset
+
+    def get_key(self, it: int) -> int:
+        """
+        The `get_key` function returns the external key of an item.
+
+        :param it: The handle of the item
+        :type it: int
+        :return: The key of the item, in the range [a..b].
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.append(1, 2)
+            >>> bpq.get_key(1)
+            2
+        """
+        return self._key[it] + self._offset
+
+    def is_locked(self, it: int) -> bool:
+        """
+        The `is_locked` function returns `True` if the item is locked, and `False` otherwise.
+
+        :param it: The handle of the item
+        :type it: int
+        :return: A boolean value indicating whether the item is locked or not.
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.append(1, 2)
+            >>> bpq.is_locked(1)
+            False
+        """
+        return self._next[it] == it
+
+    def lock(self, it: int) -> None:
+        """
+        The `lock` function locks an item by setting its next link to itself. The item is
+        expected to be detached from the queue already.
+
+        :param it: The handle of the item
+        :type it: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.append(1, 2)
+            >>> bpq.detach(1)
+            >>> bpq.lock(1)
+            >>> bpq.is_locked(1)
+            True
+        """
+        self._next[it] = it
+
+    def clear(self) -> None:
+        """
+        The `clear` function resets the priority queue by clearing all the buckets.
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.append(1, 2)
+            >>> bpq.clear()
+            >>> bpq.is_empty()
+            True
+        """
+        nxt, prv = self._next, self._prev
+        while self._max > 0:
+            head = self._num + self._max
+            nxt[head] = prv[head] = head
+            self._max -= 1
+
+    def set_key(self, it: int, gain: int) -> None:
+        """
+        The function `set_key` sets the internal key of an item by subtracting the offset from the
+        given gain value.
+
+        :param it: The handle of the item
+        :type it: int
+        :param gain: The `gain` parameter is an integer representing the key value that will be set
+                     for the item
+        :type gain: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.set_key(1, 0)
+            >>> bpq._key[1]
+            4
+        """
+        self._key[it] = gain - self._offset
+
+    def appendleft_direct(self, it: int) -> None:
+        """
+        The `appendleft_direct` function appends an item to the front of its bucket using its
+        internal key.
+
+        :param it: The handle of the item
+        :type it: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.set_key(1, 0)
+            >>> bpq.appendleft_direct(1)
+            >>> bpq.get_max()
+            0
+        """
+        assert self._key[it] > 0
+        self.appendleft(it, self._key[it] + self._offset)
+
+    def appendleft(self, it: int, k: int) -> None:
+        """
+        The `appendleft` function appends an item with an external key to the front of its bucket.
+
+        :param it: The handle of the item
+        :type it: int
+        :param k: The parameter `k` represents the external key that is associated with the item being
+                  appended to the ArrayBPQueue
+        :type k: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.appendleft(3, 0)
+            >>> bpq.appendleft(4, 1)
+            >>> bpq.appendleft(0, 0)
+            >>> bpq.get_max()
+            1
+            >>> bpq.popleft()
+            4
+            >>> bpq.popleft()
+            0
+            >>> bpq.popleft()
+            3
+        """
+        assert k > self._offset
+        key = k - self._offset
+        self._key[it] = key
+        if self._max < key:
+            self._max = key
+        nxt, prv = self._next, self._prev
+        head = self._num + key
+        first = nxt[head]
+        nxt[it] = first
+        prv[first] = it
+        nxt[head] = it
+        prv[it] = head
+
+    def append(self, it: int, k: int) -> None:
+        """
+        The `append` function appends an item with an external key to the back of its bucket.
+
+        :param it: The handle of the item
+        :type it: int
+        :param k: The parameter `k` represents the external key that is associated with the item being
+                  appended to the ArrayBPQueue
+        :type k: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.append(3, 0)
+            >>> bpq.append(0, 0)
+            >>> bpq.popleft()
+            3
+            >>> bpq.popleft()
+            0
+        """
+        assert k > self._offset
+        key = k - self._offset
+        self._key[it] = key
+        if self._max < key:
+            self._max = key
+        nxt, prv = self._next, self._prev
+        head = self._num + key
+        last = prv[head]
+        nxt[it] = head
+        prv[head] = it
+        nxt[last] = it
+        prv[it] = last
+
+    def popleft(self) -> int:
+        """
+        The `popleft` function removes and returns the item with the highest key.
+
+        :return: The handle of the removed item.
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.append(3, 0)
+            >>> bpq.append(4, 1)
+            >>> bpq.popleft()
+            4
+            >>> bpq.popleft()
+            3
+            >>> bpq.is_empty()
+            True
+        """
+        assert self._max > 0
+        nxt, prv = self._next, self._prev
+        head = self._num + self._max
+        res = nxt[head]
+        after = nxt[res]
+        nxt[head] = after
+        prv[after] = head
+        while nxt[head] == head:
+            self._max -= 1
+            head -= 1
+        return res
+
+    def decrease_key(self, it: int, delta: int) -> None:
+        """
+        The `decrease_key` function decreases the key of an item by a specified delta and appends
+        it to the back of its new bucket (FIFO).
+
+        :param it: The handle of the item
+        :type it: int
+        :param delta: The parameter "delta" represents how much the key value should be decreased
+        :type delta: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.append(3, 0)
+            >>> bpq.append(4, -1)
+            >>> bpq.decrease_key(3, 1)
+            >>> bpq.get_max()
+            -1
+            >>> bpq.popleft()
+            4
+        """
+        nxt, prv = self._next, self._prev
+        p = prv[it]
+        q = nxt[it]
+        nxt[p] = q
+        prv[q] = p
+        key = self._key[it] - delta
+        assert key > 0
+        assert key <= self._high
+        self._key[it] = key
+        head = self._num + key
+        last = prv[head]
+        nxt[it] = head
+        prv[head] = it
+        nxt[last] = it
+        prv[it] = last  # FIFO
+        if self._max < key:  # item may not be in the queue
+            self._max = key
+            return
+        self._update_max_key()
+
+    def increase_key(self, it: int, delta: int) -> None:
+        """
+        The `increase_key` function increases the key of an item by a specified delta and appends
+        it to the front of its new bucket (LIFO).
+
+        :param it: The handle of the item
+        :type it: int
+        :param delta: The parameter "delta" represents how much the key value should be increased
+        :type delta: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.append(3, 0)
+            >>> bpq.append(4, -1)
+            >>> bpq.increase_key(4, 2)
+            >>> bpq.get_max()
+            1
+            >>> bpq.popleft()
+            4
+        """
+        nxt, prv = self._next, self._prev
+        p = prv[it]
+        q = nxt[it]
+        nxt[p] = q
+        prv[q] = p
+        key = self._key[it] + delta
+        assert key > 0
+        assert key <= self._high
+        self._key[it] = key
+        head = self._num + key
+        first = nxt[head]
+        nxt[it] = first
+        prv[first] = it
+        nxt[head] = it
+        prv[it] = head  # LIFO
+        if self._max < key:
+            self._max = key
+        self._update_max_key()
+
+    def modify_key(self, it: int, delta: int) -> None:
+        """
+        The `modify_key` function modifies the key of an item by a specified delta. Locked items
+        are left untouched.
+
+        :param it: The handle of the item
+        :type it: int
+        :param delta: The parameter "delta" represents the change in the key value of the item
+        :type delta: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.appendleft(1, 0)
+            >>> bpq.modify_key(1, 1)
+            >>> bpq.get_key(1)
+            1
+            >>> bpq.modify_key(1, -2)
+            >>> bpq.get_key(1)
+            -1
+            >>> bpq.modify_key(2, 1)  # locked
+            >>> bpq.get_max()
+            -1
+        """
+        if self._next[it] == it:  # locked
+            return
+        if delta > 0:
+            self.increase_key(it, delta)
+        elif delta < 0:
+            self.decrease_key(it, -delta)
+
+    def detach(self, it: int) -> None:
+        """
+        The `detach` function detaches an item from the priority queue.
+
+        :param it: The handle of the item
+        :type it: int
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.appendleft(1, 0)
+            >>> bpq.detach(1)
+            >>> bpq.is_empty()
+            True
+        """
+        nxt, prv = self._next, self._prev
+        p = prv[it]
+        q = nxt[it]
+        nxt[p] = q
+        prv[q] = p
+        self._update_max_key()
+
+    def _update_max_key(self) -> None:
+        """
+        The `_update_max_key` function updates the maximum key in an ArrayBPQueue object.
+        """
+        nxt = self._next
+        head = self._num + self._max
+        while nxt[head] == head:
+            self._max -= 1
+            head -= 1
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        The function returns an iterator that traverses the item handles in descending key order.
+        Detaching the item that was just returned does not invalidate the iteration.
+
+        :return: An iterator over the item handles.
+
+        Examples:
+            >>> bpq = ArrayBPQueue(-3, 3, 5)
+            >>> bpq.append(3, 0)
+            >>> bpq.append(4, 2)
+            >>> bpq.append(0, 0)
+            >>> list(bpq)
+            [4, 3, 0]
+        """
+        nxt = self._next
+        head = self._num + self._max
+        while head > self._num:
+            curr = nxt[head]
+            while curr != head:
+                following = nxt[curr]
+                yield curr
+                curr = following
+            head -= 1
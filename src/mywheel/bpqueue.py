@@ -31,18 +31,59 @@ indices efficiently, even when the priority range doesn't start at zero.
 
 The BPQueue also includes an iterator (BPQueueIterator) that allows for traversing the items
 in descending priority order. This iterator moves through the buckets from highest to lowest,
-yielding items from each non-empty bucket.
+yielding items from each non-empty bucket. When only a few candidates are needed, the
+`iter_top(k)` and `iter_range(lo, hi)` generators stop early and never visit the buckets
+outside the requested part of the range.
+
+For wide key ranges with sparse occupancy, the BitmapBPQueue subclass keeps one bit per bucket
+telling whether it is occupied, packed into 64-bit machine words. Finding the next non-empty
+bucket then becomes a highest-set-bit lookup instead of a bucket-by-bucket walk.
+
+The DoubleEndedBPQueue subclass also tracks the lowest non-empty bucket, so that both the
+highest-priority and the lowest-priority items can be removed in amortized constant time.
+
+When the key range is not known in advance, the GrowableBPQueue subclass extends its buckets
+at either end as out-of-range keys arrive, instead of failing on them.
+
+The CountingBPQueue subclass keeps the total number of items and the number of items in each
+bucket, for callers that need the length of the queue or a histogram of its keys.
+
+The PolicyBPQueue subclass lets the caller choose at construction where an item goes inside
+its bucket when its key changes: LIFO, FIFO, the FM default of both, or sorted by a secondary
+key, so that experiments with tie-breaking need no re-sorting afterwards.
 
 Overall, the BPQueue provides a specialized data structure that offers efficient operations
 for managing prioritized items within a bounded range, making it useful for scenarios where
 fast priority-based access and modifications are required.
 """
 
-from typing import List
+from array import array
+from itertools import islice, repeat
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from .dllist import Dllink, Dllist
 
-__all__ = ["BPQueue", "BPQueueIterator", "Item"]
+__all__ = [
+    "BPQueue",
+    "BitmapBPQueue",
+    "DoubleEndedBPQueue",
+    "GrowableBPQueue",
+    "CountingBPQueue",
+    "PolicyBPQueue",
+    "BPQueueIterator",
+    "Item",
+]
 
 Item = Dllink[List[int]]
 
@@ -270,6 +311,105 @@ class BPQueue:
             self._max = it.data[0]
         self._bucket[it.data[0]].append(it)
 
+    @classmethod
+    def from_keys(
+        cls,
+        a: int,
+        b: int,
+        items: Iterable[Item],
+        keys: Iterable[int],
+        *args: Any,
+        **kwargs: Any,
+    ) -> "BPQueue":
+        """
+        The `from_keys` function constructs a priority queue with the range [a..b] and loads it
+        with a sequence of items and a parallel sequence of keys in one pass (see `extend`).
+
+        :param a: The lower bound of the range
+        :type a: int
+        :param b: The upper bound of the range
+        :type b: int
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items, e.g. a list or a NumPy array of gains
+        :type keys: Iterable[int]
+        :param args: Extra arguments passed on to the constructor of a subclass
+        :param kwargs: Extra keyword arguments passed on to the constructor of a subclass,
+            e.g. the tie-break policy of a `PolicyBPQueue`
+        :return: The new priority queue.
+
+        Examples:
+            >>> nodes = [Dllink([0, i]) for i in range(4)]
+            >>> bpq = BPQueue.from_keys(-3, 3, nodes, [1, -2, 3, 1])
+            >>> bpq.get_max()
+            3
+            >>> [it.data[1] for it in bpq]
+            [2, 0, 3, 1]
+        """
+        bpq = cls(a, b, *args, **kwargs)
+        bpq.extend(items, keys)
+        return bpq
+
+    def extend(self, items: Iterable[Item], keys: Iterable[int]) -> None:
+        """
+        The `extend` function appends a sequence of items with a parallel sequence of external
+        keys. The result is the same as calling `append` for each pair in turn, but the items are
+        bucketed in one pass, each bucket's chain is linked at once, and the maximum key is
+        updated a single time.
+
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items, e.g. a list or a NumPy array of gains
+        :type keys: Iterable[int]
+
+        Examples:
+            >>> bpq = BPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 9]), 1)
+            >>> bpq.extend([Dllink([0, 5]), Dllink([0, 6])], [1, -1])
+            >>> [it.data[1] for it in bpq]
+            [9, 5, 6]
+        """
+        self._link_chains(items, keys)
+
+    def _link_chains(self, items: Iterable[Item], keys: Iterable[int]) -> List[int]:
+        """
+        The `_link_chains` function does the work of `extend` and returns the internal keys of the
+        buckets that received items.
+
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items
+        :type keys: Iterable[int]
+        :return: The internal keys of the touched buckets.
+        """
+        if hasattr(keys, "tolist"):  # NumPy array
+            keys = keys.tolist()
+        offset = self._offset
+        high = self._high
+        bucket = self._bucket
+        tails: List[Optional[Item]] = [None] * (high + 1)
+        for it, k in zip(items, keys):
+            key = k - offset
+            assert 0 < key <= high
+            it.data[0] = key
+            last = tails[key]
+            if last is None:
+                last = bucket[key].head.prev
+            last.next = it
+            it.prev = last
+            tails[key] = it
+        touched = []
+        for key in range(1, high + 1):
+            tail = tails[key]
+            if tail is not None:
+                head = bucket[key].head
+                tail.next = head
+                head.prev = tail
+                touched.append(key)
+        if touched and self._max < touched[-1]:
+            self._max = touched[-1]
+        return touched
+
     def popleft(self) -> Item:
         """
         The `popleft` function removes and returns the node with the highest key from the BPQueue.
@@ -429,6 +569,53 @@ class BPQueue:
         elif delta < 0:
             self.decrease_key(it, -delta)
 
+    def modify_keys(self, items: Iterable[Item], deltas: Iterable[int]) -> None:
+        """
+        The `modify_keys` function modifies the keys of a sequence of items by a parallel sequence
+        of deltas. The items are relinked exactly as by calling `modify_key` for each pair in turn,
+        but the maximum key is repaired only once at the end.
+
+        :param items: The doubly linked list nodes whose keys are modified
+        :type items: Iterable[Item]
+        :param deltas: The changes of the keys, e.g. a list or a NumPy array
+        :type deltas: Iterable[int]
+
+        Note:
+            Locked items and zero deltas are skipped, as in `modify_key`.
+
+        Examples:
+            >>> bpq = BPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> b = Dllink([0, 4])
+            >>> c = Dllink([0, 5])
+            >>> bpq.extend([a, b, c], [3, 0, -1])
+            >>> bpq.modify_keys([a, b, c], [-4, 0, 2])
+            >>> bpq.get_max()
+            1
+            >>> [it.data[1] for it in bpq]
+            [5, 4, 3]
+        """
+        if hasattr(deltas, "tolist"):  # NumPy array
+            deltas = deltas.tolist()
+        bucket = self._bucket
+        high = self._high
+        top = self._max
+        for it, delta in zip(items, deltas):
+            if it.next is it or delta == 0:  # locked or no change
+                continue
+            it.detach()
+            key = it.data[0] + delta
+            assert 0 < key <= high
+            it.data[0] = key
+            if delta > 0:
+                bucket[key].appendleft(it)  # LIFO
+            else:
+                bucket[key].append(it)  # FIFO
+            if top < key:  # item may not be in the BPQueue
+                top = key
+        self._max = top
+        self._update_max_key()
+
     def detach(self, it: Item) -> None:
         """
         The `detach` function detachs an item from a priority queue.
@@ -449,6 +636,50 @@ class BPQueue:
         it.detach()
         self._update_max_key()
 
+    def merge_bucket(self, src_key: int, dst_key: int) -> None:
+        """
+        The `merge_bucket` function moves all items with the external key `src_key` to the back
+        of the bucket of `dst_key`, in order. The chain of items is relinked in O(1) with
+        `Dllist.splice`; only the stored keys of the moved items have to be rewritten.
+
+        :param src_key: The external key of the items to be moved
+        :type src_key: int
+        :param dst_key: The new external key of the items
+        :type dst_key: int
+
+        Examples:
+            >>> bpq = BPQueue(-3, 3)
+            >>> nodes = [Dllink([0, i]) for i in range(3)]
+            >>> bpq.extend(nodes, [3, 0, 3])
+            >>> bpq.merge_bucket(3, 0)
+            >>> bpq.get_max()
+            0
+            >>> [(it.data[1], it.data[0] + bpq._offset) for it in bpq]
+            [(1, 0), (0, 0), (2, 0)]
+        """
+        src = src_key - self._offset
+        dst = dst_key - self._offset
+        assert 0 < src <= self._high
+        assert 0 < dst <= self._high
+        if src == dst or self._bucket[src].is_empty():
+            return
+        self._move_bucket(src, dst)
+        if self._max < dst:
+            self._max = dst
+        self._update_max_key()
+
+    def _move_bucket(self, src: int, dst: int) -> None:
+        """
+        The `_move_bucket` function rewrites the keys of the items of the non-empty bucket `src`
+        and splices them to the back of bucket `dst` (both internal keys).
+        """
+        head = self._bucket[src].head
+        node = head.next
+        while node is not head:
+            node.data[0] = dst
+            node = node.next
+        self._bucket[dst].splice(self._bucket[src])
+
     def _update_max_key(self) -> None:
         """
         The `_update_max_key` function updates the maximum key in a BPQueue object.
@@ -456,6 +687,196 @@ class BPQueue:
         while self._bucket[self._max].is_empty():
             self._max -= 1
 
+    def _lower_key(self, key: int, low: int = 1) -> int:
+        """
+        The `_lower_key` function returns the highest internal key below `key` whose bucket is
+        not empty. The sentinel bucket 0 is never empty, so the result is 0 if there is none.
+
+        :param key: The internal key to search below
+        :type key: int
+        :param low: The lowest internal key of interest. The search gives up below it and
+                    returns some key less than `low`
+        :type low: int
+        :return: The internal key of the next non-empty bucket.
+
+        Examples:
+            >>> bpq = BPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> bpq.append(a, -2)
+            >>> bpq._lower_key(7)
+            2
+            >>> bpq._lower_key(2)
+            0
+            >>> bpq._lower_key(7, 4)
+            3
+        """
+        key -= 1
+        while key >= low and self._bucket[key].is_empty():
+            key -= 1
+        return key
+
+    def iter_range(self, lo: int, hi: int) -> Iterator[Item]:
+        """
+        The `iter_range` function generates the items with external keys in [lo..hi] in
+        descending order of keys. Buckets above `hi` or below `lo` are never touched, and empty
+        buckets are skipped with `_lower_key` without creating any iterator.
+
+        :param lo: The lowest external key to generate
+        :type lo: int
+        :param hi: The highest external key to generate
+        :type hi: int
+        :return: A generator of the items.
+
+        Note:
+            The yielded item may be detached or moved before resuming the generator, but no
+            other item of its bucket may be.
+
+        Examples:
+            >>> bpq = BPQueue(-3, 3)
+            >>> nodes = [Dllink([0, i]) for i in range(4)]
+            >>> bpq.extend(nodes, [3, 1, 0, -2])
+            >>> [it.data[1] for it in bpq.iter_range(-1, 2)]
+            [1, 2]
+            >>> [it.data[1] for it in bpq.iter_range(-10, 10)]
+            [0, 1, 2, 3]
+        """
+        bucket = self._bucket
+        low = max(lo - self._offset, 1)
+        key = min(hi - self._offset, self._max)
+        if key < low:
+            return
+        if bucket[key].is_empty():
+            key = self._lower_key(key, low)
+        while key >= low:
+            head = bucket[key].head
+            node = head.next
+            while node is not head:
+                nxt = node.next
+                yield node
+                node = nxt
+            key = self._lower_key(key, low)
+
+    def iter_top(self, k: int) -> Iterator[Item]:
+        """
+        The `iter_top` function generates at most `k` items with the highest keys in descending
+        order, e.g. the first few candidate moves of the FM algorithm. It stops as soon as `k`
+        items have been generated or the generator is closed, so the buckets below the last
+        candidate are never visited.
+
+        :param k: The maximum number of items to generate
+        :type k: int
+        :return: A generator of the items.
+
+        Examples:
+            >>> bpq = BPQueue(-3, 3)
+            >>> nodes = [Dllink([0, i]) for i in range(4)]
+            >>> bpq.extend(nodes, [3, 1, 0, -2])
+            >>> [it.data[1] for it in bpq.iter_top(2)]
+            [0, 1]
+            >>> [it.data[1] for it in bpq.iter_top(9)]
+            [0, 1, 2, 3]
+        """
+        return islice(self.iter_range(self._offset + 1, self._max + self._offset), k)
+
+    def to_buffer(self) -> bytes:
+        """
+        The `to_buffer` function encodes the state of the queue as a flat array of 64-bit
+        integers: a header `[a, b, n]` followed by one `(key, id)` pair per item, in descending
+        order of keys and in bucket order within a key, where `id` is `item.data[1]`. Unlike
+        pickling the queue, this takes linear time without recursion over the links.
+
+        :return: The encoded state, in native byte order.
+
+        Examples:
+            >>> bpq = BPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 5]), 1)
+            >>> bpq.append(Dllink([0, 6]), 2)
+            >>> from array import array
+            >>> array("q", bpq.to_buffer()).tolist()
+            [-3, 3, 2, 2, 6, 1, 5]
+        """
+        offset = self._offset
+        bucket = self._bucket
+        buf = array("q", [offset + 1, offset + self._high, 0])
+        key = self._max
+        while key > 0:
+            head = bucket[key].head
+            node = head.next
+            while node is not head:
+                buf.append(key + offset)
+                buf.append(node.data[1])
+                node = node.next
+            key = self._lower_key(key)
+        buf[2] = (len(buf) - 3) >> 1
+        return buf.tobytes()
+
+    def to_arrays(self) -> Tuple["array[int]", "array[int]"]:
+        """
+        The `to_arrays` function exports the external keys and the ids (`item.data[1]`) of the
+        items as two parallel arrays of 64-bit integers, in traversal order, i.e. in descending
+        order of keys and in bucket order within a key. The keys of a bucket are written in one
+        block, so only the ids are collected node by node. The arrays can be handed to NumPy
+        without copying, e.g. with `numpy.frombuffer(keys, dtype=numpy.int64)`.
+
+        :return: The keys and the ids.
+
+        Examples:
+            >>> bpq = BPQueue(-3, 3)
+            >>> bpq.extend([Dllink([0, i]) for i in range(3)], [1, 2, 1])
+            >>> keys, ids = bpq.to_arrays()
+            >>> keys.tolist(), ids.tolist()
+            ([2, 1, 1], [1, 0, 2])
+        """
+        offset = self._offset
+        bucket = self._bucket
+        keys = array("q")
+        ids: List[int] = []
+        append = ids.append
+        key = self._max
+        while key > 0:
+            head = bucket[key].head
+            node = head.next
+            start = len(ids)
+            while node is not head:
+                append(node.data[1])
+                node = node.next
+            keys.extend(repeat(key + offset, len(ids) - start))
+            key = self._lower_key(key)
+        return keys, array("q", ids)
+
+    @classmethod
+    def from_buffer(
+        cls, items: Sequence[Item], buf: bytes, *args: Any, **kwargs: Any
+    ) -> "BPQueue":
+        """
+        The `from_buffer` function restores a queue encoded by `to_buffer`, with the same range,
+        keys and bucket order. The nodes are looked up by id, i.e. the node with id `i` is
+        `items[i]`, and are linked afresh in one pass (see `extend`).
+
+        :param items: The nodes, indexed by their ids
+        :type items: Sequence[Item]
+        :param buf: The encoded state, e.g. read from a file or received from another process
+        :type buf: bytes
+        :param args: Extra arguments passed on to the constructor of a subclass
+        :param kwargs: Extra keyword arguments passed on to the constructor of a subclass,
+            e.g. the tie-break policy of a `PolicyBPQueue`
+        :return: The restored priority queue.
+
+        Examples:
+            >>> nodes = [Dllink([0, i]) for i in range(3)]
+            >>> bpq = BPQueue.from_keys(-3, 3, nodes, [1, 3, 1])
+            >>> buf = bpq.to_buffer()
+            >>> copies = [Dllink([0, i]) for i in range(3)]
+            >>> [it.data for it in BPQueue.from_buffer(copies, buf)]
+            [[7, 1], [5, 0], [5, 2]]
+        """
+        data = array("q")
+        data.frombytes(buf)
+        assert len(data) == 3 + 2 * data[2]
+        bpq = cls(data[0], data[1], *args, **kwargs)
+        bpq.extend([items[i] for i in data[4::2]], data[3::2])
+        return bpq
+
     def __iter__(self) -> "BPQueueIterator":
         """
         The function returns an iterator object for a priority queue.
@@ -465,6 +886,1436 @@ class BPQueue:
         return BPQueueIterator(self)
 
 
+class BitmapBPQueue(BPQueue):
+    r"""The `BitmapBPQueue` class is a bounded priority queue that also keeps an occupancy
+    bitmap of its buckets, so that the next non-empty bucket can be found without walking
+    through the empty ones.
+
+    Bit `k` of the bitmap is set if and only if bucket `k` is not empty. The bits are packed
+    into 64-bit words, so a downward search costs one highest-set-bit lookup per word, i.e.
+    O(range/64) in the worst case instead of O(range). The bitmap is updated on every insert
+    and detach, which makes the subclass worthwhile for wide key ranges with sparse occupancy,
+    such as `BitmapBPQueue(-pmax * deg, pmax * deg)`.
+
+    .. svgbob::
+       :align: center
+
+                  +----+
+                b |high|  0
+                  +----+
+                  |max-|  1 ---> bit set
+                  +----+
+                  |    |  0
+                  +----+
+                  :    :  :
+                  +----+
+                  |2  -|  1
+                  +----+
+                a |1   |  0
+                  +----+
+         sentinel |0   |  1 ---> always set
+                  +----+
+
+    Examples:
+        >>> bpq = BitmapBPQueue(-100, 100)
+        >>> a = Dllink([0, 3])
+        >>> b = Dllink([0, 4])
+        >>> bpq.append(a, 90)
+        >>> bpq.append(b, -90)
+        >>> bpq.popleft().data[1]
+        3
+        >>> bpq.get_max()
+        -90
+    """
+
+    __slots__ = ("_bits",)
+
+    _bits: "array[int]"
+
+    def __init__(self, a: int, b: int) -> None:
+        """
+        The function initializes a BitmapBPQueue object with a lower bound and an upper bound.
+
+        :param a: The lower bound of the range
+        :type a: int
+        :param b: The parameter `b` represents the upper bound of the range
+        :type b: int
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> bpq._bits[0]
+            1
+        """
+        BPQueue.__init__(self, a, b)
+        self._bits = array("Q", bytes(8 * ((self._high >> 6) + 1)))
+        self._bits[0] = 1  # sentinel
+
+    def clear(self) -> None:
+        """
+        The `clear` function resets the priority queue by clearing all the buckets and the bitmap.
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 2)
+            >>> bpq.clear()
+            >>> bpq.is_empty()
+            True
+            >>> bpq._bits[0]
+            1
+        """
+        BPQueue.clear(self)
+        bits = self._bits
+        for i in range(len(bits)):
+            bits[i] = 0
+        bits[0] = 1  # sentinel
+
+    def appendleft(self, it: Item, k: int) -> None:
+        """
+        The `appendleft` function appends an item with an external key to a priority queue and
+        marks its bucket as occupied.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> bpq.appendleft(Dllink([0, 3]), 0)
+            >>> bpq._bits[0]
+            17
+        """
+        BPQueue.appendleft(self, it, k)
+        key = it.data[0]
+        self._bits[key >> 6] |= 1 << (key & 63)
+
+    def append(self, it: Item, k: int) -> None:
+        """
+        The `append` function appends an item with an external key to a priority queue and marks
+        its bucket as occupied.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 3)
+            >>> bpq._bits[0]
+            129
+        """
+        BPQueue.append(self, it, k)
+        key = it.data[0]
+        self._bits[key >> 6] |= 1 << (key & 63)
+
+    def extend(self, items: Iterable[Item], keys: Iterable[int]) -> None:
+        """
+        The `extend` function appends a sequence of items with a parallel sequence of external
+        keys in one pass, and marks the buckets that received items.
+
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items
+        :type keys: Iterable[int]
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> bpq.extend([Dllink([0, 5]), Dllink([0, 6])], [1, -1])
+            >>> bpq._bits[0]
+            41
+        """
+        bits = self._bits
+        for key in self._link_chains(items, keys):
+            bits[key >> 6] |= 1 << (key & 63)
+
+    def popleft(self) -> Item:
+        """
+        The `popleft` function removes and returns the node with the highest key from the queue.
+
+        :return: The method `popleft` returns a `Dllink` object.
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 3)
+            >>> bpq.append(Dllink([0, 4]), -3)
+            >>> bpq.popleft().data[1]
+            3
+            >>> bpq.get_max()
+            -3
+        """
+        bucket = self._bucket[self._max]
+        res = bucket.popleft()
+        if bucket.is_empty():
+            self._unmark(self._max)
+            self._max = self._lower_key(self._max)
+        return res
+
+    def decrease_key(self, it: Item, delta: int) -> None:
+        """
+        The `decrease_key` function decreases the key of an item by a specified delta and updates
+        the item's position in the buckets and the bitmap.
+
+        :param it: it is a reference to an item in a doubly linked list
+        :type it: Item
+        :param delta: How much the key value should be decreased
+        :type delta: int
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> bpq.append(a, 3)
+            >>> bpq.decrease_key(a, 5)
+            >>> bpq.get_max()
+            -2
+        """
+        old = it.data[0]
+        it.detach()
+        if self._bucket[old].is_empty():
+            self._unmark(old)
+        it.data[0] -= delta
+        key = it.data[0]
+        assert key > 0
+        assert key <= self._high
+        self._bucket[key].append(it)  # FIFO
+        self._bits[key >> 6] |= 1 << (key & 63)
+        if self._max < key:  # item may not be in the BPQueue
+            self._max = key
+            return
+        self._update_max_key()
+
+    def increase_key(self, it: Item, delta: int) -> None:
+        """
+        The `increase_key` function increases the key of an item by a specified delta and updates
+        the item's position in the buckets and the bitmap.
+
+        :param it: it is a reference to an item in a doubly linked list
+        :type it: Item
+        :param delta: How much the key value should be increased
+        :type delta: int
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> bpq.append(a, -3)
+            >>> bpq.increase_key(a, 5)
+            >>> bpq.get_max()
+            2
+        """
+        old = it.data[0]
+        it.detach()
+        if self._bucket[old].is_empty():
+            self._unmark(old)
+        it.data[0] += delta
+        key = it.data[0]
+        assert key > 0
+        assert key <= self._high
+        self._bucket[key].appendleft(it)  # LIFO
+        self._bits[key >> 6] |= 1 << (key & 63)
+        if self._max < key:
+            self._max = key
+        self._update_max_key()
+
+    def modify_keys(self, items: Iterable[Item], deltas: Iterable[int]) -> None:
+        """
+        The `modify_keys` function modifies the keys of a sequence of items by a parallel sequence
+        of deltas, keeping the bitmap up to date and repairing the maximum key once at the end.
+
+        :param items: The doubly linked list nodes whose keys are modified
+        :type items: Iterable[Item]
+        :param deltas: The changes of the keys
+        :type deltas: Iterable[int]
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> b = Dllink([0, 4])
+            >>> bpq.extend([a, b], [3, 0])
+            >>> bpq.modify_keys([a, b], [-6, -1])
+            >>> bpq.get_max()
+            -1
+            >>> bpq._bits[0]
+            11
+        """
+        if hasattr(deltas, "tolist"):  # NumPy array
+            deltas = deltas.tolist()
+        bucket = self._bucket
+        bits = self._bits
+        high = self._high
+        top = self._max
+        for it, delta in zip(items, deltas):
+            if it.next is it or delta == 0:  # locked or no change
+                continue
+            old = it.data[0]
+            it.detach()
+            if bucket[old].is_empty():
+                self._unmark(old)
+            key = old + delta
+            assert 0 < key <= high
+            it.data[0] = key
+            if delta > 0:
+                bucket[key].appendleft(it)  # LIFO
+            else:
+                bucket[key].append(it)  # FIFO
+            bits[key >> 6] |= 1 << (key & 63)
+            if top < key:  # item may not be in the BPQueue
+                top = key
+        self._max = top
+        self._update_max_key()
+
+    def detach(self, it: Item) -> None:
+        """
+        The `detach` function detaches an item from the priority queue and clears the bit of its
+        bucket if the bucket becomes empty.
+
+        :param it: The doubly linked list node to be detached
+        :type it: Item
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> bpq.append(a, 0)
+            >>> bpq.detach(a)
+            >>> bpq.is_empty()
+            True
+            >>> bpq._bits[0]
+            1
+        """
+        key = it.data[0]
+        it.detach()
+        if self._bucket[key].is_empty():
+            self._unmark(key)
+        self._update_max_key()
+
+    def _move_bucket(self, src: int, dst: int) -> None:
+        """
+        The `_move_bucket` function moves the items of bucket `src` to bucket `dst` and moves the
+        occupancy bit along with them.
+        """
+        BPQueue._move_bucket(self, src, dst)
+        self._bits[dst >> 6] |= 1 << (dst & 63)
+        self._unmark(src)
+
+    def _unmark(self, key: int) -> None:
+        """
+        The `_unmark` function clears the occupancy bit of a bucket.
+
+        :param key: The internal key of the bucket
+        :type key: int
+        """
+        if key > 0:  # keep the sentinel
+            self._bits[key >> 6] &= ~(1 << (key & 63))
+
+    def _update_max_key(self) -> None:
+        """
+        The `_update_max_key` function updates the maximum key using the occupancy bitmap.
+        """
+        if self._bucket[self._max].is_empty():
+            self._max = self._lower_key(self._max)
+
+    def _lower_key(self, key: int, low: int = 1) -> int:
+        """
+        The `_lower_key` function returns the highest internal key below `key` whose bit is set
+        in the occupancy bitmap. No bucket is touched, so `low` is not needed to bound the search.
+
+        :param key: The internal key to search below
+        :type key: int
+        :param low: The lowest internal key of interest (unused)
+        :type low: int
+        :return: The internal key of the next non-empty bucket.
+
+        Examples:
+            >>> bpq = BitmapBPQueue(-100, 100)
+            >>> bpq.append(Dllink([0, 3]), -99)
+            >>> bpq._lower_key(201)
+            2
+            >>> bpq._lower_key(2)
+            0
+        """
+        bits = self._bits
+        i = key >> 6
+        word = bits[i] & ((1 << (key & 63)) - 1)
+        while word == 0:
+            i -= 1
+            word = bits[i]
+        return (i << 6) + word.bit_length() - 1
+
+
+class DoubleEndedBPQueue(BPQueue):
+    r"""The `DoubleEndedBPQueue` class is a bounded priority queue that tracks both its highest
+    and its lowest non-empty bucket, so that the best and the worst items are both reachable.
+
+    A second sentinel bucket is placed just above the range, mirroring the one at the bottom,
+    so that the upward scan of the minimum key needs no boundary check either. When the queue
+    is empty, the minimum points at this top sentinel.
+
+    .. svgbob::
+       :align: center
+
+         sentinel |high+1|  <--- always non-empty
+                  +------+
+                b |high  |
+                  +------+    +----+    +----+
+                  |max  -|--->|{c}-|--->|{c} |  <--- popleft
+                  +------+    +----+    +----+
+                  :      :
+                  +------+    +----+    +----+
+                  |min  -|--->|{c}-|--->|{c} |  <--- popright
+                  +------+    +----+    +----+
+                a |1     |
+                  +------+
+         sentinel |0     |  <--- always non-empty
+                  +------+
+
+    Examples:
+        >>> bpq = DoubleEndedBPQueue(-3, 3)
+        >>> a = Dllink([0, 3])
+        >>> b = Dllink([0, 4])
+        >>> c = Dllink([0, 5])
+        >>> bpq.extend([a, b, c], [2, -1, 0])
+        >>> bpq.get_max(), bpq.get_min()
+        (2, -1)
+        >>> bpq.popright().data[1]
+        4
+        >>> bpq.get_min()
+        0
+    """
+
+    __slots__ = ("_min",)
+
+    _min: int
+
+    def __init__(self, a: int, b: int) -> None:
+        """
+        The function initializes a DoubleEndedBPQueue object with a lower bound and an upper
+        bound.
+
+        :param a: The lower bound of the range
+        :type a: int
+        :param b: The parameter `b` represents the upper bound of the range
+        :type b: int
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> bpq._bucket[8].is_empty()
+            False
+            >>> bpq.get_min()
+            4
+        """
+        BPQueue.__init__(self, a, b)
+        self._min = self._high + 1
+        self._bucket.append(Dllist([self._min, 4848]))
+        self._bucket[self._min].appendleft(sentinel)  # sentinel
+
+    def get_min(self) -> int:
+        """
+        The `get_min` function returns the minimum key in the queue, or b + 1 if it is empty.
+
+        :return: The minimum key, which is an integer.
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), -2)
+            >>> bpq.get_min()
+            -2
+        """
+        return self._min + self._offset
+
+    def clear(self) -> None:
+        """
+        The `clear` function resets the priority queue by clearing all the buckets.
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), -2)
+            >>> bpq.clear()
+            >>> bpq.get_min()
+            4
+        """
+        BPQueue.clear(self)
+        self._min = self._high + 1
+
+    def appendleft(self, it: Item, k: int) -> None:
+        """
+        The `appendleft` function appends an item with an external key to the front of its bucket.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        BPQueue.appendleft(self, it, k)
+        if self._min > it.data[0]:
+            self._min = it.data[0]
+
+    def append(self, it: Item, k: int) -> None:
+        """
+        The `append` function appends an item with an external key to the back of its bucket.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        BPQueue.append(self, it, k)
+        if self._min > it.data[0]:
+            self._min = it.data[0]
+
+    def extend(self, items: Iterable[Item], keys: Iterable[int]) -> None:
+        """
+        The `extend` function appends a sequence of items with a parallel sequence of external
+        keys in one pass.
+
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items
+        :type keys: Iterable[int]
+        """
+        touched = self._link_chains(items, keys)
+        if touched and self._min > touched[0]:
+            self._min = touched[0]
+
+    def popleft(self) -> Item:
+        """
+        The `popleft` function removes and returns the node with the highest key.
+
+        :return: The method `popleft` returns a `Dllink` object.
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 1)
+            >>> bpq.popleft().data[1]
+            3
+            >>> bpq.get_min()
+            4
+        """
+        res = BPQueue.popleft(self)
+        if self._max == 0:
+            self._min = self._high + 1
+        return res
+
+    def popright(self) -> Item:
+        """
+        The `popright` function removes and returns the node with the lowest key. Within the
+        lowest bucket, the last node is taken.
+
+        :return: The method `popright` returns a `Dllink` object.
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> b = Dllink([0, 4])
+            >>> bpq.extend([a, b], [1, 1])
+            >>> bpq.popright().data[1]
+            4
+            >>> bpq.popright().data[1]
+            3
+            >>> bpq.is_empty()
+            True
+        """
+        bucket = self._bucket[self._min]
+        res = bucket.pop()
+        if bucket.is_empty():
+            self._update_min_key()
+            self._update_max_key()
+        return res
+
+    def decrease_key(self, it: Item, delta: int) -> None:
+        """
+        The `decrease_key` function decreases the key of an item by a specified delta.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: How much the key value should be decreased
+        :type delta: int
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> bpq.append(a, 1)
+            >>> bpq.decrease_key(a, 3)
+            >>> bpq.get_min()
+            -2
+        """
+        BPQueue.decrease_key(self, it, delta)
+        if self._min > it.data[0]:
+            self._min = it.data[0]
+
+    def increase_key(self, it: Item, delta: int) -> None:
+        """
+        The `increase_key` function increases the key of an item by a specified delta.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: How much the key value should be increased
+        :type delta: int
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> bpq.append(a, -2)
+            >>> bpq.increase_key(a, 3)
+            >>> bpq.get_min()
+            1
+        """
+        BPQueue.increase_key(self, it, delta)
+        if self._min > it.data[0]:  # item may not be in the BPQueue
+            self._min = it.data[0]
+        else:
+            self._update_min_key()
+
+    def modify_keys(self, items: Iterable[Item], deltas: Iterable[int]) -> None:
+        """
+        The `modify_keys` function modifies the keys of a sequence of items by a parallel sequence
+        of deltas, repairing the maximum and the minimum key once at the end.
+
+        :param items: The doubly linked list nodes whose keys are modified
+        :type items: Iterable[Item]
+        :param deltas: The changes of the keys
+        :type deltas: Iterable[int]
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> b = Dllink([0, 4])
+            >>> bpq.extend([a, b], [-3, 0])
+            >>> bpq.modify_keys([a, b], [2, -2])
+            >>> bpq.get_min()
+            -2
+        """
+        items = list(items)
+        BPQueue.modify_keys(self, items, deltas)
+        low = self._min
+        for it in items:
+            if it.next is not it and low > it.data[0]:
+                low = it.data[0]
+        self._min = low
+        self._update_min_key()
+
+    def detach(self, it: Item) -> None:
+        """
+        The `detach` function detaches an item from the priority queue.
+
+        :param it: The doubly linked list node to be detached
+        :type it: Item
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> bpq.append(a, 0)
+            >>> bpq.detach(a)
+            >>> bpq.get_min()
+            4
+        """
+        BPQueue.detach(self, it)
+        self._update_min_key()
+
+    def merge_bucket(self, src_key: int, dst_key: int) -> None:
+        """
+        The `merge_bucket` function moves all items with the external key `src_key` to the back
+        of the bucket of `dst_key`, in order.
+
+        :param src_key: The external key of the items to be moved
+        :type src_key: int
+        :param dst_key: The new external key of the items
+        :type dst_key: int
+
+        Examples:
+            >>> bpq = DoubleEndedBPQueue(-3, 3)
+            >>> bpq.extend([Dllink([0, 3]), Dllink([0, 4])], [-1, 2])
+            >>> bpq.merge_bucket(-1, -3)
+            >>> bpq.get_min()
+            -3
+        """
+        BPQueue.merge_bucket(self, src_key, dst_key)
+        dst = dst_key - self._offset
+        if self._min > dst and not self._bucket[dst].is_empty():
+            self._min = dst
+        self._update_min_key()
+
+    def _update_min_key(self) -> None:
+        """
+        The `_update_min_key` function updates the minimum key in a DoubleEndedBPQueue object.
+        """
+        while self._bucket[self._min].is_empty():
+            self._min += 1
+
+
+class GrowableBPQueue(BPQueue):
+    r"""The `GrowableBPQueue` class is a bounded priority queue in auto-grow mode: instead of
+    requiring every key to lie in [a..b], it extends its range whenever a key falls outside.
+
+    The range grows by at least its current size each time, so it takes O(log range) growths to
+    reach its final size. The cost depends on the keys rather than on the number of items: a
+    single far-away key allocates buckets in proportion to its distance from the range. Growing
+    upward only appends buckets, in O(extra) time. Growing downward inserts buckets just above
+    the sentinel and lowers the offset, which shifts the internal keys; the keys stored in the
+    queued items are rewritten accordingly, so it takes O(n + range) time, but no item is
+    relinked and every item keeps its position in its bucket.
+
+    Only the queued items are rewritten. An item that was popped or detached keeps its old
+    internal key after a downward growth, so the key-changing methods reject items that are
+    not in the queue; such items must be re-inserted with `append` or `appendleft`.
+
+    .. svgbob::
+       :align: center
+
+                  +----+
+                  |new |  <--- grown upward
+                  +----+
+                b |high|
+                  +----+
+                  :    :
+                  +----+
+                a |1   |
+                  +----+
+                  |new |  <--- grown downward
+                  +----+
+         sentinel |0   |
+                  +----+
+
+    Examples:
+        >>> bpq = GrowableBPQueue(0, 3)
+        >>> a = Dllink([0, 3])
+        >>> b = Dllink([0, 4])
+        >>> bpq.append(a, 10)
+        >>> bpq.append(b, -10)
+        >>> bpq.get_max()
+        10
+        >>> bpq.increase_key(b, 30)
+        >>> [it.data[1] for it in bpq]
+        [4, 3]
+    """
+
+    __slots__ = ()
+
+    def get_range(self) -> Tuple[int, int]:
+        """
+        The `get_range` function returns the current key range [a..b] of the queue.
+
+        :return: A pair of the lower and the upper bound.
+
+        Examples:
+            >>> bpq = GrowableBPQueue(-3, 3)
+            >>> bpq.get_range()
+            (-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 5)
+            >>> bpq.get_range()
+            (-3, 10)
+        """
+        return self._offset + 1, self._offset + self._high
+
+    def appendleft(self, it: Item, k: int) -> None:
+        """
+        The `appendleft` function appends an item with an external key to the front of its bucket,
+        growing the range if needed.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        if not self._offset < k <= self._offset + self._high:
+            self._grow(k)
+        BPQueue.appendleft(self, it, k)
+
+    def append(self, it: Item, k: int) -> None:
+        """
+        The `append` function appends an item with an external key to the back of its bucket,
+        growing the range if needed.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        if not self._offset < k <= self._offset + self._high:
+            self._grow(k)
+        BPQueue.append(self, it, k)
+
+    def extend(self, items: Iterable[Item], keys: Iterable[int]) -> None:
+        """
+        The `extend` function appends a sequence of items with a parallel sequence of external
+        keys, growing the range once beforehand if needed.
+
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items
+        :type keys: Iterable[int]
+
+        Examples:
+            >>> bpq = GrowableBPQueue(0, 0)
+            >>> bpq.extend([Dllink([0, 3]), Dllink([0, 4])], [-5, 5])
+            >>> bpq.get_range()
+            (-5, 6)
+        """
+        keys = keys.tolist() if hasattr(keys, "tolist") else list(keys)
+        if keys:
+            self._grow(min(keys))
+            self._grow(max(keys))
+        self._link_chains(items, keys)
+
+    def decrease_key(self, it: Item, delta: int) -> None:
+        """
+        The `decrease_key` function decreases the key of an item by a specified delta, growing the
+        range if needed.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: How much the key value should be decreased
+        :type delta: int
+
+        Note:
+            Unlike `BPQueue`, the item must be in the queue: the key of an item outside of it
+            is not rewritten when the range grows downward, so the item must be re-inserted
+            with `append` or `appendleft` instead.
+        """
+        assert it.next is not it and it.prev.next is it  # stale key otherwise
+        self._grow(it.data[0] + self._offset - delta)
+        BPQueue.decrease_key(self, it, delta)
+
+    def increase_key(self, it: Item, delta: int) -> None:
+        """
+        The `increase_key` function increases the key of an item by a specified delta, growing the
+        range if needed.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: How much the key value should be increased
+        :type delta: int
+
+        Note:
+            Unlike `BPQueue`, the item must be in the queue: the key of an item outside of it
+            is not rewritten when the range grows downward, so the item must be re-inserted
+            with `append` or `appendleft` instead.
+        """
+        assert it.next is not it and it.prev.next is it  # stale key otherwise
+        self._grow(it.data[0] + self._offset + delta)
+        BPQueue.increase_key(self, it, delta)
+
+    def modify_keys(self, items: Iterable[Item], deltas: Iterable[int]) -> None:
+        """
+        The `modify_keys` function modifies the keys of a sequence of items by a parallel sequence
+        of deltas, growing the range once beforehand if needed. Locked items are skipped, and
+        every other item must be in the queue (see `decrease_key`).
+
+        :param items: The doubly linked list nodes whose keys are modified
+        :type items: Iterable[Item]
+        :param deltas: The changes of the keys
+        :type deltas: Iterable[int]
+
+        Examples:
+            >>> bpq = GrowableBPQueue(0, 0)
+            >>> a = Dllink([0, 3])
+            >>> b = Dllink([0, 4])
+            >>> bpq.extend([a, b], [0, 0])
+            >>> bpq.modify_keys([a, b], [7, -7])
+            >>> bpq.get_max(), bpq.get_range()
+            (7, (-7, 8))
+        """
+        items = list(items)
+        deltas = deltas.tolist() if hasattr(deltas, "tolist") else list(deltas)
+        lo = hi = None
+        pending: Dict[Item, int] = {}  # running key of each item, which may repeat
+        for it, delta in zip(items, deltas):
+            if it.next is not it and delta != 0:
+                assert it.prev.next is it  # stale key otherwise
+                key = pending.get(it, it.data[0]) + delta
+                pending[it] = key
+                if lo is None or key < lo:
+                    lo = key
+                if hi is None or key > hi:
+                    hi = key
+        if lo is not None and hi is not None:
+            offset = self._offset
+            self._grow(lo + offset)
+            self._grow(hi + offset)
+        BPQueue.modify_keys(self, items, deltas)
+
+    def merge_bucket(self, src_key: int, dst_key: int) -> None:
+        """
+        The `merge_bucket` function moves all items with the external key `src_key` to the back
+        of the bucket of `dst_key`, growing the range first if `dst_key` is outside of it.
+
+        :param src_key: The external key of the items to be moved
+        :type src_key: int
+        :param dst_key: The new external key of the items
+        :type dst_key: int
+
+        Examples:
+            >>> bpq = GrowableBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 2)
+            >>> bpq.merge_bucket(2, 9)
+            >>> bpq.get_max()
+            9
+        """
+        if not self._offset < src_key <= self._offset + self._high:
+            return  # no such items
+        if not self._offset < dst_key <= self._offset + self._high:
+            self._grow(dst_key)
+        BPQueue.merge_bucket(self, src_key, dst_key)
+
+    def _grow(self, k: int) -> None:
+        """
+        The `_grow` function extends the range so that the external key `k` fits in it. The range
+        grows by at least its current size. Growing downward takes O(n + range) time, as the
+        buckets are shifted and the keys of the queued items are rewritten.
+
+        :param k: The external key
+        :type k: int
+        """
+        if k > self._offset + self._high:
+            extra = max(k - self._offset - self._high, self._high)
+            start = self._high + 1
+            self._bucket.extend(Dllist([i, 4848]) for i in range(start, start + extra))
+            self._high += extra
+        elif k <= self._offset:
+            extra = max(self._offset + 1 - k, self._high)
+            self._bucket[1:1] = [Dllist([i, 4848]) for i in range(1, extra + 1)]
+            for key in range(extra + 1, self._max + extra + 1):
+                for it in self._bucket[key]:
+                    it.data[0] += extra
+            if self._max > 0:
+                self._max += extra
+            self._offset -= extra
+            self._high += extra
+
+
+class CountingBPQueue(BPQueue):
+    r"""The `CountingBPQueue` class is a bounded priority queue that also maintains the total
+    number of items and the number of items in every bucket.
+
+    The plain `BPQueue` deliberately keeps no length information, as it is not necessary for
+    the FM algorithm. This subclass is for callers that do need it, e.g. for balance checks or
+    adaptive early termination, without having to iterate the queue to count the candidates.
+
+    .. svgbob::
+       :align: center
+
+                  +----+  +---+
+                b |high|  | 0 |
+                  +----+  +---+    +----+    +----+
+                  |max-|  | 2 |--->|{c}-|--->|{c} |
+                  +----+  +---+    +----+    +----+
+                  :    :  :   :
+                  +----+  +---+    +----+
+                  |2  -|  | 1 |--->|{c} |
+                  +----+  +---+    +----+
+                a |1   |  | 0 |
+                  +----+  +---+
+                         _count
+
+    Examples:
+        >>> bpq = CountingBPQueue(-3, 3)
+        >>> bpq.extend([Dllink([0, i]) for i in range(3)], [1, -2, 1])
+        >>> len(bpq)
+        3
+        >>> bpq.count(1)
+        2
+        >>> bpq.histogram()
+        [0, 1, 0, 0, 2, 0, 0]
+    """
+
+    __slots__ = ("_size", "_count")
+
+    _size: int
+    _count: List[int]
+
+    def __init__(self, a: int, b: int) -> None:
+        """
+        The function initializes a CountingBPQueue object with a lower bound and an upper bound.
+
+        :param a: The lower bound of the range
+        :type a: int
+        :param b: The parameter `b` represents the upper bound of the range
+        :type b: int
+
+        Examples:
+            >>> bpq = CountingBPQueue(-3, 3)
+            >>> len(bpq)
+            0
+        """
+        BPQueue.__init__(self, a, b)
+        self._size = 0
+        self._count = [0] * (self._high + 1)
+
+    def __len__(self) -> int:
+        """
+        The `__len__` function returns the number of items in the queue.
+
+        :return: The number of items.
+        """
+        return self._size
+
+    def count(self, key: int) -> int:
+        """
+        The `count` function returns the number of items with a given external key.
+
+        :param key: The external key
+        :type key: int
+        :return: The number of items in the bucket of `key`.
+
+        Examples:
+            >>> bpq = CountingBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), -3)
+            >>> bpq.count(-3), bpq.count(3)
+            (1, 0)
+        """
+        return self._count[key - self._offset]
+
+    def histogram(self) -> List[int]:
+        """
+        The `histogram` function returns a copy of the per-bucket counts, where entry i is the
+        number of items with key a + i.
+
+        :return: The list of counts for the keys a to b.
+        """
+        return self._count[1:]
+
+    def clear(self) -> None:
+        """
+        The `clear` function resets the priority queue by clearing all the buckets and counters.
+
+        Examples:
+            >>> bpq = CountingBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 2)
+            >>> bpq.clear()
+            >>> len(bpq), bpq.count(2)
+            (0, 0)
+        """
+        BPQueue.clear(self)
+        self._size = 0
+        self._count = [0] * (self._high + 1)
+
+    def appendleft(self, it: Item, k: int) -> None:
+        """
+        The `appendleft` function appends an item with an external key to the front of its bucket.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        BPQueue.appendleft(self, it, k)
+        self._count[it.data[0]] += 1
+        self._size += 1
+
+    def append(self, it: Item, k: int) -> None:
+        """
+        The `append` function appends an item with an external key to the back of its bucket.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        BPQueue.append(self, it, k)
+        self._count[it.data[0]] += 1
+        self._size += 1
+
+    def extend(self, items: Iterable[Item], keys: Iterable[int]) -> None:
+        """
+        The `extend` function appends a sequence of items with a parallel sequence of external
+        keys in one pass, then updates the counters.
+
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items
+        :type keys: Iterable[int]
+        """
+        items = list(items)
+        self._link_chains(items, keys)
+        count = self._count
+        for it in items:
+            count[it.data[0]] += 1
+        self._size += len(items)
+
+    def popleft(self) -> Item:
+        """
+        The `popleft` function removes and returns the node with the highest key.
+
+        :return: The method `popleft` returns a `Dllink` object.
+
+        Examples:
+            >>> bpq = CountingBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 2)
+            >>> _ = bpq.popleft()
+            >>> len(bpq)
+            0
+        """
+        assert not self.is_empty()
+        self._count[self._max] -= 1
+        self._size -= 1
+        return BPQueue.popleft(self)
+
+    def decrease_key(self, it: Item, delta: int) -> None:
+        """
+        The `decrease_key` function decreases the key of an item by a specified delta.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: How much the key value should be decreased
+        :type delta: int
+
+        Examples:
+            >>> bpq = CountingBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> bpq.append(a, 2)
+            >>> bpq.decrease_key(a, 3)
+            >>> bpq.count(2), bpq.count(-1), len(bpq)
+            (0, 1, 1)
+        """
+        if it.next is not it and it.prev.next is it:
+            self._count[it.data[0]] -= 1
+        else:  # item not in the BPQueue (locked, popped or detached)
+            self._size += 1
+        BPQueue.decrease_key(self, it, delta)
+        self._count[it.data[0]] += 1
+
+    def increase_key(self, it: Item, delta: int) -> None:
+        """
+        The `increase_key` function increases the key of an item by a specified delta.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: How much the key value should be increased
+        :type delta: int
+        """
+        if it.next is not it and it.prev.next is it:
+            self._count[it.data[0]] -= 1
+        else:  # item not in the BPQueue (locked, popped or detached)
+            self._size += 1
+        BPQueue.increase_key(self, it, delta)
+        self._count[it.data[0]] += 1
+
+    def modify_keys(self, items: Iterable[Item], deltas: Iterable[int]) -> None:
+        """
+        The `modify_keys` function modifies the keys of a sequence of items by a parallel sequence
+        of deltas, keeping the counters up to date and repairing the maximum key once at the end.
+
+        :param items: The doubly linked list nodes whose keys are modified
+        :type items: Iterable[Item]
+        :param deltas: The changes of the keys
+        :type deltas: Iterable[int]
+
+        Examples:
+            >>> bpq = CountingBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> b = Dllink([0, 4])
+            >>> bpq.extend([a, b], [0, 0])
+            >>> bpq.modify_keys([a, b, a], [1, 2, 1])
+            >>> bpq.count(0), bpq.count(2), len(bpq)
+            (0, 2, 2)
+        """
+        if hasattr(deltas, "tolist"):  # NumPy array
+            deltas = deltas.tolist()
+        bucket = self._bucket
+        count = self._count
+        high = self._high
+        top = self._max
+        for it, delta in zip(items, deltas):
+            if it.next is it or delta == 0:  # locked or no change
+                continue
+            if it.prev.next is it:
+                it.detach()
+                count[it.data[0]] -= 1
+            else:  # popped or detached item, inserted again
+                self._size += 1
+            key = it.data[0] + delta
+            assert 0 < key <= high
+            it.data[0] = key
+            count[key] += 1
+            if delta > 0:
+                bucket[key].appendleft(it)  # LIFO
+            else:
+                bucket[key].append(it)  # FIFO
+            if top < key:
+                top = key
+        self._max = top
+        self._update_max_key()
+
+    def detach(self, it: Item) -> None:
+        """
+        The `detach` function detaches an item from the priority queue. An item that is not in
+        the queue (locked, popped or already detached) is left alone.
+
+        :param it: The doubly linked list node to be detached
+        :type it: Item
+
+        Examples:
+            >>> bpq = CountingBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> bpq.append(a, 0)
+            >>> bpq.detach(a)
+            >>> bpq.detach(a)
+            >>> len(bpq), bpq.count(0)
+            (0, 0)
+        """
+        if it.next is it or it.prev.next is not it:  # not in the BPQueue
+            return
+        self._count[it.data[0]] -= 1
+        self._size -= 1
+        BPQueue.detach(self, it)
+
+    def _move_bucket(self, src: int, dst: int) -> None:
+        """
+        The `_move_bucket` function moves the items of bucket `src` to bucket `dst` and moves
+        their count along with them.
+        """
+        BPQueue._move_bucket(self, src, dst)
+        self._count[dst] += self._count[src]
+        self._count[src] = 0
+
+
+class PolicyBPQueue(BPQueue):
+    r"""The `PolicyBPQueue` class is a bounded priority queue whose order of items inside a
+    bucket follows a tie-break policy chosen at construction:
+
+    - "fm": an item whose key increases goes to the front of its bucket (LIFO) and an item whose
+      key decreases goes to the back (FIFO), exactly like `BPQueue`;
+    - "lifo": every item whose key changes goes to the front of its bucket;
+    - "fifo": every item whose key changes goes to the back of its bucket;
+    - a callable: the items of a bucket are kept in descending order of the secondary key that
+      the callable returns for them, and items with equal secondary keys in FIFO order.
+
+    The policy is resolved once into the insertion functions stored in the queue, so the key
+    updates do not branch on it. The secondary key of an item is read when the item is inserted,
+    so an item whose secondary key changes must be reinserted. Sorted insertion walks the bucket
+    from its back, i.e. it costs O(1) when the items arrive in order and O(bucket size) at worst.
+
+    Examples:
+        >>> bpq = PolicyBPQueue(-3, 3, "fifo")
+        >>> nodes = [Dllink([0, i]) for i in range(3)]
+        >>> bpq.extend(nodes, [0, 1, 0])
+        >>> bpq.increase_key(nodes[0], 1)
+        >>> [it.data[1] for it in bpq]
+        [1, 0, 2]
+        >>> bpq = PolicyBPQueue(-3, 3, lambda it: -it.data[1])
+        >>> bpq.extend(nodes, [0, 0, 0])
+        >>> [it.data[1] for it in bpq]
+        [0, 1, 2]
+    """
+
+    __slots__ = ("_order", "_up", "_down", "_put_front", "_put_back")
+
+    _order: Optional[Callable[[Item], Any]]
+    _up: Callable[[Dllist[List[int]], Item], None]
+    _down: Callable[[Dllist[List[int]], Item], None]
+    _put_front: Callable[[Dllist[List[int]], Item], None]
+    _put_back: Callable[[Dllist[List[int]], Item], None]
+
+    def __init__(
+        self, a: int, b: int, policy: Union[str, Callable[[Item], Any]] = "fm"
+    ) -> None:
+        """
+        The function initializes a PolicyBPQueue object with a lower bound, an upper bound and a
+        tie-break policy.
+
+        :param a: The lower bound of the range
+        :type a: int
+        :param b: The upper bound of the range
+        :type b: int
+        :param policy: "fm", "lifo", "fifo", or a callable returning the secondary key of an item
+        :type policy: Union[str, Callable[[Item], Any]]
+
+        Examples:
+            >>> bpq = PolicyBPQueue(-3, 3, "lifo")
+            >>> bpq.is_empty()
+            True
+            >>> PolicyBPQueue(-3, 3, "random")
+            Traceback (most recent call last):
+            ...
+            ValueError: Unknown tie-break policy: 'random'
+        """
+        BPQueue.__init__(self, a, b)
+        lifo = Dllist.appendleft
+        fifo = Dllist.append
+        if callable(policy):
+            self._order = policy
+            insert = self._insert_sorted
+            self._up = self._down = self._put_front = self._put_back = insert
+            return
+        if policy == "fm":
+            self._up, self._down = lifo, fifo
+        elif policy == "lifo":
+            self._up, self._down = lifo, lifo
+        elif policy == "fifo":
+            self._up, self._down = fifo, fifo
+        else:
+            raise ValueError(f"Unknown tie-break policy: {policy!r}")
+        self._order = None
+        self._put_front, self._put_back = lifo, fifo
+
+    def appendleft(self, it: Item, k: int) -> None:
+        """
+        The `appendleft` function appends an item with an external key to the front of its
+        bucket, or at its place in the bucket under a secondary-key policy.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        assert k > self._offset
+        key = k - self._offset
+        it.data[0] = key
+        if self._max < key:
+            self._max = key
+        self._put_front(self._bucket[key], it)
+
+    def append(self, it: Item, k: int) -> None:
+        """
+        The `append` function appends an item with an external key to the back of its bucket, or
+        at its place in the bucket under a secondary-key policy.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+
+        Examples:
+            >>> bpq = PolicyBPQueue(-3, 3, lambda it: it.data[1] % 2)
+            >>> for i in range(4):
+            ...     bpq.append(Dllink([0, i]), 1)
+            >>> [it.data[1] for it in bpq]
+            [1, 3, 0, 2]
+        """
+        assert k > self._offset
+        key = k - self._offset
+        it.data[0] = key
+        if self._max < key:
+            self._max = key
+        self._put_back(self._bucket[key], it)
+
+    def extend(self, items: Iterable[Item], keys: Iterable[int]) -> None:
+        """
+        The `extend` function appends a sequence of items with a parallel sequence of external
+        keys (see `BPQueue.extend`). Under a secondary-key policy, the items are inserted one by
+        one at their places.
+
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items
+        :type keys: Iterable[int]
+        """
+        if self._order is None:
+            BPQueue.extend(self, items, keys)
+            return
+        if hasattr(keys, "tolist"):  # NumPy array
+            keys = keys.tolist()
+        for it, k in zip(items, keys):
+            self.append(it, k)
+
+    def decrease_key(self, it: Item, delta: int) -> None:
+        """
+        The `decrease_key` function decreases the key of an item by `delta` and places it in its
+        new bucket according to the policy.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: The decrease of the key
+        :type delta: int
+
+        Examples:
+            >>> bpq = PolicyBPQueue(-3, 3, "lifo")
+            >>> nodes = [Dllink([0, i]) for i in range(2)]
+            >>> bpq.extend(nodes, [0, 1])
+            >>> bpq.decrease_key(nodes[1], 1)
+            >>> [it.data[1] for it in bpq]
+            [1, 0]
+        """
+        it.detach()
+        key = it.data[0] - delta
+        assert 0 < key <= self._high
+        it.data[0] = key
+        self._down(self._bucket[key], it)
+        if self._max < key:  # item may not be in the BPQueue
+            self._max = key
+            return
+        self._update_max_key()
+
+    def increase_key(self, it: Item, delta: int) -> None:
+        """
+        The `increase_key` function increases the key of an item by `delta` and places it in its
+        new bucket according to the policy.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: The increase of the key
+        :type delta: int
+        """
+        it.detach()
+        key = it.data[0] + delta
+        assert 0 < key <= self._high
+        it.data[0] = key
+        self._up(self._bucket[key], it)
+        if self._max < key:
+            self._max = key
+        self._update_max_key()
+
+    def modify_keys(self, items: Iterable[Item], deltas: Iterable[int]) -> None:
+        """
+        The `modify_keys` function modifies the keys of a sequence of items by a parallel sequence
+        of deltas, placing each item according to the policy (see `BPQueue.modify_keys`).
+
+        :param items: The doubly linked list nodes whose keys are modified
+        :type items: Iterable[Item]
+        :param deltas: The changes of the keys
+        :type deltas: Iterable[int]
+        """
+        if hasattr(deltas, "tolist"):  # NumPy array
+            deltas = deltas.tolist()
+        bucket = self._bucket
+        high = self._high
+        top = self._max
+        up = self._up
+        down = self._down
+        for it, delta in zip(items, deltas):
+            if it.next is it or delta == 0:  # locked or no change
+                continue
+            it.detach()
+            key = it.data[0] + delta
+            assert 0 < key <= high
+            it.data[0] = key
+            if delta > 0:
+                up(bucket[key], it)
+            else:
+                down(bucket[key], it)
+            if top < key:  # item may not be in the BPQueue
+                top = key
+        self._max = top
+        self._update_max_key()
+
+    def _move_bucket(self, src: int, dst: int) -> None:
+        """
+        The `_move_bucket` function moves the items of bucket `src` to bucket `dst`. Under a
+        secondary-key policy, the items are inserted one by one at their places.
+        """
+        if self._order is None:
+            BPQueue._move_bucket(self, src, dst)
+            return
+        src_list = self._bucket[src]
+        dst_list = self._bucket[dst]
+        while not src_list.is_empty():
+            it = src_list.popleft()
+            it.data[0] = dst
+            self._insert_sorted(dst_list, it)
+
+    def _insert_sorted(self, dll: Dllist[List[int]], it: Item) -> None:
+        """
+        The `_insert_sorted` function inserts an item into a bucket after the last item whose
+        secondary key is not smaller than its own.
+        """
+        order = self._order
+        assert order is not None
+        rank = order(it)
+        head = dll.head
+        node = head.prev
+        while node is not head and order(node) < rank:
+            node = node.prev
+        node.attach(it)
+
+
 class BPQueueIterator:
     """The BPQueueIterator class is a bounded priority queue iterator that allows traversal of the queue in descending order.
 
@@ -541,6 +2392,6 @@ class BPQueueIterator:
                 res = next(self.curitem)
                 return res
             except StopIteration:
-                self.curkey -= 1
+                self.curkey = self.bpq._lower_key(self.curkey)
                 self.curitem = iter(self.bpq._bucket[self.curkey])
         raise StopIteration
@@ -0,0 +1,339 @@
+"""
+BPQueueSet (Set of Bounded Priority Queues with a Global Best Selector)
+
+This code implements a container that owns several Bounded Priority Queues (BPQueue) of the same
+key range and can tell, at any time, which of them holds the highest key. It is meant for the
+K-way variant of the FM partitioning algorithm, where every part k has its own gain bucket
+holding the gains of moving cells into part k, and each move has to pick the best gain over all
+of these buckets.
+
+The BPQueueSet takes three inputs when initialized: the number of parts (K), and the lower
+bound (a) and upper bound (b) of the key range shared by all queues. A cell that currently
+belongs to part p is a candidate for every target part except p. These target parts can be
+enumerated with the `exclude` method, which is backed by the Robin round-robin cycle, so the
+enumeration starts right after p and wraps around.
+
+To avoid calling `get_max()` on every queue for every move, the set keeps a winner tree (a
+small tournament tree) over the queues. Each leaf stands for one queue, and each internal node
+remembers which of its two subtrees has the larger maximum. The root therefore names the queue
+with the global best key, so `best()` is O(1), while any change to a queue is followed by an
+O(log K) replay of the matches on the path from its leaf to the root.
+
+All changes must go through the set (for example `append(k, it, key)` or
+`modify_key(k, it, delta)`), or be followed by a call to `update(k)`, so that the tree stays in
+sync with the queues.
+"""
+
+from typing import Iterable, List, Tuple
+
+from .bpqueue import BPQueue, Item
+from .robin import Robin, RobinIterator
+
+__all__ = ["BPQueueSet"]
+
+
+class BPQueueSet:
+    r"""The `BPQueueSet` class owns one `BPQueue` per part and keeps a winner tree of their
+    maxima, so that the globally best queue is found in O(1) and maintained in O(log K).
+
+    .. svgbob::
+       :align: center
+
+                          +---+
+                          | 2 |  <--- best()
+                          +---+
+                         /     \
+                    +---+       +---+
+                    | 0 |       | 2 |
+                    +---+       +---+
+                    /   \       /   \
+                  +---+ +---+ +---+ +---+
+                  | 0 | | 1 | | 2 | | 3 |
+                  +---+ +---+ +---+ +---+
+                    |     |     |     |
+                   bpq   bpq   bpq   bpq
+
+    Examples:
+        >>> from mywheel.dllist import Dllink
+        >>> qset = BPQueueSet(3, -3, 3)
+        >>> a = Dllink([0, 3])
+        >>> b = Dllink([0, 4])
+        >>> qset.append(1, a, 2)
+        >>> qset.append(2, b, -1)
+        >>> qset.best()
+        (1, 2)
+        >>> qset.pop_best()[1].data[1]
+        3
+        >>> qset.best()
+        (2, -1)
+    """
+
+    __slots__ = ("_queues", "_tree", "_size", "_robin")
+
+    _queues: List[BPQueue]
+    _tree: List[int]
+    _size: int
+    _robin: Robin
+
+    def __init__(self, num_parts: int, a: int, b: int) -> None:
+        """
+        The function initializes a set of `num_parts` empty queues with the key range [a..b].
+
+        :param num_parts: The number of parts, i.e. the number of queues
+        :type num_parts: int
+        :param a: The lower bound of the range
+        :type a: int
+        :param b: The upper bound of the range
+        :type b: int
+
+        Examples:
+            >>> qset = BPQueueSet(3, -3, 3)
+            >>> qset.is_empty()
+            True
+            >>> len(qset)
+            3
+        """
+        assert num_parts > 0
+        self._queues = [BPQueue(a, b) for _ in range(num_parts)]
+        size = 1
+        while size < num_parts:
+            size *= 2
+        self._size = size
+        # leaves hold the queue ids, -1 for padding; internal nodes hold the winners
+        self._tree = [-1] * size + list(range(num_parts)) + [-1] * (size - num_parts)
+        for pos in range(size - 1, 0, -1):
+            self._tree[pos] = self._winner(self._tree[2 * pos], self._tree[2 * pos + 1])
+        self._robin = Robin(num_parts)
+
+    def __len__(self) -> int:
+        """
+        The `__len__` function returns the number of queues in the set.
+
+        :return: The number of queues.
+        """
+        return len(self._queues)
+
+    def __getitem__(self, k: int) -> BPQueue:
+        """
+        The `__getitem__` function returns the queue of part `k`. Changes made directly to the
+        queue must be followed by a call to `update(k)`.
+
+        :param k: The part
+        :type k: int
+        :return: The queue of part `k`.
+
+        Examples:
+            >>> qset = BPQueueSet(3, -3, 3)
+            >>> qset[2].get_max()
+            -4
+        """
+        return self._queues[k]
+
+    def exclude(self, from_part: int) -> RobinIterator:
+        """
+        The `exclude` function enumerates the candidate target parts of a cell in `from_part`,
+        i.e. every part except `from_part`, in round-robin order.
+
+        :param from_part: The part the cell currently belongs to
+        :type from_part: int
+        :return: An iterator over the other parts.
+
+        Examples:
+            >>> qset = BPQueueSet(4, -3, 3)
+            >>> list(qset.exclude(2))
+            [3, 0, 1]
+        """
+        return self._robin.exclude(from_part)
+
+    def is_empty(self) -> bool:
+        """
+        The `is_empty` function checks whether all queues are empty.
+
+        :return: True if every queue is empty.
+        """
+        return self._queues[self._tree[1]].is_empty()
+
+    def best(self) -> Tuple[int, int]:
+        """
+        The `best` function returns the queue holding the highest key and that key.
+
+        :return: A pair of the part and its maximum key.
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> qset = BPQueueSet(3, -3, 3)
+            >>> qset.append(0, Dllink([0, 3]), 1)
+            >>> qset.append(2, Dllink([0, 4]), 1)
+            >>> qset.best()
+            (0, 1)
+        """
+        k = self._tree[1]
+        return k, self._queues[k].get_max()
+
+    def get_max(self) -> int:
+        """
+        The `get_max` function returns the highest key over all queues.
+
+        :return: The global maximum key.
+        """
+        return self._queues[self._tree[1]].get_max()
+
+    def pop_best(self) -> Tuple[int, Item]:
+        """
+        The `pop_best` function removes and returns the item with the highest key over all
+        queues, together with the part of the queue it was taken from.
+
+        :return: A pair of the part and the removed item.
+        """
+        k = self._tree[1]
+        res = self._queues[k].popleft()
+        self.update(k)
+        return k, res
+
+    def append(self, k: int, it: Item, key: int) -> None:
+        """
+        The `append` function appends an item with an external key to the queue of part `k`.
+
+        :param k: The part
+        :type k: int
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param key: The external key of the item
+        :type key: int
+        """
+        self._queues[k].append(it, key)
+        self.update(k)
+
+    def appendleft(self, k: int, it: Item, key: int) -> None:
+        """
+        The `appendleft` function appends an item with an external key to the front of its bucket
+        in the queue of part `k`.
+
+        :param k: The part
+        :type k: int
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param key: The external key of the item
+        :type key: int
+        """
+        self._queues[k].appendleft(it, key)
+        self.update(k)
+
+    def extend(self, k: int, items: Iterable[Item], keys: Iterable[int]) -> None:
+        """
+        The `extend` function bulk-loads the queue of part `k` (see `BPQueue.extend`).
+
+        :param k: The part
+        :type k: int
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items
+        :type keys: Iterable[int]
+        """
+        self._queues[k].extend(items, keys)
+        self.update(k)
+
+    def popleft(self, k: int) -> Item:
+        """
+        The `popleft` function removes and returns the item with the highest key in the queue of
+        part `k`.
+
+        :param k: The part
+        :type k: int
+        :return: The removed item.
+        """
+        res = self._queues[k].popleft()
+        self.update(k)
+        return res
+
+    def modify_key(self, k: int, it: Item, delta: int) -> None:
+        """
+        The `modify_key` function modifies the key of an item in the queue of part `k`.
+
+        :param k: The part
+        :type k: int
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: The change of the key
+        :type delta: int
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> qset = BPQueueSet(3, -3, 3)
+            >>> a = Dllink([0, 3])
+            >>> qset.append(0, a, -2)
+            >>> qset.append(1, Dllink([0, 4]), 0)
+            >>> qset.modify_key(0, a, 3)
+            >>> qset.best()
+            (0, 1)
+        """
+        self._queues[k].modify_key(it, delta)
+        self.update(k)
+
+    def modify_keys(self, k: int, items: Iterable[Item], deltas: Iterable[int]) -> None:
+        """
+        The `modify_keys` function modifies the keys of many items in the queue of part `k` (see
+        `BPQueue.modify_keys`).
+
+        :param k: The part
+        :type k: int
+        :param items: The doubly linked list nodes
+        :type items: Iterable[Item]
+        :param deltas: The changes of the keys
+        :type deltas: Iterable[int]
+        """
+        self._queues[k].modify_keys(items, deltas)
+        self.update(k)
+
+    def detach(self, k: int, it: Item) -> None:
+        """
+        The `detach` function detaches an item from the queue of part `k`.
+
+        :param k: The part
+        :type k: int
+        :param it: The doubly linked list node to be detached
+        :type it: Item
+        """
+        self._queues[k].detach(it)
+        self.update(k)
+
+    def clear(self) -> None:
+        """
+        The `clear` function clears all queues.
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> qset = BPQueueSet(3, -3, 3)
+            >>> qset.append(1, Dllink([0, 3]), 1)
+            >>> qset.clear()
+            >>> qset.is_empty()
+            True
+        """
+        for k, bpq in enumerate(self._queues):
+            bpq.clear()
+            self.update(k)
+
+    def update(self, k: int) -> None:
+        """
+        The `update` function replays the matches on the path from the leaf of part `k` to the
+        root, after the maximum of its queue may have changed.
+
+        :param k: The part
+        :type k: int
+        """
+        tree = self._tree
+        pos = (self._size + k) >> 1
+        while pos > 0:
+            tree[pos] = self._winner(tree[2 * pos], tree[2 * pos + 1])
+            pos >>= 1
+
+    def _winner(self, i: int, j: int) -> int:
+        """
+        The `_winner` function returns whichever of two queues has the larger maximum. On a tie,
+        the first one wins, and padding leaves (-1) always lose.
+        """
+        if j < 0:
+            return i
+        if i < 0:
+            return j
+        return i if self._queues[i]._max >= self._queues[j]._max else j
@@ -0,0 +1,110 @@
+"""
+Dial's Shortest Path Algorithm
+
+This code implements Dial's algorithm, a variant of Dijkstra's single-source shortest path
+algorithm for graphs whose edge weights are small non-negative integers. Instead of a binary
+heap, it uses a bucket queue indexed by distance, which is the same idea as BPQueue, but
+oriented toward the minimum.
+
+The input is a graph, a source vertex and an upper bound on the edge weights. The graph is any
+indexable collection, such as a list of dictionaries, in which `graph[u]` maps each neighbor `v`
+of vertex `u` to the weight of the edge (u, v), and the vertices are the integers 0 to
+len(graph) - 1. The output is a list with the distance of every vertex from the source, or
+None for the vertices that cannot be reached.
+
+Because every tentative distance lies within `max_weight` of the distance currently being
+settled, only `max_weight + 1` buckets are needed: the bucket of distance d is `d % (max_weight
++ 1)`, and the scan for the next non-empty bucket simply wraps around. The buckets are Dllist
+objects and every vertex owns one Dllink node, so lowering the tentative distance of a vertex is
+an O(1) detach followed by an O(1) append, without the stale entries that a heap-based
+implementation would leave behind.
+
+The total running time is O(m + n * C) for n vertices, m edges and maximum weight C, which is
+attractive when C is small, e.g. for routing graphs with weights up to 64.
+"""
+
+from typing import List, Mapping, Optional, Sequence, Union
+
+from .dllist import Dllink, Dllist
+
+__all__ = ["dial_shortest_paths"]
+
+Graph = Union[Sequence[Mapping[int, int]], Mapping[int, Mapping[int, int]]]
+
+
+def dial_shortest_paths(
+    graph: Graph, source: int, max_weight: int
+) -> List[Optional[int]]:
+    r"""The `dial_shortest_paths` function computes the distances from a source vertex to all
+    vertices of a graph with small non-negative integer edge weights.
+
+    .. svgbob::
+       :align: center
+
+        dist % (C + 1)
+             +---+
+           0 |   |
+             +---+    +---+    +---+
+           1 | -|--->| v |--->| w |   <--- current
+             +---+    +---+    +---+
+           2 |   |
+             +---+    +---+
+             : -|--->| x |
+             +---+    +---+
+           C |   |
+             +---+
+               ^
+               `--- wraps around
+
+    :param graph: The graph, where `graph[u]` maps each neighbor of `u` to the edge weight
+    :type graph: Graph
+    :param source: The source vertex
+    :type source: int
+    :param max_weight: An upper bound on the edge weights
+    :type max_weight: int
+    :return: The distance of every vertex from the source, or None if it is unreachable.
+
+    Examples:
+        >>> graph = [{1: 4, 2: 1}, {3: 1}, {1: 2, 3: 5}, {}]
+        >>> dial_shortest_paths(graph, 0, 5)
+        [0, 3, 1, 4]
+        >>> dial_shortest_paths(graph, 3, 5)
+        [None, None, None, 0]
+    """
+    assert max_weight >= 0
+    num_vertices = len(graph)
+    num_buckets = max_weight + 1
+    nodes = [Dllink(v) for v in range(num_vertices)]
+    heads = [Dllist(i).head for i in range(num_buckets)]
+    dist: List[Optional[int]] = [None] * num_vertices
+
+    dist[source] = 0
+    heads[0].attach(nodes[source])
+    pending = 1
+    current = 0
+    idx = 0  # == current % num_buckets
+    while pending > 0:
+        head = heads[idx]
+        while head.next is head:  # empty bucket
+            current += 1
+            idx += 1
+            if idx == num_buckets:
+                idx = 0
+            head = heads[idx]
+        node = head.next
+        node.detach()
+        node.lock()  # settled
+        pending -= 1
+        for v, weight in graph[node.data].items():
+            assert 0 <= weight <= max_weight
+            new_dist = current + weight
+            old_dist = dist[v]
+            if old_dist is None:
+                pending += 1
+            elif new_dist < old_dist:
+                nodes[v].detach()
+            else:
+                continue
+            dist[v] = new_dist
+            heads[new_dist % num_buckets].prev.attach(nodes[v])  # append
+    return dist
@@ -35,16 +35,25 @@ The code also includes an iterator (DllIterator) that allows users to easily tra
 from beginning to end. This is particularly useful for processing all elements in the list in
 order.
 
+For workloads that keep creating and dropping nodes, the DllPool class stores the links of the
+nodes in integer arrays instead of in Dllink objects. A node is then an integer handle taken
+from a free list, and one pool can host many lists, such as the buckets of a priority queue,
+in the same arrays, so that steady-state operation allocates nothing. When ordinary Dllink
+nodes are preferred, the DllinkPool class recycles them instead: released nodes are kept on a
+free list and handed out again by the next allocations.
+
 Overall, this doubly linked list implementation provides a powerful and flexible tool for
 managing collections of data, especially in situations where frequent insertions and deletions
 are needed throughout the list.
 """
 
-from typing import Generic, TypeVar
+from array import array
+from operator import lt
+from typing import Any, Callable, Generic, Iterable, Iterator, List, Optional, TypeVar
 
 T = TypeVar("T")
 
-__all__ = ["Dllink", "DllIterator", "Dllist"]
+__all__ = ["Dllink", "DllIterator", "Dllist", "DllPool", "DllinkPool"]
 
 
 class Dllink(Generic[T]):
@@ -184,8 +193,15 @@ class DllIterator(Generic[T]):
           |         |
          curr      next
 
+    `Dllist` itself iterates with a generator, which is cheaper per step; this class is kept for
+    code that constructs the iterator directly.
     """
 
+    __slots__ = ("link", "curr")
+
+    link: Dllink[T]
+    curr: Dllink[T]
+
     def __init__(self, link: Dllink[T]) -> None:
         """
         The `__init__` function initializes a Dllist object with a given link.
@@ -222,12 +238,11 @@ class DllIterator(Generic[T]):
             >>> id(b) == id(c)
             True
         """
-        if id(self.curr) != id(self.link):
-            res = self.curr
-            self.curr = self.curr.next
-            return res
-        else:
+        res = self.curr
+        if res is self.link:
             raise StopIteration()
+        self.curr = res.next
+        return res
 
 
 class Dllist(Generic[T]):
@@ -270,6 +285,45 @@ class Dllist(Generic[T]):
         """
         self.head = Dllink(data)
 
+    @classmethod
+    def from_nodes(cls, data: T, nodes: Iterable[Dllink[T]]) -> "Dllist[T]":
+        """
+        The `from_nodes` function builds a list from preallocated nodes, in order.
+
+        :param data: The value stored in the head node
+        :type data: T
+        :param nodes: The nodes to be linked. They must not belong to another list
+        :type nodes: Iterable[Dllink[T]]
+        :return: A new list holding the nodes.
+
+        Examples:
+            >>> nodes = [Dllink(i) for i in range(3)]
+            >>> a = Dllist.from_nodes(-1, nodes)
+            >>> [node.data for node in a]
+            [0, 1, 2]
+        """
+        res = cls(data)
+        res.extend(nodes)
+        return res
+
+    @classmethod
+    def from_iterable(cls, data: T, values: Iterable[T]) -> "Dllist[T]":
+        """
+        The `from_iterable` function builds a list with one new node per value, in order.
+
+        :param data: The value stored in the head node
+        :type data: T
+        :param values: The values of the new nodes
+        :type values: Iterable[T]
+        :return: A new list holding the new nodes.
+
+        Examples:
+            >>> a = Dllist.from_iterable(-1, range(4))
+            >>> [node.data for node in reversed(a)]
+            [3, 2, 1, 0]
+        """
+        return cls.from_nodes(data, map(Dllink, values))
+
     def is_empty(self) -> bool:
         """
         The `is_empty` function checks if a doubly linked list is empty.
@@ -339,6 +393,32 @@ class Dllist(Generic[T]):
         """
         self.head.prev.attach(node)
 
+    def extend(self, nodes: Iterable[Dllink[T]]) -> None:
+        """
+        The `extend` function appends a sequence of nodes to the end of the list, in order.
+
+        The nodes are chained with two pointer writes each, and the chain is closed into the
+        list once at the end, instead of relinking the head for every node as `append` does.
+
+        :param nodes: The nodes to be appended. They must not belong to another list
+        :type nodes: Iterable[Dllink[T]]
+
+        Examples:
+            >>> a = Dllist(0)
+            >>> a.append(Dllink(1))
+            >>> a.extend([Dllink(2), Dllink(3)])
+            >>> [node.data for node in a]
+            [1, 2, 3]
+        """
+        head = self.head
+        last = head.prev
+        for node in nodes:
+            last.next = node
+            node.prev = last
+            last = node
+        last.next = head
+        head.prev = last
+
     def popleft(self) -> Dllink[T]:
         """
         The `popleft` function removes and returns the first node in a doubly linked list.
@@ -385,12 +465,193 @@ class Dllist(Generic[T]):
         res.detach()
         return res
 
-    def __iter__(self) -> DllIterator[T]:
+    def splice(self, other: "Dllist[T]") -> None:
+        """
+        The `splice` function moves all nodes of another list to the end of this list, in order,
+        leaving the other list empty. Only the links at the two ends are changed, so it takes
+        O(1) time whatever the length of the lists.
+
+        :param other: The list whose nodes are moved, which must not be this list
+        :type other: Dllist[T]
+
+        .. svgbob::
+           :align: center
+
+                 self                      other
+            +------+   +---+   +---+   +------+   +---+   +---+
+            | head |-->| a |-->| b |   | head |-->| c |-->| d |
+            +------+   +---+   +---+   +------+   +---+   +---+
+                                 |                  ^
+                                 `------------------'
+
+        Examples:
+            >>> a = Dllist(0)
+            >>> b = Dllist(0)
+            >>> a.append(Dllink(1))
+            >>> b.append(Dllink(2))
+            >>> b.append(Dllink(3))
+            >>> a.splice(b)
+            >>> [node.data for node in a]
+            [1, 2, 3]
+            >>> b.is_empty()
+            True
+        """
+        assert other is not self
+        src = other.head
+        first = src.next
+        if first is src:  # nothing to move
+            return
+        last = src.prev
+        head = self.head
+        tail = head.prev
+        tail.next = first
+        first.prev = tail
+        last.next = head
+        head.prev = last
+        src.next = src.prev = src
+
+    def split_after(self, node: Dllink[T]) -> "Dllist[T]":
+        """
+        The `split_after` function cuts the list after `node` in O(1) time: the nodes following
+        `node` are moved, in order, to a new list, which is returned. If `node` is the head, all
+        nodes are moved.
+
+        :param node: The last node to keep in this list, or the head
+        :type node: Dllink[T]
+        :return: A new list holding the nodes after `node`, whose head has the same data as the
+                 head of this list.
+
+        Examples:
+            >>> a = Dllist(0)
+            >>> nodes = [Dllink(i) for i in range(4)]
+            >>> for n in nodes:
+            ...     a.append(n)
+            >>> b = a.split_after(nodes[1])
+            >>> [node.data for node in a]
+            [0, 1]
+            >>> [node.data for node in b]
+            [2, 3]
+        """
+        res = Dllist(self.head.data)
+        head = self.head
+        first = node.next
+        if first is head:  # nothing after node
+            return res
+        last = head.prev
+        new_head = res.head
+        new_head.next = first
+        first.prev = new_head
+        new_head.prev = last
+        last.next = new_head
+        node.next = head
+        head.prev = node
+        return res
+
+    def sort(self, key: Optional[Callable[[T], Any]] = None) -> None:
+        """
+        The `sort` function sorts the nodes of the list in ascending order of their data, or of
+        `key(data)` if a key function is given. The sort is stable.
+
+        This is a bottom-up merge sort that only relinks the existing nodes: runs of length 1,
+        2, 4, ... are merged pairwise in passes over the list until a pass performs a single
+        merge. It takes O(n log n) time and O(1) extra memory. The `next` pointers are rewired
+        while merging and every `prev` pointer is repaired as its node is placed.
+
+        :param key: A function computing the comparison key from the data of a node. It is
+                    called on every comparison
+        :type key: Optional[Callable[[T], Any]]
+
+        Examples:
+            >>> a = Dllist.from_iterable(0, [3, 1, 2])
+            >>> a.sort()
+            >>> [node.data for node in a]
+            [1, 2, 3]
+            >>> a.sort(key=lambda x: -x)
+            >>> [node.data for node in reversed(a)]
+            [1, 2, 3]
+        """
+        head = self.head
+        if head.next is head.prev:  # zero or one node
+            return
+        less: Callable[[Any, Any], bool] = (
+            lt if key is None else lambda a, b: key(a) < key(b)
+        )
+        width = 1
+        while True:
+            p = head.next
+            tail = head
+            num_merges = 0
+            while p is not head:
+                num_merges += 1
+                q = p
+                psize = 0
+                while psize < width and q is not head:
+                    psize += 1
+                    q = q.next
+                qsize = width
+                while psize > 0 or (qsize > 0 and q is not head):
+                    if psize == 0:
+                        e, q = q, q.next
+                        qsize -= 1
+                    elif qsize == 0 or q is head:
+                        e, p = p, p.next
+                        psize -= 1
+                    elif less(q.data, p.data):
+                        e, q = q, q.next
+                        qsize -= 1
+                    else:
+                        e, p = p, p.next
+                        psize -= 1
+                    tail.next = e
+                    e.prev = tail
+                    tail = e
+                p = q
+            tail.next = head
+            head.prev = tail
+            if num_merges <= 1:
+                return
+            width *= 2
+
+    def insert_sorted(
+        self, node: Dllink[T], key: Optional[Callable[[T], Any]] = None
+    ) -> None:
+        """
+        The `insert_sorted` function inserts a node into a list that is sorted in ascending order,
+        after all nodes whose key is not greater than its own. It scans from the tail, so appending
+        in nearly sorted order is cheap.
+
+        :param node: The node to be inserted
+        :type node: Dllink[T]
+        :param key: A function computing the comparison key from the data of a node
+        :type key: Optional[Callable[[T], Any]]
+
+        Examples:
+            >>> a = Dllist.from_iterable(0, [1, 3, 5])
+            >>> a.insert_sorted(Dllink(4))
+            >>> a.insert_sorted(Dllink(0))
+            >>> [node.data for node in a]
+            [0, 1, 3, 4, 5]
         """
-        The `__iter__` function returns an iterator object for a doubly linked list.
+        head = self.head
+        pos = head.prev
+        if key is None:
+            value: Any = node.data
+            while pos is not head and value < pos.data:
+                pos = pos.prev
+        else:
+            value = key(node.data)
+            while pos is not head and value < key(pos.data):
+                pos = pos.prev
+        pos.attach(node)
 
-        :return: The `__iter__` method is returning an instance of the `DllIterator` class, passing
-        `self.head` as an argument.
+    def __iter__(self) -> Iterator[Dllink[T]]:
+        """
+        The `__iter__` function iterates over the nodes of the list from the first to the last.
+
+        The next node is fetched before the current one is handed out, so the current node may be
+        detached (or moved to another list) during the traversal.
+
+        :return: A generator of the nodes.
 
         Examples:
             >>> a = Dllist(3)
@@ -402,7 +663,510 @@ class Dllist(Generic[T]):
             True
 
         """
-        return DllIterator(self.head)
+        head = self.head
+        node = head.next
+        while node is not head:
+            nxt = node.next
+            yield node
+            node = nxt
+
+    def __reversed__(self) -> Iterator[Dllink[T]]:
+        """
+        The `__reversed__` function iterates over the nodes of the list from the last to the first.
+        The current node may be detached during the traversal.
+
+        :return: A generator of the nodes in reverse order.
+
+        Examples:
+            >>> a = Dllist(0)
+            >>> for i in range(3):
+            ...     a.append(Dllink(i))
+            >>> [node.data for node in reversed(a)]
+            [2, 1, 0]
+        """
+        head = self.head
+        node = head.prev
+        while node is not head:
+            prv = node.prev
+            yield node
+            node = prv
+
+    def iter_from(self, node: Dllink[T]) -> Iterator[Dllink[T]]:
+        """
+        The `iter_from` function iterates over the nodes from `node` (inclusive) to the end of the
+        list. Passing the head iterates over the whole list. The current node may be detached
+        during the traversal, e.g. to remove the nodes matching a condition.
+
+        :param node: The node to start from, or the head
+        :type node: Dllink[T]
+        :return: A generator of the nodes.
+
+        Examples:
+            >>> a = Dllist(0)
+            >>> nodes = [Dllink(i) for i in range(5)]
+            >>> for n in nodes:
+            ...     a.append(n)
+            >>> for n in a.iter_from(nodes[2]):
+            ...     if n.data % 2 == 0:
+            ...         n.detach()
+            >>> [n.data for n in a]
+            [0, 1, 3]
+        """
+        head = self.head
+        if node is head:
+            node = head.next
+        while node is not head:
+            nxt = node.next
+            yield node
+            node = nxt
+
+    def to_array(
+        self, field: Optional[int] = None, typecode: str = "q"
+    ) -> "array[Any]":
+        """
+        The `to_array` function exports the data of the nodes, or the element `field` of the data
+        of each node, to an `array.array` in list order. The result can be handed to NumPy
+        without copying, e.g. with `numpy.frombuffer(res, dtype=numpy.int64)` for typecode "q".
+
+        :param field: The index into the data of each node, or None to take the data itself
+        :type field: Optional[int]
+        :param typecode: The typecode of the array, e.g. "q" for integers or "d" for floats
+        :type typecode: str
+        :return: The exported values.
+
+        Examples:
+            >>> a = Dllist.from_iterable([0, 0], [[4, 1], [5, 2]])
+            >>> a.to_array(field=1)
+            array('q', [1, 2])
+            >>> Dllist.from_iterable(0.0, [0.5, 1.5]).to_array(typecode="d")
+            array('d', [0.5, 1.5])
+        """
+        values: List[Any] = []
+        append = values.append
+        head = self.head
+        node = head.next
+        if field is None:
+            while node is not head:
+                append(node.data)
+                node = node.next
+        else:
+            while node is not head:
+                append(node.data[field])  # type: ignore
+                node = node.next
+        return array(typecode, values)
+
+
+class DllPool(Generic[T]):
+    r"""The `DllPool` class is a pool of doubly-linked list nodes stored in parallel integer
+    arrays, hosting any number of circular lists whose nodes are integer handles.
+
+    The first `num_lists` slots are the list heads, and the remaining slots are the nodes. A
+    node is allocated with `alloc` and returned with `free`, which puts it on a free list
+    threaded through the `next` column, so that a workload that keeps appending and popping
+    nodes reuses the same slots without creating any Python object. As with Dllink, a node whose
+    next link refers to itself is locked, i.e. not in any list.
+
+    .. svgbob::
+       :align: center
+
+                 0    1       L-1    L   L+1
+               +----+----+ ... +----+----+----+ ... +----+
+         _next |    |    |     |    |    |    |     |    |
+               +----+----+ ... +----+----+----+ ... +----+
+         _prev |    |    |     |    |    |    |     |    |
+               +----+----+ ... +----+----+----+ ... +----+
+         _data |    |    |     |    |    |    |     |    |
+               +----+----+ ... +----+----+----+ ... +----+
+                \___ list heads ___/ \______ nodes ______/
+
+    Examples:
+        >>> pool = DllPool(2, 4)
+        >>> a = pool.alloc("a")
+        >>> b = pool.alloc("b")
+        >>> pool.append(0, a)
+        >>> pool.append(1, b)
+        >>> pool.get_data(pool.popleft(0))
+        'a'
+        >>> pool.free(a)
+        >>> pool.alloc("c") == a
+        True
+    """
+
+    __slots__ = ("_next", "_prev", "_data", "_free", "_num_lists")
+
+    _next: "array[int]"
+    _prev: "array[int]"
+    _data: List[Any]
+    _free: int
+    _num_lists: int
+
+    def __init__(self, num_lists: int, capacity: int = 0) -> None:
+        """
+        The function initializes a pool with `num_lists` empty lists and room for `capacity`
+        nodes. More nodes are added on demand.
+
+        :param num_lists: The number of lists hosted by the pool
+        :type num_lists: int
+        :param capacity: The number of nodes to preallocate
+        :type capacity: int
+
+        Examples:
+            >>> pool = DllPool(3, 10)
+            >>> pool.is_empty(2)
+            True
+            >>> pool.capacity()
+            10
+        """
+        size = num_lists + capacity
+        self._num_lists = num_lists
+        self._prev = array("l", range(size))
+        # the preallocated nodes are chained on the free list in ascending order
+        self._next = array("l", range(1, size + 1))
+        self._next[:num_lists] = array("l", range(num_lists))
+        if capacity > 0:
+            self._next[size - 1] = -1
+            self._free = num_lists
+        else:
+            self._free = -1
+        self._data = [None] * size
+
+    def capacity(self) -> int:
+        """
+        The `capacity` function returns the number of node slots, allocated or free.
+
+        :return: The number of node slots.
+        """
+        return len(self._next) - self._num_lists
+
+    def alloc(self, data: T) -> int:
+        """
+        The `alloc` function takes a node from the free list, or adds a new slot if the free list
+        is empty, and stores `data` in it. The new node is locked.
+
+        :param data: The data of the node
+        :type data: T
+        :return: The handle of the node.
+
+        Examples:
+            >>> pool = DllPool(1)
+            >>> h = pool.alloc(42)
+            >>> pool.is_locked(h)
+            True
+            >>> pool.capacity()
+            1
+        """
+        h = self._free
+        if h < 0:
+            h = len(self._next)
+            self._next.append(h)
+            self._prev.append(h)
+            self._data.append(data)
+            return h
+        self._free = self._next[h]
+        self._next[h] = self._prev[h] = h
+        self._data[h] = data
+        return h
+
+    def free(self, h: int) -> None:
+        """
+        The `free` function returns a locked node to the free list.
+
+        :param h: The handle of the node
+        :type h: int
+        """
+        assert self._next[h] == h  # not in any list
+        self._data[h] = None
+        self._next[h] = self._free
+        self._free = h
+
+    def get_data(self, h: int) -> T:
+        """
+        The `get_data` function returns the data of a node.
+
+        :param h: The handle of the node
+        :type h: int
+        :return: The data of the node.
+        """
+        return self._data[h]
+
+    def set_data(self, h: int, data: T) -> None:
+        """
+        The `set_data` function replaces the data of a node.
+
+        :param h: The handle of the node
+        :type h: int
+        :param data: The new data of the node
+        :type data: T
+        """
+        self._data[h] = data
+
+    def is_locked(self, h: int) -> bool:
+        """
+        The `is_locked` function checks whether a node is not in any list.
+
+        :param h: The handle of the node
+        :type h: int
+        :return: True if the node is locked.
+        """
+        return self._next[h] == h
+
+    def is_empty(self, lst: int) -> bool:
+        """
+        The `is_empty` function checks if a list is empty.
+
+        :param lst: The list
+        :type lst: int
+        :return: True if the list is empty.
+        """
+        return self._next[lst] == lst
+
+    def clear(self, lst: int) -> None:
+        """
+        The `clear` function empties a list. Its nodes are left as they are, as in Dllist.
+
+        :param lst: The list
+        :type lst: int
+        """
+        self._next[lst] = self._prev[lst] = lst
+
+    def _attach(self, at: int, h: int) -> None:
+        """
+        The `_attach` function links node `h` right after slot `at`.
+        """
+        nxt = self._next
+        after = nxt[at]
+        nxt[h] = after
+        self._prev[after] = h
+        nxt[at] = h
+        self._prev[h] = at
+
+    def appendleft(self, lst: int, h: int) -> None:
+        """
+        The `appendleft` function appends a node to the front of a list.
+
+        :param lst: The list
+        :type lst: int
+        :param h: The handle of the node
+        :type h: int
+        """
+        self._attach(lst, h)
+
+    def append(self, lst: int, h: int) -> None:
+        """
+        The `append` function appends a node to the back of a list.
+
+        :param lst: The list
+        :type lst: int
+        :param h: The handle of the node
+        :type h: int
+
+        Examples:
+            >>> pool = DllPool(1, 3)
+            >>> for x in "xyz":
+            ...     pool.append(0, pool.alloc(x))
+            >>> [pool.get_data(h) for h in pool.iter_list(0)]
+            ['x', 'y', 'z']
+        """
+        self._attach(self._prev[lst], h)
+
+    def detach(self, h: int) -> None:
+        """
+        The `detach` function removes a node from its list. The node is not locked, as with
+        `Dllink.detach`.
+
+        :param h: The handle of the node
+        :type h: int
+        """
+        nxt = self._next[h]
+        prv = self._prev[h]
+        self._prev[nxt] = prv
+        self._next[prv] = nxt
+
+    def lock(self, h: int) -> None:
+        """
+        The `lock` function marks a detached node as not in any list, e.g. before freeing it.
+
+        :param h: The handle of the node
+        :type h: int
+        """
+        self._next[h] = h
+
+    def popleft(self, lst: int) -> int:
+        """
+        The `popleft` function removes and returns the first node of a non-empty list. The node is
+        locked, so it can be freed right away.
+
+        :param lst: The list
+        :type lst: int
+        :return: The handle of the removed node.
+        """
+        h = self._next[lst]
+        self.detach(h)
+        self._next[h] = h
+        return h
+
+    def pop(self, lst: int) -> int:
+        """
+        The `pop` function removes and returns the last node of a non-empty list. The node is
+        locked, so it can be freed right away.
+
+        :param lst: The list
+        :type lst: int
+        :return: The handle of the removed node.
+
+        Examples:
+            >>> pool = DllPool(1)
+            >>> a = pool.alloc("a")
+            >>> b = pool.alloc("b")
+            >>> pool.append(0, a)
+            >>> pool.append(0, b)
+            >>> pool.pop(0) == b
+            True
+        """
+        h = self._prev[lst]
+        self.detach(h)
+        self._next[h] = h
+        return h
+
+    def iter_list(self, lst: int) -> Iterator[int]:
+        """
+        The `iter_list` function generates the handles of the nodes of a list from front to back.
+        The yielded node may be detached before resuming the generator.
+
+        :param lst: The list
+        :type lst: int
+        :return: A generator of handles.
+        """
+        nxt = self._next
+        h = nxt[lst]
+        while h != lst:
+            after = nxt[h]
+            yield h
+            h = after
+
+
+class DllinkPool(Generic[T]):
+    """The `DllinkPool` class is a free list of `Dllink` nodes, for workloads that keep creating
+    and dropping nodes, such as event loops appending to and popping from a `Dllist` or a
+    `BPQueue`.
+
+    A node handed back with `release` is locked and kept, and a later `acquire` returns it with
+    new data instead of constructing a new node. The pool keeps at most `max_free` released nodes
+    (its high-water mark); nodes released beyond that are left to the garbage collector. The
+    `hits` and `misses` counters tell how many `acquire` calls were served from the free list and
+    how many had to construct a node.
+
+    Examples:
+        >>> pool = DllinkPool()
+        >>> a = pool.acquire(3)
+        >>> pool.release(a)
+        >>> b = pool.acquire(4)
+        >>> b is a, b.data, b.is_locked()
+        (True, 4, True)
+        >>> pool.hits, pool.misses
+        (1, 1)
+    """
+
+    __slots__ = ("_free", "_kept", "max_free", "misses")
+
+    _free: List[Dllink[Any]]
+    _kept: int
+    max_free: Optional[int]
+    misses: int
+
+    def __init__(self, max_free: Optional[int] = None) -> None:
+        """
+        The function initializes an empty pool.
+
+        :param max_free: The maximum number of released nodes kept for reuse, or None for no limit
+        :type max_free: Optional[int]
+
+        Examples:
+            >>> pool = DllinkPool(max_free=100)
+            >>> pool.num_free()
+            0
+        """
+        self._free = []
+        self._kept = 0  # the number of nodes ever put on the free list
+        self.max_free = max_free
+        self.misses = 0
+
+    def num_free(self) -> int:
+        """
+        The `num_free` function returns the number of free nodes in the pool.
+
+        :return: The number of nodes that can be acquired without construction.
+        """
+        return len(self._free)
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of `acquire` calls served from the free list. Every node taken off the free
+        list is a hit, so the count is derived instead of being updated in `acquire`.
+        """
+        return self._kept - len(self._free)
+
+    def acquire(self, data: T) -> Dllink[T]:
+        """
+        The `acquire` function returns a locked node holding `data`, reusing a released node if
+        there is one.
+
+        :param data: The data of the node
+        :type data: T
+        :return: The node.
+
+        Examples:
+            >>> pool = DllinkPool()
+            >>> a = pool.acquire([0, 1])
+            >>> a.data
+            [0, 1]
+        """
+        free = self._free
+        if free:
+            node = free.pop()
+            node.data = data
+            return node
+        self.misses += 1
+        return Dllink(data)
+
+    def release(self, node: Dllink[T]) -> None:
+        """
+        The `release` function hands a node back to the pool. The node must have been removed
+        from its list already; its pointers are reset and its data is dropped.
+
+        :param node: The node to be released
+        :type node: Dllink[T]
+
+        Examples:
+            >>> pool = DllinkPool(max_free=1)
+            >>> pool.release(Dllink(1))
+            >>> pool.release(Dllink(2))  # over the high-water mark, not kept
+            >>> pool.num_free()
+            1
+        """
+        free = self._free
+        if self.max_free is not None and len(free) >= self.max_free:
+            return
+        link: Dllink[Any] = node
+        link.next = link.prev = link
+        link.data = None
+        free.append(link)
+        self._kept += 1
+
+    def reset_stats(self) -> None:
+        """
+        The `reset_stats` function sets the `hits` and `misses` counters to zero.
+
+        Examples:
+            >>> pool = DllinkPool()
+            >>> _ = pool.acquire(1)
+            >>> pool.reset_stats()
+            >>> pool.hits, pool.misses
+            (0, 0)
+        """
+        self._kept = len(self._free)
+        self.misses = 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,493 @@
+"""
+IndexedDllist (Doubly Linked List with a Positional Index)
+
+This code implements a doubly linked list that also answers positional queries quickly. The
+plain Dllist has no notion of position, so asking for the i-th node, for the position of a node,
+or splitting a list at its median all require walking the list from the head, which costs O(n)
+time. This is a problem, for example, when a partitioner wants to pick the i-th candidate of a
+waiting list or cut a list of cells in half.
+
+The IndexedDllist is a Dllist with an indexable skip list laid over the same intrusive Dllink
+nodes. About one node in four is promoted into a tower, one in sixteen into a tower of height
+two, and so on. Every level of the towers forms its own circular list that starts at a tower for
+the head, and each link records how many nodes it skips (its width). Finding the i-th node
+descends through the levels, adding up widths, and finishes with a short walk along the plain
+list. Finding the position of a node walks back to the nearest tower and climbs up to the head.
+Both take O(log n) expected time, and so do inserting, detaching and splitting the list at a
+position, which cut or patch one link per level.
+
+The nodes themselves are unchanged, and the list can still be used as a Dllist. Detaching a node
+through the list keeps the index up to date in O(log n) time. A caller that does not need the
+index can also detach nodes directly with `Dllink.detach` in O(1) time, and then call `reindex`
+to rebuild the index in O(n) time before asking positional questions again.
+"""
+
+from random import Random
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from .dllist import Dllink, Dllist
+
+T = TypeVar("T")
+
+__all__ = ["IndexedDllist"]
+
+MAX_HEIGHT = 32
+
+
+class _Tower:
+    """A tower of skip-list links above a promoted node (or above the head of the list).
+
+    On each level `nxt` and `prv` point to the neighbouring towers of the same level, and
+    `width` is the number of positions from this tower to the next one.
+    """
+
+    __slots__ = ("node", "nxt", "prv", "width")
+
+    node: Dllink[Any]
+    nxt: List["_Tower"]
+    prv: List["_Tower"]
+    width: List[int]
+
+    def __init__(self, node: Dllink[Any], height: int) -> None:
+        self.node = node
+        self.nxt = [self] * height
+        self.prv = [self] * height
+        self.width = [1] * height
+
+
+class IndexedDllist(Dllist[T]):
+    r"""The `IndexedDllist` class is a doubly linked list with an indexable skip list over its
+    nodes, giving O(log n) expected time access by position.
+
+    Positions start at 0, as in a Python list. Nodes must be added and removed through the list
+    to keep the index valid. After nodes are linked or unlinked directly, `reindex` must be
+    called before `at`, `index`, `split_at` or any method that updates the index.
+
+    .. svgbob::
+       :align: center
+
+                                          7                          2
+        level 1   head --------------------------------------> G -------> end
+                              3                    4                 2
+        level 0   head --------------> C --------------------> G -------> end
+        nodes     head <-> A <-> B <-> C <-> D <-> E <-> F <-> G <-> H
+
+    Examples:
+        >>> a = IndexedDllist(0, seed=1)
+        >>> nodes = [Dllink(i) for i in range(10)]
+        >>> a.extend(nodes)
+        >>> a.at(7).data
+        7
+        >>> a.index(nodes[4])
+        4
+        >>> b = a.split_at(6)
+        >>> len(a), len(b), b.at(0).data
+        (6, 4, 6)
+    """
+
+    __slots__ = ("_top", "_towers", "_size", "_rng")
+
+    _top: _Tower
+    _towers: Dict[Dllink[T], _Tower]
+    _size: int
+    _rng: Random
+
+    def __init__(self, data: T, seed: Optional[int] = None) -> None:
+        """
+        The function initializes an empty indexed list.
+
+        :param data: The value stored in the head node
+        :type data: T
+        :param seed: The seed for drawing the heights of the towers
+        :type seed: Optional[int]
+
+        Examples:
+            >>> a = IndexedDllist(0)
+            >>> len(a)
+            0
+        """
+        Dllist.__init__(self, data)
+        self._rng = Random(seed)
+        self._reset_index()
+
+    def _reset_index(self) -> None:
+        """
+        The `_reset_index` function drops the index, leaving it as for an empty list.
+        """
+        self._top = _Tower(self.head, 1)
+        self._towers = {}
+        self._size = 0
+
+    def _height(self) -> int:
+        """
+        The `_height` function draws the height of a new tower; it is 0 with probability 3/4.
+        """
+        rng = self._rng
+        h = 0
+        while h < MAX_HEIGHT and rng.getrandbits(2) == 0:
+            h += 1
+        return h
+
+    def __len__(self) -> int:
+        """
+        The `__len__` function returns the number of nodes in the list.
+
+        Examples:
+            >>> a = IndexedDllist(0)
+            >>> a.append(Dllink(3))
+            >>> len(a)
+            1
+        """
+        return self._size
+
+    def _find(self, node: Dllink[T]) -> Tuple[List[_Tower], List[int], int]:
+        """
+        The `_find` function locates a node (or the head) in the index.
+
+        It walks back along the list to the nearest tower and then climbs level by level back to
+        the head. For each level it returns the last tower at or before the node and the distance
+        from that tower to the node, together with the position of the node (the head is at
+        position 0).
+        """
+        top = self._top
+        head = self.head
+        towers = self._towers
+        acc = 0
+        x = node
+        t: Optional[_Tower] = None
+        while x is not head:
+            t = towers.get(x)
+            if t is not None:
+                break
+            x = x.prev
+            acc += 1
+        if t is None:
+            t = top
+        levels = len(top.nxt)
+        preds: List[_Tower] = []
+        gaps: List[int] = []
+        for level in range(levels):
+            while len(t.nxt) <= level:
+                t = t.prv[level - 1]
+                acc += t.width[level - 1]
+            preds.append(t)
+            gaps.append(acc)
+        level = levels - 1
+        while t is not top:
+            t = t.prv[level]
+            acc += t.width[level]
+        return preds, gaps, acc
+
+    def _link_index(self, node: Dllink[T]) -> None:
+        """
+        The `_link_index` function adds to the index a node that has just been linked into the
+        list.
+        """
+        preds, gaps, pos = self._find(node.prev)
+        h = self._height()
+        top = self._top
+        size = self._size
+        while len(top.nxt) < h:
+            top.nxt.append(top)
+            top.prv.append(top)
+            top.width.append(size + 1)
+            preds.append(top)
+            gaps.append(pos)
+        if h == 0:
+            self._towers.pop(node, None)
+        else:
+            tower = _Tower(node, h)
+            self._towers[node] = tower
+        for level, pred in enumerate(preds):
+            if level < h:
+                succ = pred.nxt[level]
+                tower.nxt[level] = succ
+                tower.prv[level] = pred
+                succ.prv[level] = tower
+                pred.nxt[level] = tower
+                tower.width[level] = pred.width[level] - gaps[level]
+                pred.width[level] = gaps[level] + 1
+            else:
+                pred.width[level] += 1
+        self._size = size + 1
+
+    def _unlink_index(self, node: Dllink[T]) -> None:
+        """
+        The `_unlink_index` function removes from the index a node that is about to be unlinked
+        from the list.
+        """
+        preds, gaps, _ = self._find(node.prev)
+        tower = self._towers.pop(node, None)
+        h = 0 if tower is None else len(tower.nxt)
+        for level, pred in enumerate(preds):
+            if level < h:
+                assert tower is not None
+                succ = tower.nxt[level]
+                pred.nxt[level] = succ
+                succ.prv[level] = pred
+                pred.width[level] += tower.width[level] - 1
+            else:
+                pred.width[level] -= 1
+        self._size -= 1
+
+    def reindex(self) -> None:
+        """
+        The `reindex` function rebuilds the index from the nodes of the list in O(n) time, e.g.
+        after nodes have been linked or unlinked directly.
+
+        Examples:
+            >>> a = IndexedDllist(0)
+            >>> nodes = [Dllink(i) for i in range(5)]
+            >>> a.extend(nodes)
+            >>> nodes[1].detach()  # O(1), the index is now stale
+            >>> a.reindex()
+            >>> len(a), a.at(1).data
+            (4, 2)
+        """
+        self._reset_index()
+        top = self._top
+        towers = self._towers
+        last = [top]
+        last_pos = [0]
+        pos = 0
+        for node in Dllist.__iter__(self):
+            pos += 1
+            h = self._height()
+            if h == 0:
+                continue
+            tower = _Tower(node, h)
+            towers[node] = tower
+            while len(last) < h:
+                top.nxt.append(top)
+                top.prv.append(top)
+                top.width.append(1)
+                last.append(top)
+                last_pos.append(0)
+            for level in range(h):
+                pred = last[level]
+                pred.nxt[level] = tower
+                tower.prv[level] = pred
+                pred.width[level] = pos - last_pos[level]
+                last[level] = tower
+                last_pos[level] = pos
+        for level, pred in enumerate(last):
+            pred.nxt[level] = top
+            top.prv[level] = pred
+            pred.width[level] = pos + 1 - last_pos[level]
+        self._size = pos
+
+    def at(self, i: int) -> Dllink[T]:
+        """
+        The `at` function returns the node at position `i` in O(log n) expected time. Negative
+        positions count from the end, as in a Python list.
+
+        :param i: The position of the node
+        :type i: int
+        :return: The node at position `i`.
+        :raises IndexError: If the position is out of range
+
+        Examples:
+            >>> a = IndexedDllist(0)
+            >>> a.extend(Dllink(i) for i in range(3))
+            >>> a.at(-1).data
+            2
+        """
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("IndexedDllist index out of range")
+        rem = i + 1
+        t = self._top
+        for level in reversed(range(len(t.nxt))):
+            while t.width[level] <= rem:
+                rem -= t.width[level]
+                t = t.nxt[level]
+        node = t.node
+        for _ in range(rem):
+            node = node.next
+        return node
+
+    def index(self, node: Dllink[T]) -> int:
+        """
+        The `index` function returns the position of a node of the list in O(log n) expected
+        time.
+
+        :param node: A node of the list
+        :type node: Dllink[T]
+        :return: The position of the node.
+
+        Examples:
+            >>> a = IndexedDllist(0)
+            >>> b = Dllink(5)
+            >>> a.extend([Dllink(4), b])
+            >>> a.index(b)
+            1
+        """
+        return self._find(node)[2] - 1
+
+    def split_at(self, i: int) -> "IndexedDllist[T]":
+        """
+        The `split_at` function moves the nodes from position `i` on to a new indexed list in
+        O(log n) expected time; this list keeps the first `i` nodes.
+
+        :param i: The position of the first node to be moved, from 0 to `len(self)`
+        :type i: int
+        :return: A new list holding the nodes from position `i` on.
+        :raises IndexError: If the position is out of range
+
+        Examples:
+            >>> a = IndexedDllist(0)
+            >>> a.extend(Dllink(i) for i in range(5))
+            >>> b = a.split_at(len(a) // 2)
+            >>> [node.data for node in a], [node.data for node in b]
+            ([0, 1], [2, 3, 4])
+        """
+        size = self._size
+        if not 0 <= i <= size:
+            raise IndexError("IndexedDllist index out of range")
+        last = self.head if i == 0 else self.at(i - 1)
+        preds, gaps, _ = self._find(last)
+        res: IndexedDllist[T] = IndexedDllist(self.head.data)
+        res._rng = self._rng
+        # The towers of both lists stay in one table; every node is only in one of them.
+        res._towers = self._towers
+        top = self._top
+        new_top = res._top = _Tower(res.head, len(preds))
+        for level, pred in enumerate(preds):
+            first = pred.nxt[level]
+            if first is not top:
+                tail = top.prv[level]
+                new_top.nxt[level] = first
+                first.prv[level] = new_top
+                new_top.prv[level] = tail
+                tail.nxt[level] = new_top
+                pred.nxt[level] = top
+                top.prv[level] = pred
+            new_top.width[level] = pred.width[level] - gaps[level]
+            pred.width[level] = gaps[level] + 1
+        res._size = size - i
+        self._size = i
+        Dllist.splice(res, Dllist.split_after(self, last))
+        return res
+
+    def detach(self, node: Dllink[T]) -> None:
+        """
+        The `detach` function removes a node from the list, updating the index.
+
+        :param node: A node of the list
+        :type node: Dllink[T]
+
+        Examples:
+            >>> a = IndexedDllist(0)
+            >>> b = Dllink(3)
+            >>> a.append(b)
+            >>> a.detach(b)
+            >>> len(a)
+            0
+        """
+        self._unlink_index(node)
+        node.detach()
+
+    def clear(self) -> None:
+        """
+        The `clear` function clears all nodes from the list and drops the index.
+        """
+        Dllist.clear(self)
+        self._reset_index()
+
+    def appendleft(self, node: Dllink[T]) -> None:
+        """
+        The `appendleft` function appends a node to the front of the list.
+
+        :param node: The node to be appended
+        :type node: Dllink[T]
+        """
+        Dllist.appendleft(self, node)
+        self._link_index(node)
+
+    def append(self, node: Dllink[T]) -> None:
+        """
+        The `append` function appends a node to the end of the list.
+
+        :param node: The node to be appended
+        :type node: Dllink[T]
+        """
+        Dllist.append(self, node)
+        self._link_index(node)
+
+    def extend(self, nodes: Iterable[Dllink[T]]) -> None:
+        """
+        The `extend` function appends a sequence of nodes to the end of the list.
+
+        :param nodes: The nodes to be appended
+        :type nodes: Iterable[Dllink[T]]
+        """
+        for node in nodes:
+            self.append(node)
+
+    def insert_sorted(
+        self, node: Dllink[T], key: Optional[Callable[[T], Any]] = None
+    ) -> None:
+        """
+        The `insert_sorted` function inserts a node into a sorted list.
+
+        :param node: The node to be inserted
+        :type node: Dllink[T]
+        :param key: A function computing the comparison key from the data of a node
+        :type key: Optional[Callable[[T], Any]]
+        """
+        Dllist.insert_sorted(self, node, key)
+        self._link_index(node)
+
+    def popleft(self) -> Dllink[T]:
+        """
+        The `popleft` function removes and returns the first node of the list.
+
+        :return: The removed node.
+        """
+        res = self.head.next
+        self.detach(res)
+        return res
+
+    def pop(self) -> Dllink[T]:
+        """
+        The `pop` function removes and returns the last node of the list.
+
+        :return: The removed node.
+        """
+        res = self.head.prev
+        self.detach(res)
+        return res
+
+    def splice(self, other: Dllist[T]) -> None:
+        """
+        The `splice` function moves all nodes of another list to the end of this list. The
+        nodes are relinked in O(1) time, but the index is rebuilt in O(n) time.
+
+        :param other: The list whose nodes are moved
+        :type other: Dllist[T]
+        """
+        Dllist.splice(self, other)
+        if isinstance(other, IndexedDllist):
+            other._reset_index()
+        self.reindex()
+
+    def split_after(self, node: Dllink[T]) -> "IndexedDllist[T]":
+        """
+        The `split_after` function moves the nodes following `node` to a new indexed list.
+
+        :param node: The last node to keep in this list, or the head
+        :type node: Dllink[T]
+        :return: A new list holding the nodes after `node`.
+        """
+        return self.split_at(0 if node is self.head else self.index(node) + 1)
+
+    def sort(self, key: Optional[Callable[[T], Any]] = None) -> None:
+        """
+        The `sort` function sorts the nodes of the list in place and rebuilds the index.
+
+        :param key: A function computing the comparison key from the data of a node
+        :type key: Optional[Callable[[T], Any]]
+        """
+        Dllist.sort(self, key)
+        self.reindex()
@@ -0,0 +1,450 @@
+"""
+Instrumentation (Operation Counters for BPQueue and Dllist)
+
+This code implements opt-in instrumentation for the hot paths of the Bounded Priority Queue
+(BPQueue) and the doubly-linked list (Dllist). It is meant for finding out why some runs of an
+algorithm such as FM partitioning are slow: whether the time goes into the bucket scans that
+look for the next non-empty bucket, into long walks after `popleft`, or simply into a large
+number of updates.
+
+The code provides three classes. OpStats collects the numbers: how many times each operation
+was called, how many buckets were scanned in total, the longest single scan, and a histogram of
+how far the maximum key moved per operation. InstrumentedBPQueue and InstrumentedDllist are
+subclasses of BPQueue and Dllist that report to an OpStats object. The same OpStats can be
+shared by several structures, e.g. by the two gain buckets of a bipartitioning pass.
+
+A scan is the walk down the buckets that repairs the maximum key, and its length is the number
+of buckets tested, so a scan that stops at the current maximum has length 1. The statistics can
+be reset between passes and dumped as JSON.
+
+The plain BPQueue and Dllist classes are not touched, so code that does not ask for the
+statistics pays nothing for them. Instrumentation is enabled simply by constructing the
+instrumented subclass instead.
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Optional, TypeVar
+
+from .bpqueue import BPQueue, Item
+from .dllist import Dllink, Dllist
+
+T = TypeVar("T")
+
+__all__ = ["OpStats", "InstrumentedBPQueue", "InstrumentedDllist"]
+
+
+class OpStats:
+    """The `OpStats` class collects operation counts, bucket scan lengths and a histogram of the
+    movement of the maximum key.
+
+    Examples:
+        >>> stats = OpStats()
+        >>> stats.record("append", 2)
+        >>> stats.record_scan(3)
+        >>> stats.to_dict()
+        {'ops': {'append': 1}, 'buckets_scanned': 3, 'max_scan': 3, 'max_moves': {2: 1}}
+    """
+
+    __slots__ = ("ops", "buckets_scanned", "max_scan", "max_moves")
+
+    ops: Dict[str, int]
+    buckets_scanned: int
+    max_scan: int
+    max_moves: Dict[int, int]
+
+    def __init__(self) -> None:
+        """
+        The function initializes empty statistics.
+
+        Examples:
+            >>> stats = OpStats()
+            >>> stats.buckets_scanned
+            0
+        """
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        The `reset` function clears all counters, e.g. at the start of a new pass.
+
+        Examples:
+            >>> stats = OpStats()
+            >>> stats.record("popleft", -1)
+            >>> stats.reset()
+            >>> stats.ops
+            {}
+        """
+        self.ops = {}
+        self.buckets_scanned = 0
+        self.max_scan = 0
+        self.max_moves = {}
+
+    def record(self, op: str, move: int = 0) -> None:
+        """
+        The `record` function counts one call of an operation and how far it moved the maximum
+        key (positive upward, negative downward).
+
+        :param op: The name of the operation
+        :type op: str
+        :param move: The change of the maximum key
+        :type move: int
+        """
+        self.ops[op] = self.ops.get(op, 0) + 1
+        self.max_moves[move] = self.max_moves.get(move, 0) + 1
+
+    def record_scan(self, length: int) -> None:
+        """
+        The `record_scan` function adds one bucket scan of the given length.
+
+        :param length: The number of buckets tested
+        :type length: int
+        """
+        self.buckets_scanned += length
+        if self.max_scan < length:
+            self.max_scan = length
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The `to_dict` function returns the statistics as a dictionary.
+
+        :return: A dictionary of the counters.
+        """
+        return {
+            "ops": dict(self.ops),
+            "buckets_scanned": self.buckets_scanned,
+            "max_scan": self.max_scan,
+            "max_moves": dict(sorted(self.max_moves.items())),
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """
+        The `to_json` function dumps the statistics as a JSON string. The keys of the histogram
+        become strings, as JSON requires.
+
+        :param kwargs: Keyword arguments passed to `json.dumps`, e.g. `indent`
+        :return: The JSON string.
+
+        Examples:
+            >>> stats = OpStats()
+            >>> stats.record("append", 1)
+            >>> stats.to_json()
+            '{"ops": {"append": 1}, "buckets_scanned": 0, "max_scan": 0, "max_moves": {"1": 1}}'
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+class InstrumentedBPQueue(BPQueue):
+    """The `InstrumentedBPQueue` class is a bounded priority queue that reports its operations,
+    bucket scans and maximum key movements to an `OpStats` object.
+
+    `modify_key` is counted as the `increase_key` or `decrease_key` it delegates to.
+
+    Examples:
+        >>> bpq = InstrumentedBPQueue(-3, 3)
+        >>> bpq.append(Dllink([0, 3]), 3)
+        >>> bpq.append(Dllink([0, 4]), -3)
+        >>> _ = bpq.popleft()
+        >>> bpq.stats.ops
+        {'append': 2, 'popleft': 1}
+        >>> bpq.stats.max_scan
+        7
+    """
+
+    __slots__ = ("stats",)
+
+    stats: OpStats
+
+    def __init__(self, a: int, b: int, stats: Optional[OpStats] = None) -> None:
+        """
+        The function initializes an instrumented BPQueue object with a lower bound and an upper
+        bound.
+
+        :param a: The lower bound of the range
+        :type a: int
+        :param b: The upper bound of the range
+        :type b: int
+        :param stats: The statistics to report to. New ones are created if they are not given
+        :type stats: Optional[OpStats]
+        """
+        BPQueue.__init__(self, a, b)
+        self.stats = OpStats() if stats is None else stats
+
+    def clear(self) -> None:
+        """
+        The `clear` function resets the priority queue, counting the buckets it walks down.
+
+        Examples:
+            >>> bpq = InstrumentedBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 1)
+            >>> bpq.clear()
+            >>> bpq.stats.to_dict()["max_moves"]
+            {-5: 1, 5: 1}
+        """
+        top = self._max
+        BPQueue.clear(self)
+        self.stats.record_scan(top)
+        self.stats.record("clear", -top)
+
+    def appendleft(self, it: Item, k: int) -> None:
+        """
+        The `appendleft` function appends an item with an external key to the front of its bucket.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        top = self._max
+        BPQueue.appendleft(self, it, k)
+        self.stats.record("appendleft", self._max - top)
+
+    def append(self, it: Item, k: int) -> None:
+        """
+        The `append` function appends an item with an external key to the back of its bucket.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        top = self._max
+        BPQueue.append(self, it, k)
+        self.stats.record("append", self._max - top)
+
+    def extend(self, items: Iterable[Item], keys: Iterable[int]) -> None:
+        """
+        The `extend` function appends a sequence of items with a parallel sequence of keys.
+
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items
+        :type keys: Iterable[int]
+        """
+        top = self._max
+        BPQueue.extend(self, items, keys)
+        self.stats.record("extend", self._max - top)
+
+    def popleft(self) -> Item:
+        """
+        The `popleft` function removes and returns the node with the highest key, counting the
+        buckets walked to find the new maximum.
+
+        :return: The removed node.
+
+        Examples:
+            >>> bpq = InstrumentedBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 2)
+            >>> _ = bpq.popleft()
+            >>> bpq.stats.buckets_scanned
+            7
+        """
+        top = self._max
+        res = BPQueue.popleft(self)
+        self.stats.record_scan(top - self._max + 1)
+        self.stats.record("popleft", self._max - top)
+        return res
+
+    def decrease_key(self, it: Item, delta: int) -> None:
+        """
+        The `decrease_key` function decreases the key of an item by `delta`.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: The decrease of the key
+        :type delta: int
+        """
+        top = self._max
+        BPQueue.decrease_key(self, it, delta)
+        self.stats.record("decrease_key", self._max - top)
+
+    def increase_key(self, it: Item, delta: int) -> None:
+        """
+        The `increase_key` function increases the key of an item by `delta`.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: The increase of the key
+        :type delta: int
+        """
+        top = self._max
+        BPQueue.increase_key(self, it, delta)
+        self.stats.record("increase_key", self._max - top)
+
+    def modify_keys(self, items: Iterable[Item], deltas: Iterable[int]) -> None:
+        """
+        The `modify_keys` function modifies the keys of a sequence of items, counted as one
+        operation.
+
+        :param items: The doubly linked list nodes whose keys are modified
+        :type items: Iterable[Item]
+        :param deltas: The changes of the keys
+        :type deltas: Iterable[int]
+        """
+        top = self._max
+        BPQueue.modify_keys(self, items, deltas)
+        self.stats.record("modify_keys", self._max - top)
+
+    def detach(self, it: Item) -> None:
+        """
+        The `detach` function detaches an item from the priority queue.
+
+        :param it: The doubly linked list node to be detached
+        :type it: Item
+        """
+        top = self._max
+        BPQueue.detach(self, it)
+        self.stats.record("detach", self._max - top)
+
+    def merge_bucket(self, src_key: int, dst_key: int) -> None:
+        """
+        The `merge_bucket` function moves all items of one key to another key.
+
+        :param src_key: The external key of the items to be moved
+        :type src_key: int
+        :param dst_key: The new external key of the items
+        :type dst_key: int
+        """
+        top = self._max
+        BPQueue.merge_bucket(self, src_key, dst_key)
+        self.stats.record("merge_bucket", self._max - top)
+
+    def _update_max_key(self) -> None:
+        """
+        The `_update_max_key` function repairs the maximum key, counting the buckets it tests.
+        """
+        top = self._max
+        BPQueue._update_max_key(self)
+        self.stats.record_scan(top - self._max + 1)
+
+
+class InstrumentedDllist(Dllist[T]):
+    """The `InstrumentedDllist` class is a doubly linked list that counts its operations in an
+    `OpStats` object, e.g. a waiting list sharing the statistics of a queue.
+
+    Examples:
+        >>> dl = InstrumentedDllist(0)
+        >>> dl.append(Dllink(3))
+        >>> _ = dl.popleft()
+        >>> dl.stats.ops
+        {'append': 1, 'popleft': 1}
+    """
+
+    __slots__ = ("stats",)
+
+    stats: OpStats
+
+    def __init__(self, data: T, stats: Optional[OpStats] = None) -> None:
+        """
+        The function initializes an instrumented doubly linked list.
+
+        :param data: The value stored in the head node
+        :type data: T
+        :param stats: The statistics to report to. New ones are created if they are not given
+        :type stats: Optional[OpStats]
+        """
+        Dllist.__init__(self, data)
+        self.stats = OpStats() if stats is None else stats
+
+    def clear(self) -> None:
+        """
+        The `clear` function clears all elements from the list.
+        """
+        Dllist.clear(self)
+        self.stats.record("clear")
+
+    def appendleft(self, node: Dllink[T]) -> None:
+        """
+        The `appendleft` function appends a node to the front of the list.
+
+        :param node: The node to be appended
+        :type node: Dllink[T]
+        """
+        Dllist.appendleft(self, node)
+        self.stats.record("appendleft")
+
+    def append(self, node: Dllink[T]) -> None:
+        """
+        The `append` function appends a node to the back of the list.
+
+        :param node: The node to be appended
+        :type node: Dllink[T]
+        """
+        Dllist.append(self, node)
+        self.stats.record("append")
+
+    def extend(self, nodes: Iterable[Dllink[T]]) -> None:
+        """
+        The `extend` function appends a sequence of nodes to the back of the list, counted as one
+        operation.
+
+        :param nodes: The nodes to be appended
+        :type nodes: Iterable[Dllink[T]]
+        """
+        Dllist.extend(self, nodes)
+        self.stats.record("extend")
+
+    def splice(self, other: Dllist[T]) -> None:
+        """
+        The `splice` function moves all nodes of another list to the end of this list.
+
+        :param other: The list whose nodes are moved
+        :type other: Dllist[T]
+        """
+        Dllist.splice(self, other)
+        self.stats.record("splice")
+
+    def split_after(self, node: Dllink[T]) -> "InstrumentedDllist[T]":
+        """
+        The `split_after` function moves the nodes following `node` to a new list sharing the
+        statistics.
+
+        :param node: The last node to keep in this list, or the head
+        :type node: Dllink[T]
+        :return: A new list holding the nodes after `node`.
+        """
+        res = InstrumentedDllist(self.head.data, self.stats)
+        Dllist.splice(res, Dllist.split_after(self, node))
+        self.stats.record("split_after")
+        return res
+
+    def sort(self, key: Optional[Callable[[T], Any]] = None) -> None:
+        """
+        The `sort` function sorts the nodes of the list in place.
+
+        :param key: A function computing the comparison key from the data of a node
+        :type key: Optional[Callable[[T], Any]]
+        """
+        Dllist.sort(self, key)
+        self.stats.record("sort")
+
+    def insert_sorted(
+        self, node: Dllink[T], key: Optional[Callable[[T], Any]] = None
+    ) -> None:
+        """
+        The `insert_sorted` function inserts a node into a sorted list.
+
+        :param node: The node to be inserted
+        :type node: Dllink[T]
+        :param key: A function computing the comparison key from the data of a node
+        :type key: Optional[Callable[[T], Any]]
+        """
+        Dllist.insert_sorted(self, node, key)
+        self.stats.record("insert_sorted")
+
+    def popleft(self) -> Dllink[T]:
+        """
+        The `popleft` function removes and returns the first node of the list.
+
+        :return: The removed node.
+        """
+        self.stats.record("popleft")
+        return Dllist.popleft(self)
+
+    def pop(self) -> Dllink[T]:
+        """
+        The `pop` function removes and returns the last node of the list.
+
+        :return: The removed node.
+        """
+        self.stats.record("pop")
+        return Dllist.pop(self)
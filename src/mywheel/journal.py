@@ -0,0 +1,670 @@
+"""
+Journal (Undo Log for Dllist and BPQueue)
+
+This code implements an undo log for the doubly-linked structures of this package. It is meant
+for algorithms such as FM partitioning, which apply a sequence of moves during a pass, keep the
+best prefix of it, and then revert the remaining moves. Without a log, reverting means
+rebuilding the gain buckets from scratch, which costs time proportional to the number of
+items rather than the number of moves.
+
+The code provides three classes. Journal is the log itself. JournaledDllist and JournaledBPQueue
+are subclasses of Dllist and BPQueue that record every relink they perform into a Journal. The
+same Journal can be shared between a queue and one or more lists, so that a node moving from
+the gain buckets to a waiting list is undone as a single, consistently ordered history.
+
+Each entry of the log describes one node just before it was relinked: its next and previous
+neighbors, whether it was linked into a list, whether the operation left it linked, and, for
+queue operations, its internal key and the maximum key of the queue. Undoing the entries in
+reverse order restores every node exactly where it was, because at the time an entry is undone
+all later changes are already gone, so the recorded neighbors are adjacent again.
+
+A checkpoint is simply the current length of the log. Rolling back to a checkpoint undoes the
+entries recorded after it, in time proportional to the number of those entries. The plain Dllist
+and BPQueue classes are not affected, so code that does not need an undo log pays nothing.
+"""
+
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+from .bpqueue import BPQueue, Item
+from .dllist import Dllink, Dllist
+
+T = TypeVar("T")
+
+__all__ = ["Journal", "JournaledDllist", "JournaledBPQueue"]
+
+Entry = Tuple[
+    Dllink[Any], Dllink[Any], Dllink[Any], bool, bool, int, Optional[BPQueue], int
+]
+
+
+class Journal:
+    """The `Journal` class is an undo log of node relinks with O(1) checkpoints and rollbacks in
+    time proportional to the number of undone entries.
+
+    .. svgbob::
+       :align: center
+
+         checkpoint            checkpoint
+             |                     |
+             v                     v
+        +---------+---------+---------+---------+---------+
+        | entry 0 | entry 1 | entry 2 | entry 3 | entry 4 |
+        +---------+---------+---------+---------+---------+
+                                      <-------------------
+                                       rollback (reversed)
+
+    Examples:
+        >>> journal = Journal()
+        >>> dl = JournaledDllist(0, journal)
+        >>> a = Dllink(3)
+        >>> cp = journal.checkpoint()
+        >>> dl.append(a)
+        >>> journal.rollback(cp)
+        >>> dl.is_empty()
+        True
+    """
+
+    __slots__ = ("_entries",)
+
+    _entries: List[Entry]
+
+    def __init__(self) -> None:
+        """
+        The function initializes an empty journal.
+
+        Examples:
+            >>> journal = Journal()
+            >>> len(journal)
+            0
+        """
+        self._entries = []
+
+    def __len__(self) -> int:
+        """
+        The `__len__` function returns the number of recorded entries.
+
+        :return: The number of entries in the journal.
+        """
+        return len(self._entries)
+
+    def checkpoint(self) -> int:
+        """
+        The `checkpoint` function returns a marker of the current state that can be passed to
+        `rollback` later.
+
+        :return: The current length of the journal.
+
+        Examples:
+            >>> journal = Journal()
+            >>> journal.checkpoint()
+            0
+        """
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """
+        The `clear` function forgets all recorded entries, making the current state permanent.
+        Checkpoints taken earlier become invalid.
+
+        Examples:
+            >>> journal = Journal()
+            >>> dl = JournaledDllist(0, journal)
+            >>> dl.append(Dllink(3))
+            >>> journal.clear()
+            >>> len(journal)
+            0
+        """
+        self._entries.clear()
+
+    def record(
+        self,
+        node: Dllink[Any],
+        was_linked: bool,
+        now_linked: bool,
+        owner: Optional[BPQueue] = None,
+    ) -> None:
+        """
+        The `record` function logs the state of a node just before it is relinked.
+
+        :param node: The node about to be relinked
+        :type node: Dllink[Any]
+        :param was_linked: Whether the node is currently linked into a list
+        :type was_linked: bool
+        :param now_linked: Whether the node will be linked into a list after the operation
+        :type now_linked: bool
+        :param owner: The queue whose internal key and maximum key must also be restored, if any
+        :type owner: Optional[BPQueue]
+        """
+        if owner is None:
+            self._entries.append(
+                (node, node.next, node.prev, was_linked, now_linked, 0, None, 0)
+            )
+        else:
+            self._entries.append(
+                (
+                    node,
+                    node.next,
+                    node.prev,
+                    was_linked,
+                    now_linked,
+                    node.data[0],
+                    owner,
+                    owner._max,
+                )
+            )
+
+    def rollback(self, checkpoint: int) -> None:
+        """
+        The `rollback` function undoes every entry recorded after the checkpoint, newest first.
+
+        :param checkpoint: A marker returned by `checkpoint`
+        :type checkpoint: int
+
+        Examples:
+            >>> journal = Journal()
+            >>> dl = JournaledDllist(0, journal)
+            >>> a, b = Dllink(3), Dllink(4)
+            >>> dl.append(a)
+            >>> dl.append(b)
+            >>> cp = journal.checkpoint()
+            >>> dl.detach(a)
+            >>> _ = dl.popleft()
+            >>> journal.rollback(cp)
+            >>> [node.data for node in dl]
+            [3, 4]
+        """
+        assert 0 <= checkpoint <= len(self._entries)
+        entries = self._entries
+        while len(entries) > checkpoint:
+            node, nxt, prv, was_linked, now_linked, key, owner, old_max = entries.pop()
+            if now_linked:
+                node.detach()
+            if was_linked:
+                prv.attach(node)
+            else:
+                node.next = nxt
+                node.prev = prv
+            if owner is not None:
+                node.data[0] = key
+                owner._max = old_max
+
+
+class JournaledDllist(Dllist[T]):
+    """The `JournaledDllist` class is a doubly linked list that records its relinks into a
+    `Journal`, e.g. a waiting list whose history is shared with a `JournaledBPQueue`.
+
+    Nodes must be removed through the list (`popleft`, `pop` or `detach`) rather than with
+    `Dllink.detach`, otherwise the removal is not recorded.
+
+    Examples:
+        >>> dl = JournaledDllist(0)
+        >>> cp = dl.checkpoint()
+        >>> dl.append(Dllink(3))
+        >>> dl.rollback(cp)
+        >>> dl.is_empty()
+        True
+    """
+
+    __slots__ = ("journal",)
+
+    journal: Journal
+
+    def __init__(self, data: T, journal: Optional[Journal] = None) -> None:
+        """
+        The function initializes a journaled doubly linked list.
+
+        :param data: The value stored in the head node
+        :type data: T
+        :param journal: The journal to record into. A new one is created if it is not given
+        :type journal: Optional[Journal]
+
+        Examples:
+            >>> journal = Journal()
+            >>> dl = JournaledDllist(0, journal)
+            >>> dl.journal is journal
+            True
+        """
+        Dllist.__init__(self, data)
+        self.journal = Journal() if journal is None else journal
+
+    def checkpoint(self) -> int:
+        """
+        The `checkpoint` function returns a checkpoint of the underlying journal.
+
+        :return: A marker that can be passed to `rollback`.
+        """
+        return self.journal.checkpoint()
+
+    def rollback(self, checkpoint: int) -> None:
+        """
+        The `rollback` function rolls the underlying journal back to a checkpoint. This also
+        undoes the changes of any other structure sharing the journal.
+
+        :param checkpoint: A marker returned by `checkpoint`
+        :type checkpoint: int
+        """
+        self.journal.rollback(checkpoint)
+
+    def clear(self) -> None:
+        """
+        The `clear` function removes all nodes from the list, recording each removal.
+
+        Examples:
+            >>> dl = JournaledDllist(0)
+            >>> dl.append(Dllink(3))
+            >>> cp = dl.checkpoint()
+            >>> dl.clear()
+            >>> dl.rollback(cp)
+            >>> dl.is_empty()
+            False
+        """
+        while not self.is_empty():
+            self.pop()
+
+    def appendleft(self, node: Dllink[T]) -> None:
+        """
+        The `appendleft` function appends a node to the front of the list.
+
+        :param node: The node to be appended
+        :type node: Dllink[T]
+        """
+        self.journal.record(node, False, True)
+        self.head.attach(node)
+
+    def append(self, node: Dllink[T]) -> None:
+        """
+        The `append` function appends a node to the end of the list.
+
+        :param node: The node to be appended
+        :type node: Dllink[T]
+        """
+        self.journal.record(node, False, True)
+        self.head.prev.attach(node)
+
+    def extend(self, nodes: Iterable[Dllink[T]]) -> None:
+        """
+        The `extend` function appends a sequence of nodes to the end of the list, recording
+        each of them.
+
+        :param nodes: The nodes to be appended
+        :type nodes: Iterable[Dllink[T]]
+        """
+        for node in nodes:
+            self.append(node)
+
+    def popleft(self) -> Dllink[T]:
+        """
+        The `popleft` function removes and returns the first node of the list.
+
+        :return: The removed node.
+        """
+        res = self.head.next
+        self.journal.record(res, True, False)
+        res.detach()
+        return res
+
+    def pop(self) -> Dllink[T]:
+        """
+        The `pop` function removes and returns the last node of the list.
+
+        :return: The removed node.
+        """
+        res = self.head.prev
+        self.journal.record(res, True, False)
+        res.detach()
+        return res
+
+    def detach(self, node: Dllink[T]) -> None:
+        """
+        The `detach` function removes a node from the list.
+
+        :param node: The node to be removed
+        :type node: Dllink[T]
+
+        Examples:
+            >>> dl = JournaledDllist(0)
+            >>> a = Dllink(3)
+            >>> dl.append(a)
+            >>> dl.detach(a)
+            >>> dl.is_empty()
+            True
+        """
+        self.journal.record(node, True, False)
+        node.detach()
+
+    def splice(self, other: Dllist[T]) -> None:
+        """
+        The `splice` function moves all nodes of another list to the end of this list, in order.
+        Every node is moved and recorded separately, so this takes time linear in the number
+        of moved nodes rather than O(1).
+
+        :param other: The list whose nodes are moved
+        :type other: Dllist[T]
+
+        Examples:
+            >>> dl = JournaledDllist(0)
+            >>> other = Dllist(0)
+            >>> other.append(Dllink(3))
+            >>> cp = dl.checkpoint()
+            >>> dl.splice(other)
+            >>> dl.rollback(cp)
+            >>> dl.is_empty(), other.is_empty()
+            (True, False)
+        """
+        assert other is not self
+        src = other.head
+        record = self.journal.record
+        while src.next is not src:
+            node = src.next
+            record(node, True, True)
+            node.detach()
+            self.head.prev.attach(node)
+
+    def sort(self, key: Optional[Callable[[T], Any]] = None) -> None:
+        """
+        The `sort` function sorts the nodes of the list in ascending order, stably. Unlike
+        `Dllist.sort`, it collects the nodes into a Python list and then moves them to the end of
+        the list one by one in sorted order, recording every move. It therefore takes O(n)
+        extra memory.
+
+        :param key: A function computing the comparison key from the data of a node
+        :type key: Optional[Callable[[T], Any]]
+
+        Examples:
+            >>> dl = JournaledDllist(0)
+            >>> dl.extend([Dllink(2), Dllink(1)])
+            >>> cp = dl.checkpoint()
+            >>> dl.sort()
+            >>> [node.data for node in dl]
+            [1, 2]
+            >>> dl.rollback(cp)
+            >>> [node.data for node in dl]
+            [2, 1]
+        """
+        by: Callable[[Any], Any] = (lambda data: data) if key is None else key
+        nodes = sorted(self, key=lambda node: by(node.data))
+        record = self.journal.record
+        for node in nodes:
+            record(node, True, True)
+            node.detach()
+            self.head.prev.attach(node)
+
+    def insert_sorted(
+        self, node: Dllink[T], key: Optional[Callable[[T], Any]] = None
+    ) -> None:
+        """
+        The `insert_sorted` function inserts a node into a sorted list, recording it.
+
+        :param node: The node to be inserted
+        :type node: Dllink[T]
+        :param key: A function computing the comparison key from the data of a node
+        :type key: Optional[Callable[[T], Any]]
+        """
+        self.journal.record(node, False, True)
+        Dllist.insert_sorted(self, node, key)
+
+    def split_after(self, node: Dllink[T]) -> "JournaledDllist[T]":
+        """
+        The `split_after` function moves the nodes following `node` to a new list sharing the
+        journal, recording every moved node.
+
+        :param node: The last node to keep in this list, or the head
+        :type node: Dllink[T]
+        :return: A new list holding the nodes after `node`.
+        """
+        res = JournaledDllist(self.head.data, self.journal)
+        head = self.head
+        record = self.journal.record
+        while node.next is not head:
+            moved = node.next
+            record(moved, True, True)
+            moved.detach()
+            res.head.prev.attach(moved)
+        return res
+
+
+class JournaledBPQueue(BPQueue):
+    """The `JournaledBPQueue` class is a bounded priority queue that records every key change and
+    relink into a `Journal`, so that `rollback` restores an earlier state in time proportional
+    to the number of undone operations.
+
+    Items must be moved through the queue (or through a `JournaledDllist` sharing the journal)
+    rather than with `Dllink.detach`, otherwise the change is not recorded.
+
+    Examples:
+        >>> bpq = JournaledBPQueue(-3, 3)
+        >>> a = Dllink([0, 3])
+        >>> b = Dllink([0, 4])
+        >>> bpq.append(a, 0)
+        >>> bpq.append(b, 1)
+        >>> cp = bpq.checkpoint()
+        >>> bpq.modify_key(a, 3)
+        >>> _ = bpq.popleft()
+        >>> bpq.rollback(cp)
+        >>> [it.data[1] for it in bpq]
+        [4, 3]
+        >>> bpq.get_max()
+        1
+    """
+
+    __slots__ = ("journal",)
+
+    journal: Journal
+
+    def __init__(self, a: int, b: int, journal: Optional[Journal] = None) -> None:
+        """
+        The function initializes a journaled BPQueue object with a lower bound and an upper bound.
+
+        :param a: The lower bound of the range
+        :type a: int
+        :param b: The upper bound of the range
+        :type b: int
+        :param journal: The journal to record into. A new one is created if it is not given
+        :type journal: Optional[Journal]
+        """
+        BPQueue.__init__(self, a, b)
+        self.journal = Journal() if journal is None else journal
+
+    def checkpoint(self) -> int:
+        """
+        The `checkpoint` function returns a checkpoint of the underlying journal.
+
+        :return: A marker that can be passed to `rollback`.
+        """
+        return self.journal.checkpoint()
+
+    def rollback(self, checkpoint: int) -> None:
+        """
+        The `rollback` function rolls the underlying journal back to a checkpoint. This also
+        undoes the changes of any other structure sharing the journal.
+
+        :param checkpoint: A marker returned by `checkpoint`
+        :type checkpoint: int
+        """
+        self.journal.rollback(checkpoint)
+
+    def clear(self) -> None:
+        """
+        The `clear` function removes all items from the queue, recording each removal.
+
+        Examples:
+            >>> bpq = JournaledBPQueue(-3, 3)
+            >>> bpq.append(Dllink([0, 3]), 2)
+            >>> cp = bpq.checkpoint()
+            >>> bpq.clear()
+            >>> bpq.is_empty()
+            True
+            >>> bpq.rollback(cp)
+            >>> bpq.get_max()
+            2
+        """
+        while not self.is_empty():
+            self.popleft()
+
+    def appendleft(self, it: Item, k: int) -> None:
+        """
+        The `appendleft` function appends an item with an external key to the front of its bucket.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        self.journal.record(it, False, True, self)
+        BPQueue.appendleft(self, it, k)
+
+    def append(self, it: Item, k: int) -> None:
+        """
+        The `append` function appends an item with an external key to the back of its bucket.
+
+        :param it: The doubly linked list node to be appended
+        :type it: Item
+        :param k: The external key of the item
+        :type k: int
+        """
+        self.journal.record(it, False, True, self)
+        BPQueue.append(self, it, k)
+
+    def extend(self, items: Iterable[Item], keys: Iterable[int]) -> None:
+        """
+        The `extend` function appends a sequence of items with a parallel sequence of external
+        keys, recording each insertion.
+
+        :param items: The doubly linked list nodes to be appended
+        :type items: Iterable[Item]
+        :param keys: The external keys of the items
+        :type keys: Iterable[int]
+
+        Examples:
+            >>> bpq = JournaledBPQueue(-3, 3)
+            >>> cp = bpq.checkpoint()
+            >>> bpq.extend([Dllink([0, 3]), Dllink([0, 4])], [1, 2])
+            >>> bpq.rollback(cp)
+            >>> bpq.is_empty()
+            True
+        """
+        items = list(items)
+        record = self.journal.record
+        for it in items:
+            record(it, False, True, self)
+        BPQueue.extend(self, items, keys)
+
+    def popleft(self) -> Item:
+        """
+        The `popleft` function removes and returns the node with the highest key.
+
+        :return: The removed node.
+        """
+        self.journal.record(self._bucket[self._max].head.next, True, False, self)
+        return BPQueue.popleft(self)
+
+    def decrease_key(self, it: Item, delta: int) -> None:
+        """
+        The `decrease_key` function decreases the key of an item by a specified delta.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: How much the key value should be decreased
+        :type delta: int
+        """
+        linked = it.next is not it and it.prev.next is it  # popped items are not locked
+        self.journal.record(it, linked, True, self)
+        BPQueue.decrease_key(self, it, delta)
+
+    def increase_key(self, it: Item, delta: int) -> None:
+        """
+        The `increase_key` function increases the key of an item by a specified delta.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param delta: How much the key value should be increased
+        :type delta: int
+        """
+        linked = it.next is not it and it.prev.next is it  # popped items are not locked
+        self.journal.record(it, linked, True, self)
+        BPQueue.increase_key(self, it, delta)
+
+    def modify_keys(self, items: Iterable[Item], deltas: Iterable[int]) -> None:
+        """
+        The `modify_keys` function modifies the keys of a sequence of items by a parallel sequence
+        of deltas, recording each relink and repairing the maximum key once at the end.
+
+        :param items: The doubly linked list nodes whose keys are modified
+        :type items: Iterable[Item]
+        :param deltas: The changes of the keys
+        :type deltas: Iterable[int]
+
+        Examples:
+            >>> bpq = JournaledBPQueue(-3, 3)
+            >>> a = Dllink([0, 3])
+            >>> b = Dllink([0, 4])
+            >>> bpq.extend([a, b], [0, 1])
+            >>> cp = bpq.checkpoint()
+            >>> bpq.modify_keys([a, b, a], [2, -3, 1])
+            >>> bpq.get_max()
+            3
+            >>> bpq.rollback(cp)
+            >>> [(it.data[1], it.data[0] + bpq._offset) for it in bpq]
+            [(4, 1), (3, 0)]
+        """
+        if hasattr(deltas, "tolist"):  # NumPy array
+            deltas = deltas.tolist()
+        record = self.journal.record
+        bucket = self._bucket
+        high = self._high
+        top = self._max
+        for it, delta in zip(items, deltas):
+            if it.next is it or delta == 0:  # locked or no change
+                continue
+            if it.prev.next is it:
+                record(it, True, True, self)
+                it.detach()
+            else:  # popped or detached item, inserted again
+                record(it, False, True, self)
+            key = it.data[0] + delta
+            assert 0 < key <= high
+            it.data[0] = key
+            if delta > 0:
+                bucket[key].appendleft(it)  # LIFO
+            else:
+                bucket[key].append(it)  # FIFO
+            if top < key:
+                top = key
+        self._max = top
+        self._update_max_key()
+
+    def detach(self, it: Item) -> None:
+        """
+        The `detach` function detaches an item from the priority queue.
+
+        :param it: The doubly linked list node to be detached
+        :type it: Item
+        """
+        self.journal.record(it, True, False, self)
+        BPQueue.detach(self, it)
+
+    def _move_bucket(self, src: int, dst: int) -> None:
+        """
+        The `_move_bucket` function moves the items of bucket `src` to the back of bucket `dst`
+        one by one, recording each relink, so that `merge_bucket` can be rolled back.
+
+        Examples:
+            >>> bpq = JournaledBPQueue(-3, 3)
+            >>> bpq.extend([Dllink([0, 3]), Dllink([0, 4])], [2, 2])
+            >>> cp = bpq.checkpoint()
+            >>> bpq.merge_bucket(2, -1)
+            >>> bpq.rollback(cp)
+            >>> [(it.data[1], it.data[0] + bpq._offset) for it in bpq]
+            [(3, 2), (4, 2)]
+            >>> bpq.get_max()
+            2
+        """
+        src_head = self._bucket[src].head
+        dst_head = self._bucket[dst].head
+        record = self.journal.record
+        while src_head.next is not src_head:
+            it = src_head.next
+            record(it, True, True, self)
+            it.detach()
+            it.data[0] = dst
+            dst_head.prev.attach(it)
@@ -0,0 +1,381 @@
+"""
+Multi-Membership Doubly Linked Lists
+
+This code implements intrusive doubly linked lists whose nodes can belong to two lists at the
+same time. A Dllink node has a single pair of `next` and `prev` pointers, so it can only be in
+one list at a time. In partitioning algorithms a cell is often needed in two lists at once,
+for example in a gain bucket and in the list of the cells of its partition. With plain Dllink
+nodes this takes a second node per cell and a dictionary to map one node back to the other.
+
+The MultiDllink class is a Dllink with a second pair of pointers, `next1` and `prev1`. Slot 0
+is the inherited `next` and `prev` pair, so a MultiDllink can be put in a Dllist or in a
+BPQueue bucket like any Dllink. Slot 1 is an independent pair stored in fixed attributes of
+the node, so no extra objects are allocated. The MultiDllist class is a doubly linked list
+bound to one slot: it links its nodes only through that slot and leaves the other slot alone.
+A node can therefore sit in a gain bucket of a BPQueue and in a MultiDllist bound to slot 1,
+and moving it between the buckets does not disturb its place in the other list.
+
+All operations take O(1) time, as for Dllist. As with Dllist, the lists do not own the nodes;
+the caller must use each slot of a node for at most one list at a time.
+"""
+
+from typing import Generic, Iterable, Iterator, TypeVar
+
+from .dllist import Dllink
+
+T = TypeVar("T")
+
+__all__ = ["MultiDllink", "MultiDllist"]
+
+_LINKS = (("next", "prev"), ("next1", "prev1"))  # attribute names of the slots
+
+
+class MultiDllink(Dllink[T]):
+    """The `MultiDllink` class is a doubly linked list node with two link slots, so that it can
+    be a member of two lists at once, one per slot.
+
+    Slot 0 is the `next` and `prev` pair inherited from `Dllink`, so the node also works with
+    `Dllist` and `BPQueue`. Slot 1 is the `next1` and `prev1` pair. Every method takes the slot
+    index as an optional last argument, which defaults to 0 as in `Dllink`.
+
+    .. svgbob::
+       :align: center
+
+                    +-----------+
+        slot 0  <---|-* next  *-|--->   (e.g. a gain bucket)
+        slot 1  <---|-* next1 *-|--->   (e.g. a partition list)
+                    |   data    |
+                    +-----------+
+
+    Examples:
+        >>> a = MultiDllink(3)
+        >>> b = MultiDllink(4)
+        >>> a.attach(b, 1)
+        >>> a.is_locked(0), a.is_locked(1)
+        (True, False)
+    """
+
+    __slots__ = ("next1", "prev1")
+
+    next1: "MultiDllink[T]"
+    prev1: "MultiDllink[T]"
+
+    def __init__(self, data: T) -> None:
+        """
+        The function initializes a node with both link slots locked (pointing to the node
+        itself).
+
+        :param data: The data stored in the node
+        :type data: T
+
+        Examples:
+            >>> a = MultiDllink(3)
+            >>> a.next1 is a, a.data
+            (True, 3)
+        """
+        Dllink.__init__(self, data)
+        self.next1 = self.prev1 = self
+
+    def is_locked(self, slot: int = 0) -> bool:
+        """
+        The `is_locked` function checks whether the given slot of the node is locked, i.e. not
+        linked into a list.
+
+        :param slot: The slot index, 0 or 1
+        :type slot: int
+        :return: True if the slot points to the node itself.
+
+        Examples:
+            >>> a = MultiDllink(3)
+            >>> a.is_locked(1)
+            True
+        """
+        return (self.next1 if slot else self.next) is self
+
+    def lock(self, slot: int = 0) -> None:
+        """
+        The `lock` function locks the given slot of the node by pointing it to the node itself.
+
+        :param slot: The slot index, 0 or 1
+        :type slot: int
+
+        Examples:
+            >>> a = MultiDllink(3)
+            >>> a.lock(1)
+            >>> a.is_locked(1)
+            True
+        """
+        if slot:
+            self.next1 = self
+        else:
+            self.next = self
+
+    def attach(self, node: Dllink[T], slot: int = 0) -> None:
+        """
+        The `attach` function inserts `node` right after this node through the given slot.
+
+        :param node: The node to be inserted, which must be a `MultiDllink` for slot 1
+        :type node: Dllink[T]
+        :param slot: The slot index, 0 or 1
+        :type slot: int
+
+        Examples:
+            >>> a = MultiDllink(3)
+            >>> b = MultiDllink(4)
+            >>> a.attach(b, 1)
+            >>> a.next1 is b, b.prev1 is a, a.next is a
+            (True, True, True)
+        """
+        if slot:
+            assert isinstance(node, MultiDllink)
+            nxt = self.next1
+            nxt.prev1 = node
+            node.next1 = nxt
+            self.next1 = node
+            node.prev1 = self
+        else:
+            Dllink.attach(self, node)
+
+    def detach(self, slot: int = 0) -> None:
+        """
+        The `detach` function unlinks the node from the list of the given slot. The other slot
+        is not affected.
+
+        :param slot: The slot index, 0 or 1
+        :type slot: int
+
+        Examples:
+            >>> a = MultiDllink(3)
+            >>> b = MultiDllink(4)
+            >>> a.attach(b, 1)
+            >>> b.detach(1)
+            >>> a.is_locked(1)
+            True
+        """
+        if slot:
+            nxt = self.next1
+            prv = self.prev1
+            prv.next1 = nxt
+            nxt.prev1 = prv
+        else:
+            Dllink.detach(self)
+
+
+class MultiDllist(Generic[T]):
+    """The `MultiDllist` class is a doubly linked list of `MultiDllink` nodes bound to one slot.
+
+    It uses a "head" node as a sentinel, like `Dllist`, and only touches the bound slot of its
+    nodes, so each node can be in one list per slot. A list bound to slot 0 links its nodes the
+    same way as a `Dllist` or a `BPQueue` bucket, so a node can be in one of those and in a
+    list bound to slot 1 at the same time.
+
+    Examples:
+        >>> bucket = MultiDllist(0, slot=0)
+        >>> part = MultiDllist(0, slot=1)
+        >>> a = MultiDllink(3)
+        >>> bucket.append(a)
+        >>> part.append(a)
+        >>> bucket.detach(a)
+        >>> bucket.is_empty(), [node.data for node in part]
+        (True, [3])
+    """
+
+    __slots__ = ("head", "slot", "_next", "_prev")
+
+    head: MultiDllink[T]
+    slot: int
+    _next: str
+    _prev: str
+
+    def __init__(self, data: T, slot: int = 0) -> None:
+        """
+        The function initializes an empty list bound to the given slot.
+
+        :param data: The value stored in the head node
+        :type data: T
+        :param slot: The slot index through which the nodes are linked, 0 or 1
+        :type slot: int
+
+        Examples:
+            >>> a = MultiDllist(3, slot=1)
+            >>> a.head.data, a.slot
+            (3, 1)
+        """
+        assert slot in (0, 1)
+        self.head = MultiDllink(data)
+        self.slot = slot
+        self._next, self._prev = _LINKS[slot]
+
+    def is_empty(self) -> bool:
+        """
+        The `is_empty` function checks if the list is empty.
+
+        :return: a boolean value indicating whether the list is empty or not.
+
+        Examples:
+            >>> a = MultiDllist(3)
+            >>> a.is_empty()
+            True
+        """
+        return self.head.is_locked(self.slot)
+
+    def clear(self) -> None:
+        """
+        The `clear` function clears all nodes from the list. The nodes are not modified.
+
+        Examples:
+            >>> a = MultiDllist(3)
+            >>> a.append(MultiDllink(4))
+            >>> a.clear()
+            >>> a.is_empty()
+            True
+        """
+        head = self.head
+        setattr(head, self._next, head)
+        setattr(head, self._prev, head)
+
+    def appendleft(self, node: MultiDllink[T]) -> None:
+        """
+        The `appendleft` function appends a node to the front of the list.
+
+        :param node: The node to be appended
+        :type node: MultiDllink[T]
+
+        Examples:
+            >>> a = MultiDllist(3)
+            >>> a.appendleft(MultiDllink(4))
+            >>> a.is_empty()
+            False
+        """
+        self.head.attach(node, self.slot)
+
+    def append(self, node: MultiDllink[T]) -> None:
+        """
+        The `append` function appends a node to the end of the list.
+
+        :param node: The node to be appended
+        :type node: MultiDllink[T]
+
+        Examples:
+            >>> a = MultiDllist(3)
+            >>> a.append(MultiDllink(4))
+            >>> a.is_empty()
+            False
+        """
+        getattr(self.head, self._prev).attach(node, self.slot)
+
+    def extend(self, nodes: Iterable[MultiDllink[T]]) -> None:
+        """
+        The `extend` function appends a sequence of nodes to the end of the list, in order.
+
+        :param nodes: The nodes to be appended
+        :type nodes: Iterable[MultiDllink[T]]
+
+        Examples:
+            >>> a = MultiDllist(0)
+            >>> a.extend([MultiDllink(1), MultiDllink(2)])
+            >>> [node.data for node in a]
+            [1, 2]
+        """
+        nxt, prv = self._next, self._prev
+        head = self.head
+        last = getattr(head, prv)
+        for node in nodes:
+            setattr(last, nxt, node)
+            setattr(node, prv, last)
+            last = node
+        setattr(last, nxt, head)
+        setattr(head, prv, last)
+
+    def detach(self, node: MultiDllink[T]) -> None:
+        """
+        The `detach` function removes a node from the list, leaving its other slot alone.
+
+        :param node: A node of the list
+        :type node: MultiDllink[T]
+
+        Examples:
+            >>> a = MultiDllist(3)
+            >>> b = MultiDllink(4)
+            >>> a.append(b)
+            >>> a.detach(b)
+            >>> a.is_empty()
+            True
+        """
+        node.detach(self.slot)
+
+    def popleft(self) -> MultiDllink[T]:
+        """
+        The `popleft` function removes and returns the first node of the list.
+
+        :return: The removed node.
+
+        Examples:
+            >>> a = MultiDllist(3)
+            >>> b = MultiDllink(4)
+            >>> a.append(b)
+            >>> a.popleft() is b
+            True
+        """
+        res: MultiDllink[T] = getattr(self.head, self._next)
+        res.detach(self.slot)
+        return res
+
+    def pop(self) -> MultiDllink[T]:
+        """
+        The `pop` function removes and returns the last node of the list.
+
+        :return: The removed node.
+
+        Examples:
+            >>> a = MultiDllist(3)
+            >>> b = MultiDllink(4)
+            >>> a.append(b)
+            >>> a.pop() is b
+            True
+        """
+        res: MultiDllink[T] = getattr(self.head, self._prev)
+        res.detach(self.slot)
+        return res
+
+    def __iter__(self) -> Iterator[MultiDllink[T]]:
+        """
+        The `__iter__` function iterates over the nodes of the list from the first to the last.
+        The current node may be detached during the traversal.
+
+        :return: A generator of the nodes.
+
+        Examples:
+            >>> a = MultiDllist(0)
+            >>> a.extend(MultiDllink(i) for i in range(3))
+            >>> [node.data for node in a]
+            [0, 1, 2]
+        """
+        link = self._next
+        head = self.head
+        node = getattr(head, link)
+        while node is not head:
+            nxt = getattr(node, link)
+            yield node
+            node = nxt
+
+    def __reversed__(self) -> Iterator[MultiDllink[T]]:
+        """
+        The `__reversed__` function iterates over the nodes of the list from the last to the
+        first. The current node may be detached during the traversal.
+
+        :return: A generator of the nodes in reverse order.
+
+        Examples:
+            >>> a = MultiDllist(0)
+            >>> a.extend(MultiDllink(i) for i in range(3))
+            >>> [node.data for node in reversed(a)]
+            [2, 1, 0]
+        """
+        link = self._prev
+        head = self.head
+        node = getattr(head, link)
+        while node is not head:
+            prv = getattr(node, link)
+            yield node
+            node = prv
@@ -0,0 +1,284 @@
+"""
+QuantizedBPQueue (Bounded Priority Queue for Float Keys)
+
+This code implements a priority queue for floating-point keys on top of the Bounded Priority
+Queue (BPQueue). Timing-driven refinement, for example, ranks moves by slack-weighted gains that
+are not integers, so the integer buckets of BPQueue cannot hold them directly, and falling back
+to a binary heap gives up the O(1) updates that make BPQueue attractive.
+
+The QuantizedBPQueue takes a lower bound (lo), an upper bound (hi) and a resolution when
+initialized. The range [lo..hi] is cut into slices of width `resolution`, like the days of a
+calendar, and each slice is mapped to one integer bucket of an underlying BPQueue. Inserting an
+item or changing its key only has to compute the slice of the key, so every update is still
+O(1), while the exact float key is kept in `item.data[2]`.
+
+The price is precision: items whose keys fall into the same slice are not ordered among
+themselves, so an item returned by `popleft` may have a key up to `resolution` below the true
+maximum. A finer resolution costs more buckets, a coarser one loses more order. When the order
+matters, the queue can be created with `exact=True`: `popleft` and `get_max` then scan the top
+bucket for its highest exact key. Only the top bucket is ever scanned, so the exact order is
+paid for only where it matters, and the cost is proportional to the number of items that share
+the best slice.
+"""
+
+from typing import Any, List, Tuple
+
+from .bpqueue import BPQueue, BPQueueIterator
+from .dllist import Dllink
+
+__all__ = ["QuantizedBPQueue", "QItem"]
+
+QItem = Dllink[List[Any]]
+
+
+class QuantizedBPQueue:
+    r"""The `QuantizedBPQueue` class is a priority queue for float keys in [lo..hi] that maps
+    the keys to the integer buckets of a `BPQueue` with a configurable resolution.
+
+    Note that this class does not own the nodes. The data of a node is a list
+    `[bucket, id, key]`, where the first element is used by the underlying BPQueue and the exact
+    float key is stored in the third element.
+
+    .. svgbob::
+       :align: center
+
+           key          bucket
+                          +----+    +-----+    +-----+
+        [2.0, 2.5) -->  4 |   -|--->| 2.1 |--->| 2.4 |   <--- exact: scan for 2.4
+                          +----+    +-----+    +-----+
+        [1.5, 2.0) -->  3 |    |
+                          +----+    +-----+
+        [1.0, 1.5) -->  2 |   -|--->| 1.2 |
+                          +----+    +-----+
+                          :    :
+
+    Examples:
+        >>> qpq = QuantizedBPQueue(0.0, 10.0, 0.5, exact=True)
+        >>> a = Dllink([0, 3, 0.0])
+        >>> b = Dllink([0, 4, 0.0])
+        >>> qpq.append(a, 2.1)
+        >>> qpq.append(b, 2.4)
+        >>> qpq.get_max()
+        2.4
+        >>> qpq.popleft().data[1]
+        4
+    """
+
+    __slots__ = ("_bpq", "_lo", "_hi", "_scale", "_resolution", "_exact")
+
+    _bpq: BPQueue
+    _lo: float
+    _hi: float
+    _scale: float
+    _resolution: float
+    _exact: bool
+
+    def __init__(
+        self, lo: float, hi: float, resolution: float, exact: bool = False
+    ) -> None:
+        """
+        The function initializes an empty queue for keys in [lo..hi].
+
+        :param lo: The lower bound of the range
+        :type lo: float
+        :param hi: The upper bound of the range
+        :type hi: float
+        :param resolution: The width of the key slice mapped to one bucket
+        :type resolution: float
+        :param exact: Whether to order the items in the top bucket by their exact keys
+        :type exact: bool
+
+        Examples:
+            >>> qpq = QuantizedBPQueue(-1.0, 1.0, 0.25)
+            >>> qpq.is_empty()
+            True
+            >>> qpq.get_range()
+            (0, 8)
+        """
+        assert lo <= hi
+        assert resolution > 0.0
+        self._lo = lo
+        self._hi = hi
+        self._scale = 1.0 / resolution
+        self._resolution = resolution
+        self._exact = exact
+        self._bpq = BPQueue(0, int((hi - lo) * self._scale))
+
+    def get_range(self) -> Tuple[int, int]:
+        """
+        The `get_range` function returns the range of the bucket indices in use.
+
+        :return: A pair of the lowest and the highest bucket index.
+        """
+        return 0, self._bpq._high - 1
+
+    def get_resolution(self) -> float:
+        """
+        The `get_resolution` function returns the width of the key slice of one bucket, which
+        bounds the order error when the queue is not exact.
+
+        :return: The resolution.
+        """
+        return self._resolution
+
+    def is_empty(self) -> bool:
+        """
+        The `is_empty` function checks if the queue is empty.
+
+        :return: True if the queue is empty.
+        """
+        return self._bpq.is_empty()
+
+    def get_max(self) -> float:
+        """
+        The `get_max` function returns the key of the item that `popleft` would return, i.e. the
+        highest key if the queue is exact, or a key within `resolution` of it otherwise.
+
+        :return: The key of the next item.
+
+        Examples:
+            >>> qpq = QuantizedBPQueue(0.0, 10.0, 0.5)
+            >>> qpq.append(Dllink([0, 3, 0.0]), 2.1)
+            >>> qpq.append(Dllink([0, 4, 0.0]), 2.4)
+            >>> qpq.get_max()
+            2.1
+        """
+        assert not self._bpq.is_empty()
+        return self._top().data[2]
+
+    def clear(self) -> None:
+        """
+        The `clear` function removes all items from the queue.
+
+        Examples:
+            >>> qpq = QuantizedBPQueue(0.0, 10.0, 0.5)
+            >>> qpq.append(Dllink([0, 3, 0.0]), 2.1)
+            >>> qpq.clear()
+            >>> qpq.is_empty()
+            True
+        """
+        self._bpq.clear()
+
+    def appendleft(self, it: QItem, key: float) -> None:
+        """
+        The `appendleft` function inserts an item with a float key at the front of its bucket.
+
+        :param it: The doubly linked list node to be inserted
+        :type it: QItem
+        :param key: The key of the item
+        :type key: float
+        """
+        index = self._quantize(key)
+        it.data[2] = key
+        self._bpq.appendleft(it, index)
+
+    def append(self, it: QItem, key: float) -> None:
+        """
+        The `append` function inserts an item with a float key at the back of its bucket.
+
+        :param it: The doubly linked list node to be inserted
+        :type it: QItem
+        :param key: The key of the item
+        :type key: float
+
+        Examples:
+            >>> qpq = QuantizedBPQueue(0.0, 10.0, 0.5)
+            >>> a = Dllink([0, 3, 0.0])
+            >>> qpq.append(a, 2.1)
+            >>> a.data
+            [5, 3, 2.1]
+        """
+        index = self._quantize(key)
+        it.data[2] = key
+        self._bpq.append(it, index)
+
+    def popleft(self) -> QItem:
+        """
+        The `popleft` function removes and returns the item with the highest key, exactly if the
+        queue is exact, or up to the resolution otherwise.
+
+        :return: The removed node.
+
+        Examples:
+            >>> qpq = QuantizedBPQueue(0.0, 10.0, 0.5, exact=True)
+            >>> qpq.append(Dllink([0, 3, 0.0]), 7.0)
+            >>> qpq.append(Dllink([0, 4, 0.0]), 7.25)
+            >>> qpq.append(Dllink([0, 5, 0.0]), 1.0)
+            >>> [qpq.popleft().data[1] for _ in range(3)]
+            [4, 3, 5]
+        """
+        if not self._exact:
+            return self._bpq.popleft()
+        res = self._top()
+        self._bpq.detach(res)
+        return res
+
+    def modify_key(self, it: QItem, delta: float) -> None:
+        """
+        The `modify_key` function changes the key of an item by `delta`. The item is moved only if
+        its new key falls into another bucket.
+
+        :param it: The doubly linked list node
+        :type it: QItem
+        :param delta: The change of the key
+        :type delta: float
+
+        Note:
+            Locked items are skipped, as in `BPQueue.modify_key`.
+
+        Examples:
+            >>> qpq = QuantizedBPQueue(0.0, 10.0, 0.5)
+            >>> a = Dllink([0, 3, 0.0])
+            >>> qpq.append(a, 2.1)
+            >>> qpq.modify_key(a, 0.2)
+            >>> a.data
+            [5, 3, 2.3000000000000003]
+            >>> qpq.modify_key(a, 5.0)
+            >>> a.data[0]
+            15
+        """
+        if it.next is it:  # locked
+            return
+        key = it.data[2] + delta
+        index = self._quantize(key)
+        it.data[2] = key
+        self._bpq.modify_key(it, index - it.data[0] + 1)
+
+    def detach(self, it: QItem) -> None:
+        """
+        The `detach` function removes an item from the queue.
+
+        :param it: The doubly linked list node to be detached
+        :type it: QItem
+        """
+        self._bpq.detach(it)
+
+    def _quantize(self, key: float) -> int:
+        """
+        The `_quantize` function returns the bucket index of a float key.
+        """
+        assert self._lo <= key <= self._hi
+        return int((key - self._lo) * self._scale)
+
+    def _top(self) -> QItem:
+        """
+        The `_top` function returns the item that `popleft` would return from a non-empty queue.
+        """
+        head = self._bpq._bucket[self._bpq._max].head
+        res = head.next
+        if self._exact:
+            node = res.next
+            while node is not head:
+                if node.data[2] > res.data[2]:
+                    res = node
+                node = node.next
+        return res
+
+    def __iter__(self) -> BPQueueIterator:
+        """
+        The function returns an iterator over the items, bucket by bucket in descending order.
+        Within a bucket, the items are not sorted by their exact keys.
+
+        :return: An iterator over the items.
+        """
+        return iter(self._bpq)
@@ -0,0 +1,280 @@
+"""
+RadixHeap (Monotone Priority Queue for Unbounded Integer Keys)
+
+This code implements a radix heap, a min-priority queue for non-negative integer keys that is
+monotone: a key that is pushed must never be smaller than the key that was popped last. This is
+exactly the access pattern of Dijkstra's shortest path algorithm and of many min-cost flow
+algorithms, where the distances that are settled only grow.
+
+Unlike BPQueue, the keys do not have to fit in a small range known in advance. The heap keeps
+one bucket per bit position instead of one bucket per key value. Bucket 0 holds the items whose
+key equals the last popped key, and bucket i (for i > 0) holds the items whose key differs from
+the last popped key first in bit i - 1. The number of buckets therefore grows with the number of
+bits of the keys, i.e. O(log C) for keys up to C.
+
+When bucket 0 runs empty, the lowest non-empty bucket is emptied: its smallest key becomes the
+new last popped key, and its items are redistributed to lower buckets. Every item only moves to
+lower buckets, so each one is moved O(log C) times over its lifetime, which gives amortized
+O(log C) time per operation.
+
+The buckets are Dllist objects and the items are Dllink nodes supplied by the caller, exactly
+like in BPQueue, so pushing an item allocates nothing and `decrease_key` is an O(1) detach
+followed by an insertion into the right bucket. The key of an item is kept in `item.data[0]`.
+"""
+
+from typing import List
+
+from .bpqueue import Item
+from .dllist import Dllist
+
+__all__ = ["RadixHeap"]
+
+
+class RadixHeap:
+    r"""The `RadixHeap` class is a monotone min-priority queue for non-negative integer keys,
+    implemented by an array of doubly-linked list buckets indexed by bit position.
+
+    Note that this class does not own the nodes, and that the key of a node is stored in
+    `node.data[0]`.
+
+    .. svgbob::
+       :align: center
+
+                    +---+    +-----+    +-----+
+        last       0| -|--->| last|--->| last|
+                    +---+    +-----+    +-----+
+                   1|   |
+                    +---+    +-----+
+                   2| -|--->|  ?  |     first differing bit is 1
+                    +---+    +-----+
+                    :   :
+                    +---+    +-----+    +-----+
+                   i| -|--->|  ?  |--->|  ?  |     first differing bit is i-1
+                    +---+    +-----+    +-----+
+
+    Examples:
+        >>> from mywheel.dllist import Dllink
+        >>> heap = RadixHeap()
+        >>> a = Dllink([0, 3])
+        >>> b = Dllink([0, 4])
+        >>> heap.push(a, 100)
+        >>> heap.push(b, 7)
+        >>> heap.pop().data[1]
+        4
+        >>> heap.decrease_key(a, 9)
+        >>> heap.get_min()
+        9
+    """
+
+    __slots__ = ("_last", "_size", "_bucket")
+
+    _last: int
+    _size: int
+    _bucket: List[Dllist[List[int]]]
+
+    def __init__(self, last: int = 0) -> None:
+        """
+        The function initializes an empty radix heap.
+
+        :param last: The initial lower bound of the keys, as if it had been popped already
+        :type last: int
+
+        Examples:
+            >>> heap = RadixHeap()
+            >>> heap.is_empty()
+            True
+        """
+        assert last >= 0
+        self._last = last
+        self._size = 0
+        self._bucket = [Dllist([0, 4848])]
+
+    def __len__(self) -> int:
+        """
+        The `__len__` function returns the number of items in the heap.
+
+        :return: The number of items.
+        """
+        return self._size
+
+    def is_empty(self) -> bool:
+        """
+        The `is_empty` function checks if the heap is empty.
+
+        :return: True if the heap is empty.
+        """
+        return self._size == 0
+
+    def get_last(self) -> int:
+        """
+        The `get_last` function returns the last popped key, which is the lower bound of every key
+        that can still be pushed.
+
+        :return: The last popped key.
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> heap = RadixHeap()
+            >>> heap.push(Dllink([0, 3]), 5)
+            >>> _ = heap.pop()
+            >>> heap.get_last()
+            5
+        """
+        return self._last
+
+    def push(self, it: Item, key: int) -> None:
+        """
+        The `push` function inserts an item with a key that is not smaller than the last popped key.
+
+        :param it: The doubly linked list node to be inserted
+        :type it: Item
+        :param key: The key of the item
+        :type key: int
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> heap = RadixHeap()
+            >>> heap.push(Dllink([0, 3]), 5)
+            >>> len(heap)
+            1
+        """
+        assert key >= self._last
+        it.data[0] = key
+        self._insert(it, (key ^ self._last).bit_length())
+        self._size += 1
+
+    def get_min(self) -> int:
+        """
+        The `get_min` function returns the smallest key in a non-empty heap.
+
+        :return: The smallest key.
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> heap = RadixHeap()
+            >>> heap.push(Dllink([0, 3]), 5)
+            >>> heap.push(Dllink([0, 4]), 2)
+            >>> heap.get_min()
+            2
+        """
+        assert self._size > 0
+        if self._bucket[0].is_empty():
+            self._refill()
+        return self._last
+
+    def pop(self) -> Item:
+        """
+        The `pop` function removes and returns an item with the smallest key from a non-empty heap.
+        Items with equal keys are returned in first-in first-out order within bucket 0.
+
+        :return: The removed node.
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> heap = RadixHeap()
+            >>> heap.push(Dllink([0, 3]), 5)
+            >>> heap.push(Dllink([0, 4]), 2)
+            >>> heap.pop().data
+            [2, 4]
+            >>> heap.pop().data
+            [5, 3]
+        """
+        assert self._size > 0
+        if self._bucket[0].is_empty():
+            self._refill()
+        self._size -= 1
+        return self._bucket[0].popleft()
+
+    def decrease_key(self, it: Item, key: int) -> None:
+        """
+        The `decrease_key` function lowers the key of an item in the heap. The new key must not be
+        smaller than the last popped key.
+
+        :param it: The doubly linked list node
+        :type it: Item
+        :param key: The new key of the item
+        :type key: int
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> heap = RadixHeap()
+            >>> a = Dllink([0, 3])
+            >>> heap.push(Dllink([0, 4]), 6)
+            >>> heap.push(a, 9)
+            >>> heap.decrease_key(a, 1)
+            >>> heap.pop() is a
+            True
+        """
+        assert self._last <= key <= it.data[0]
+        it.detach()
+        it.data[0] = key
+        self._insert(it, (key ^ self._last).bit_length())
+
+    def detach(self, it: Item) -> None:
+        """
+        The `detach` function removes an item from the heap.
+
+        :param it: The doubly linked list node to be detached
+        :type it: Item
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> heap = RadixHeap()
+            >>> a = Dllink([0, 3])
+            >>> heap.push(a, 6)
+            >>> heap.detach(a)
+            >>> heap.is_empty()
+            True
+        """
+        it.detach()
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        The `clear` function removes all items from the heap. The last popped key is kept.
+
+        Examples:
+            >>> from mywheel.dllist import Dllink
+            >>> heap = RadixHeap()
+            >>> heap.push(Dllink([0, 3]), 6)
+            >>> heap.clear()
+            >>> heap.is_empty()
+            True
+        """
+        for bucket in self._bucket:
+            bucket.clear()
+        self._size = 0
+
+    def _insert(self, it: Item, idx: int) -> None:
+        """
+        The `_insert` function appends an item to bucket `idx`, adding buckets as needed.
+        """
+        bucket = self._bucket
+        while len(bucket) <= idx:
+            bucket.append(Dllist([len(bucket), 4848]))
+        bucket[idx].append(it)
+
+    def _refill(self) -> None:
+        """
+        The `_refill` function empties the lowest non-empty bucket into the lower buckets, after
+        making its smallest key the last popped key. Bucket 0 is then non-empty.
+        """
+        bucket = self._bucket
+        i = 1
+        while bucket[i].is_empty():
+            i += 1
+        src = bucket[i]
+        head = src.head
+        node = head.next
+        last = node.data[0]
+        while node is not head:
+            if last > node.data[0]:
+                last = node.data[0]
+            node = node.next
+        self._last = last
+        node = head.next
+        while node is not head:
+            nxt = node.next
+            bucket[(node.data[0] ^ last).bit_length()].append(node)
+            node = nxt
+        src.clear()
@@ -0,0 +1,138 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from mywheel.array_bpqueue import ArrayBPQueue
+from mywheel.bpqueue import BPQueue
+from mywheel.dllist import Dllink
+
+
+class TestArrayBPQueue:
+    def test_constructor(self) -> None:
+        bpq = ArrayBPQueue(-3, 3, 4)
+        assert bpq.is_empty()
+        assert bpq.get_max() == -4  # a - 1
+        assert all(bpq.is_locked(i) for i in range(4))
+
+    def test_append_and_pop(self) -> None:
+        bpq = ArrayBPQueue(-5, 5, 3)
+        bpq.append(0, 3)
+        bpq.append(1, -2)
+        bpq.append(2, 5)
+
+        assert bpq.get_max() == 5
+        assert bpq.popleft() == 2
+        assert bpq.get_max() == 3
+        assert bpq.popleft() == 0
+        assert bpq.get_max() == -2
+        assert bpq.popleft() == 1
+        assert bpq.is_empty()
+
+    def test_popleft_empty(self) -> None:
+        bpq = ArrayBPQueue(-5, 5, 2)
+        with pytest.raises(AssertionError):
+            bpq.popleft()
+        bpq.append(0, 5)
+        assert bpq.popleft() == 0
+        with pytest.raises(AssertionError):
+            bpq.popleft()
+        bpq.append(1, -5)
+        assert list(bpq) == [1]
+        assert bpq.popleft() == 1
+        assert bpq.is_empty()
+
+    def test_appendleft(self) -> None:
+        bpq = ArrayBPQueue(-5, 5, 2)
+        bpq.appendleft(0, 3)
+        bpq.appendleft(1, 3)
+        assert bpq.popleft() == 1
+        assert bpq.popleft() == 0
+
+    def test_clear(self) -> None:
+        bpq = ArrayBPQueue(-5, 5, 2)
+        bpq.append(0, 3)
+        bpq.append(1, -5)
+        bpq.clear()
+        assert bpq.is_empty()
+        assert list(bpq) == []
+
+    def test_key_manipulation(self) -> None:
+        bpq = ArrayBPQueue(-5, 5, 1)
+        bpq.append(0, 0)
+        bpq.increase_key(0, 2)
+        assert bpq.get_max() == 2
+        bpq.decrease_key(0, 3)
+        assert bpq.get_max() == -1
+        bpq.modify_key(0, 4)
+        assert bpq.get_max() == 3
+        bpq.modify_key(0, -5)
+        assert bpq.get_max() == -2
+        assert bpq.get_key(0) == -2
+
+    def test_detach_and_lock(self) -> None:
+        bpq = ArrayBPQueue(-5, 5, 2)
+        bpq.append(0, 3)
+        bpq.append(1, 5)
+        bpq.detach(1)
+        bpq.lock(1)
+        bpq.modify_key(1, -3)  # Should have no effect
+        assert bpq.get_max() == 3
+        assert list(bpq) == [0]
+
+    def test_decrease_key_asserts(self) -> None:
+        bpq = ArrayBPQueue(-3, 3, 1)
+        bpq.append(0, 0)
+        with pytest.raises(AssertionError):
+            bpq.decrease_key(0, 5)
+
+    def test_iteration_tolerates_detach(self) -> None:
+        bpq = ArrayBPQueue(-5, 5, 4)
+        for i, k in enumerate([1, 4, 1, -3]):
+            bpq.append(i, k)
+        visited = []
+        for it in bpq:
+            visited.append(it)
+            bpq.detach(it)
+        assert visited == [1, 0, 2, 3]
+        assert bpq.is_empty()
+
+
+class TestArrayBPQueueProperties:
+    @given(
+        st.lists(
+            st.tuples(
+                st.integers(min_value=-5, max_value=5),
+                st.booleans(),
+            ),
+            min_size=1,
+            max_size=20,
+        ),
+        st.lists(st.integers(min_value=-3, max_value=3), max_size=20),
+    )
+    def test_same_order_as_bpqueue(
+        self, keys: list[tuple[int, bool]], deltas: list[int]
+    ) -> None:
+        """ArrayBPQueue should pop items in exactly the same order as BPQueue."""
+        n = len(keys)
+        bpq = BPQueue(-10, 10)
+        abpq = ArrayBPQueue(-10, 10, n)
+        nodes = [Dllink([0, i]) for i in range(n)]
+        for i, (k, left) in enumerate(keys):
+            if left:
+                bpq.appendleft(nodes[i], k)
+                abpq.appendleft(i, k)
+            else:
+                bpq.append(nodes[i], k)
+                abpq.append(i, k)
+        for j, delta in enumerate(deltas):
+            i = j % n
+            if not -10 <= abpq.get_key(i) + delta <= 10:
+                continue
+            bpq.modify_key(nodes[i], delta)
+            abpq.modify_key(i, delta)
+
+        assert [node.data[1] for node in bpq] == list(abpq)
+        while not bpq.is_empty():
+            assert bpq.get_max() == abpq.get_max()
+            assert bpq.popleft().data[1] == abpq.popleft()
+        assert abpq.is_empty()
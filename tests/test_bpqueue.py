@@ -2,7 +2,14 @@ import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
-from mywheel.bpqueue import BPQueue
+from mywheel.bpqueue import (
+    BitmapBPQueue,
+    BPQueue,
+    CountingBPQueue,
+    DoubleEndedBPQueue,
+    GrowableBPQueue,
+    PolicyBPQueue,
+)
 from mywheel.dllist import Dllink
 
 
@@ -94,6 +101,38 @@ class TestBPQueue:
         bpq.modify_key(a, 3)  # Should have no effect
         assert bpq.get_max() == 0
 
+    def test_extend_matches_append(self) -> None:
+        keys = [3, -2, 5, 3, -5, 0, 3]
+        bpq1 = BPQueue(-5, 5)
+        bpq2 = BPQueue(-5, 5)
+        nodes1 = [Dllink([0, i]) for i in range(len(keys))]
+        nodes2 = [Dllink([0, i]) for i in range(len(keys))]
+        bpq1.append(nodes1[0], keys[0])
+        bpq2.append(nodes2[0], keys[0])
+        for node, k in zip(nodes1[1:], keys[1:]):
+            bpq1.append(node, k)
+        bpq2.extend(nodes2[1:], keys[1:])
+
+        assert bpq2.get_max() == bpq1.get_max() == 5
+        assert [it.data for it in bpq2] == [it.data for it in bpq1]
+
+    def test_from_keys(self) -> None:
+        nodes = [Dllink([0, i]) for i in range(3)]
+        bpq = BPQueue.from_keys(-5, 5, iter(nodes), iter([-1, 4, -1]))
+        assert bpq.get_max() == 4
+        assert [bpq.popleft().data[1] for _ in range(3)] == [1, 0, 2]
+        assert bpq.is_empty()
+
+    def test_from_keys_empty(self) -> None:
+        bpq = BitmapBPQueue.from_keys(-5, 5, [], [])
+        assert isinstance(bpq, BitmapBPQueue)
+        assert bpq.is_empty()
+
+    def test_extend_out_of_range(self) -> None:
+        bpq = BPQueue(-5, 5)
+        with pytest.raises(AssertionError):
+            bpq.extend([Dllink([0, 1])], [6])
+
 
 class TestBPQueueIterator:
     def test_iteration(self) -> None:
@@ -127,6 +166,148 @@ class TestBPQueueIterator:
             next(it)
 
 
+class TestBPQueueIterRange:
+    def test_iter_top(self) -> None:
+        bpq = BPQueue(-5, 5)
+        nodes = [Dllink([0, i]) for i in range(5)]
+        bpq.extend(nodes, [5, -5, 2, 2, 0])
+        assert [it.data[1] for it in bpq.iter_top(3)] == [0, 2, 3]
+        assert [it.data[1] for it in bpq.iter_top(0)] == []
+        assert len(list(bpq.iter_top(10))) == 5
+        assert list(BPQueue(-5, 5).iter_top(3)) == []
+
+    def test_iter_range(self) -> None:
+        bpq = BPQueue(-5, 5)
+        nodes = [Dllink([0, i]) for i in range(5)]
+        bpq.extend(nodes, [5, -5, 2, 2, 0])
+        assert [it.data[1] for it in bpq.iter_range(0, 4)] == [2, 3, 4]
+        assert [it.data[1] for it in bpq.iter_range(3, 4)] == []
+        assert [it.data[1] for it in bpq.iter_range(-9, -5)] == [1]
+        assert [it.data[1] for it in bpq.iter_range(6, 9)] == []
+        assert [it.data[1] for it in bpq.iter_range(-9, -6)] == []
+
+    def test_buckets_outside_range_untouched(self) -> None:
+        bpq = BPQueue(-5, 5)
+        bpq.append(Dllink([0, 1]), 5)
+        bpq.append(Dllink([0, 2]), 1)
+        bpq.append(Dllink([0, 3]), -5)
+        bpq._bucket[1] = None  # type: ignore
+        bpq._bucket[11] = None  # type: ignore
+        assert [it.data[1] for it in bpq.iter_range(-4, 4)] == [2]
+
+    def test_detach_while_iterating(self) -> None:
+        bpq = BPQueue(-5, 5)
+        nodes = [Dllink([0, i]) for i in range(4)]
+        bpq.extend(nodes, [1, 1, 0, 0])
+        seen = []
+        for it in bpq.iter_top(4):
+            seen.append(it.data[1])
+            bpq.detach(it)
+        assert seen == [0, 1, 2, 3]
+        assert bpq.is_empty()
+
+    @pytest.mark.parametrize(
+        "cls", [BPQueue, BitmapBPQueue, DoubleEndedBPQueue, CountingBPQueue]
+    )
+    def test_subclasses(self, cls) -> None:
+        bpq = cls(-100, 100)
+        nodes = [Dllink([0, i]) for i in range(3)]
+        bpq.extend(nodes, [90, -90, 0])
+        assert [it.data[1] for it in bpq.iter_range(-95, 50)] == [2, 1]
+        assert [it.data[1] for it in bpq.iter_top(2)] == [0, 2]
+
+
+@given(
+    st.lists(st.integers(min_value=-6, max_value=6), max_size=30),
+    st.integers(min_value=-8, max_value=8),
+    st.integers(min_value=-8, max_value=8),
+)
+def test_iter_range_matches_filter(keys, lo, hi) -> None:
+    for cls in (BPQueue, BitmapBPQueue):
+        bpq = cls(-6, 6)
+        nodes = [Dllink([0, i]) for i in range(len(keys))]
+        bpq.extend(nodes, keys)
+        expected = [it.data[1] for it in bpq if lo <= it.data[0] - 7 <= hi]
+        assert [it.data[1] for it in bpq.iter_range(lo, hi)] == expected
+        top = [it.data[1] for it in bpq]
+        assert [it.data[1] for it in bpq.iter_top(3)] == top[:3]
+
+
+class TestBPQueueToArrays:
+    def test_empty(self) -> None:
+        keys, ids = BPQueue(-3, 3).to_arrays()
+        assert keys.typecode == ids.typecode == "q"
+        assert len(keys) == len(ids) == 0
+
+    @pytest.mark.parametrize("cls", [BPQueue, BitmapBPQueue, GrowableBPQueue])
+    def test_traversal_order(self, cls) -> None:
+        bpq = cls(-70, 70)
+        nodes = [Dllink([0, i]) for i in range(6)]
+        bpq.extend(nodes, [3, -70, 3, 70, 0, 3])
+        keys, ids = bpq.to_arrays()
+        expected = [(it.data[0] + bpq._offset, it.data[1]) for it in bpq]
+        assert list(zip(keys, ids)) == expected
+        assert keys.tolist() == [70, 3, 3, 3, 0, -70]
+
+
+@given(st.lists(st.integers(min_value=-8, max_value=8), max_size=40))
+def test_to_arrays_matches_iteration(keys) -> None:
+    bpq = BPQueue(-8, 8)
+    bpq.extend([Dllink([0, i]) for i in range(len(keys))], keys)
+    out_keys, out_ids = bpq.to_arrays()
+    assert out_keys.tolist() == [it.data[0] + bpq._offset for it in bpq]
+    assert out_ids.tolist() == [it.data[1] for it in bpq]
+    assert sorted(out_keys.tolist()) == sorted(keys)
+
+
+class TestBPQueueBuffer:
+    def test_round_trip(self) -> None:
+        nodes = [Dllink([0, i]) for i in range(6)]
+        bpq = BPQueue.from_keys(-5, 5, nodes, [2, -5, 2, 5, 0, 2])
+        bpq.detach(nodes[2])
+        bpq.appendleft(nodes[2], 2)  # reorder within a bucket
+        buf = bpq.to_buffer()
+        assert isinstance(buf, bytes)
+        copies = [Dllink([0, i]) for i in range(6)]
+        restored = BPQueue.from_buffer(copies, buf)
+        assert restored.get_max() == 5
+        assert [it.data for it in restored] == [it.data for it in bpq]
+
+    def test_empty(self) -> None:
+        bpq = BPQueue(-3, 7)
+        restored = BPQueue.from_buffer([], bpq.to_buffer())
+        assert restored.is_empty()
+        assert restored.get_max() == -4
+
+    def test_long_bucket(self) -> None:
+        n = 100_000
+        nodes = [Dllink([0, i]) for i in range(n)]
+        bpq = BPQueue.from_keys(0, 1, nodes, [1] * n)
+        restored = BPQueue.from_buffer(nodes, bpq.to_buffer())
+        assert [it.data[1] for it in restored.iter_top(3)] == [0, 1, 2]
+
+    @pytest.mark.parametrize(
+        "cls",
+        [BPQueue, BitmapBPQueue, DoubleEndedBPQueue, GrowableBPQueue, CountingBPQueue],
+    )
+    def test_subclasses(self, cls) -> None:
+        nodes = [Dllink([0, i]) for i in range(4)]
+        bpq = cls(-70, 70)
+        bpq.extend(nodes, [-70, 0, 70, 0])
+        restored = cls.from_buffer([Dllink([0, i]) for i in range(4)], bpq.to_buffer())
+        assert type(restored) is cls
+        assert [it.data for it in restored] == [it.data for it in bpq]
+
+    def test_grown_range(self) -> None:
+        bpq = GrowableBPQueue(-2, 2)
+        nodes = [Dllink([0, i]) for i in range(2)]
+        bpq.append(nodes[0], 9)
+        bpq.append(nodes[1], -9)
+        restored = GrowableBPQueue.from_buffer(nodes, bpq.to_buffer())
+        assert restored.get_range() == bpq.get_range()
+        assert restored.get_max() == 9
+
+
 class TestBPQueueCoverage:
     """Additional tests to improve coverage for BPQueue."""
 
@@ -405,3 +586,661 @@ class TestBPQueueProperties:
                     found = True
                     break
             assert not found
+
+    @given(
+        st.lists(st.integers(min_value=-5, max_value=5), min_size=1, max_size=10),
+        st.lists(
+            st.tuples(
+                st.integers(min_value=0, max_value=9),
+                st.integers(min_value=-4, max_value=4),
+            ),
+            max_size=30,
+        ),
+        st.booleans(),
+    )
+    def test_bpqueue_modify_keys_property(
+        self, keys: list[int], updates: list[tuple[int, int]], bitmap: bool
+    ) -> None:
+        """modify_keys should match a sequence of modify_key calls."""
+        n = len(keys)
+        bpq1 = BPQueue(-5, 5)
+        bpq2 = BitmapBPQueue(-5, 5) if bitmap else BPQueue(-5, 5)
+        nodes1 = [Dllink([0, i]) for i in range(n)]
+        nodes2 = [Dllink([0, i]) for i in range(n)]
+        bpq1.extend(nodes1, keys)
+        bpq2.extend(nodes2, keys)
+        bpq1.detach(nodes1[0])
+        bpq2.detach(nodes2[0])
+        nodes1[0].lock()
+        nodes2[0].lock()
+
+        current = list(keys)
+        batch1, batch2, deltas = [], [], []
+        for i, delta in updates:
+            i %= n
+            if not -5 <= current[i] + delta <= 5:
+                continue
+            current[i] += delta
+            batch1.append(nodes1[i])
+            batch2.append(nodes2[i])
+            deltas.append(delta)
+        for node, delta in zip(batch1, deltas):
+            bpq1.modify_key(node, delta)
+        bpq2.modify_keys(batch2, deltas)
+
+        assert bpq1.get_max() == bpq2.get_max()
+        assert [it.data for it in bpq1] == [it.data for it in bpq2]
+
+
+class TestBitmapBPQueue:
+    def test_sparse_wide_range(self) -> None:
+        bpq = BitmapBPQueue(-1000, 1000)
+        a = Dllink([0, 1])
+        b = Dllink([0, 2])
+        c = Dllink([0, 3])
+        bpq.append(a, 999)
+        bpq.append(b, -999)
+        bpq.append(c, 0)
+
+        assert [item.data[1] for item in bpq] == [1, 3, 2]
+        assert bpq.popleft() is a
+        assert bpq.get_max() == 0
+        bpq.detach(c)
+        assert bpq.get_max() == -999
+        bpq.increase_key(b, 1998)
+        assert bpq.get_max() == 999
+        bpq.decrease_key(b, 1999)
+        assert bpq.get_max() == -1000
+        assert bpq.popleft() is b
+        assert bpq.is_empty()
+        assert list(bpq) == []
+
+    def test_extend(self) -> None:
+        bpq = BitmapBPQueue(-100, 100)
+        nodes = [Dllink([0, i]) for i in range(3)]
+        bpq.extend(nodes, [-90, 80, -90])
+        assert bpq.popleft() is nodes[1]
+        assert bpq.get_max() == -90
+        assert bpq.popleft() is nodes[0]
+        assert bpq.popleft() is nodes[2]
+        assert bpq.is_empty()
+
+    def test_clear(self) -> None:
+        bpq = BitmapBPQueue(-100, 100)
+        bpq.append(Dllink([0, 1]), 50)
+        bpq.clear()
+        assert bpq.is_empty()
+        bpq.append(Dllink([0, 2]), -50)
+        assert bpq.get_max() == -50
+
+    @given(
+        st.lists(
+            st.tuples(
+                st.sampled_from(["append", "appendleft", "modify", "detach", "pop"]),
+                st.integers(min_value=0, max_value=9),
+                st.integers(min_value=-150, max_value=150),
+            ),
+            max_size=50,
+        )
+    )
+    def test_matches_bpqueue_property(self, ops: list[tuple[str, int, int]]) -> None:
+        """BitmapBPQueue should behave exactly like BPQueue."""
+        bpq = BPQueue(-150, 150)
+        bmq = BitmapBPQueue(-150, 150)
+        nodes = [Dllink([0, i]) for i in range(10)]
+        twins = [Dllink([0, i]) for i in range(10)]
+        queued = set()
+        for op, i, k in ops:
+            if op in ("append", "appendleft") and i not in queued:
+                getattr(bpq, op)(nodes[i], k)
+                getattr(bmq, op)(twins[i], k)
+                queued.add(i)
+            elif op == "modify" and i in queued:
+                delta = k - bpq.get_max()
+                if 0 < nodes[i].data[0] + delta <= 301:
+                    bpq.modify_key(nodes[i], delta)
+                    bmq.modify_key(twins[i], delta)
+            elif op == "detach" and i in queued:
+                bpq.detach(nodes[i])
+                bmq.detach(twins[i])
+                queued.discard(i)
+            elif op == "pop" and queued:
+                j = bpq.popleft().data[1]
+                assert bmq.popleft().data[1] == j
+                queued.discard(j)
+            assert bpq.get_max() == bmq.get_max()
+            assert [n.data[1] for n in bpq] == [n.data[1] for n in bmq]
+
+
+class TestDoubleEndedBPQueue:
+    def test_constructor(self) -> None:
+        bpq = DoubleEndedBPQueue(-3, 3)
+        assert bpq.is_empty()
+        assert bpq.get_min() == 4  # b + 1
+        assert list(bpq) == []
+
+    def test_both_ends(self) -> None:
+        bpq = DoubleEndedBPQueue(-5, 5)
+        nodes = [Dllink([0, i]) for i in range(4)]
+        for node, k in zip(nodes, [0, 5, -5, 0]):
+            bpq.append(node, k)
+        assert bpq.get_max() == 5
+        assert bpq.get_min() == -5
+        assert bpq.popright() is nodes[2]
+        assert bpq.get_min() == 0
+        assert bpq.popleft() is nodes[1]
+        assert bpq.popright() is nodes[3]
+        assert bpq.popright() is nodes[0]
+        assert bpq.is_empty()
+        assert bpq.get_min() == 6
+        assert bpq.get_max() == -6
+
+    def test_popleft_to_empty(self) -> None:
+        bpq = DoubleEndedBPQueue(-5, 5)
+        bpq.appendleft(Dllink([0, 1]), 2)
+        bpq.popleft()
+        assert bpq.get_min() == 6
+        bpq.append(Dllink([0, 2]), -1)
+        assert bpq.get_min() == bpq.get_max() == -1
+
+    def test_clear(self) -> None:
+        bpq = DoubleEndedBPQueue(-5, 5)
+        bpq.append(Dllink([0, 1]), 2)
+        bpq.clear()
+        assert bpq.is_empty()
+        assert bpq.get_min() == 6
+
+    @given(
+        st.lists(
+            st.tuples(
+                st.sampled_from(
+                    [
+                        "append",
+                        "appendleft",
+                        "modify",
+                        "batch",
+                        "detach",
+                        "popleft",
+                        "popright",
+                    ]
+                ),
+                st.integers(min_value=0, max_value=9),
+                st.integers(min_value=-5, max_value=5),
+            ),
+            max_size=50,
+        )
+    )
+    def test_min_max_property(self, ops: list[tuple[str, int, int]]) -> None:
+        """get_min and get_max should match the smallest and largest queued keys."""
+        bpq = DoubleEndedBPQueue(-5, 5)
+        nodes = [Dllink([0, i]) for i in range(10)]
+        keys: dict[int, int] = {}
+        for op, i, k in ops:
+            if op in ("append", "appendleft") and i not in keys:
+                getattr(bpq, op)(nodes[i], k)
+                keys[i] = k
+            elif op == "modify" and i in keys:
+                bpq.modify_key(nodes[i], k - keys[i])
+                keys[i] = k
+            elif op == "batch" and i in keys:
+                bpq.modify_keys([nodes[i]], [k - keys[i]])
+                keys[i] = k
+            elif op == "detach" and i in keys:
+                bpq.detach(nodes[i])
+                del keys[i]
+            elif op == "popleft" and keys:
+                del keys[bpq.popleft().data[1]]
+            elif op == "popright" and keys:
+                j = bpq.popright().data[1]
+                assert keys[j] == min(keys.values())
+                del keys[j]
+            if keys:
+                assert bpq.get_min() == min(keys.values())
+                assert bpq.get_max() == max(keys.values())
+            else:
+                assert bpq.is_empty()
+                assert bpq.get_min() == 6
+
+
+class TestGrowableBPQueue:
+    def test_grow_up_and_down(self) -> None:
+        bpq = GrowableBPQueue(0, 1)
+        a = Dllink([0, 1])
+        b = Dllink([0, 2])
+        c = Dllink([0, 3])
+        bpq.append(a, 1)
+        bpq.append(b, 1)
+        bpq.append(c, 100)
+        lo, hi = bpq.get_range()
+        assert lo == 0 and hi >= 100
+        bpq.appendleft(Dllink([0, 4]), -100)
+        lo, hi = bpq.get_range()
+        assert lo <= -100 and hi >= 100
+        # existing items keep their keys and their order
+        assert [(it.data[1], it.data[0] + lo - 1) for it in bpq] == [
+            (3, 100),
+            (1, 1),
+            (2, 1),
+            (4, -100),
+        ]
+        assert bpq.popleft() is c
+        assert bpq.get_max() == 1
+
+    def test_key_updates_grow(self) -> None:
+        bpq = GrowableBPQueue(0, 0)
+        a = Dllink([0, 1])
+        b = Dllink([0, 2])
+        bpq.append(a, 0)
+        bpq.append(b, 0)
+        bpq.modify_key(a, -50)
+        bpq.modify_key(b, 70)
+        assert bpq.get_max() == 70
+        assert bpq.popleft() is b
+        assert bpq.get_max() == -50
+        bpq.decrease_key(a, 1000)
+        assert bpq.get_max() == -1050
+
+    def test_modify_keys_repeated_item(self) -> None:
+        bpq = GrowableBPQueue(0, 3)
+        a = Dllink([0, 1])
+        b = Dllink([0, 2])
+        bpq.extend([a, b], [3, 0])
+        bpq.modify_keys([a, a], [3, 3])
+        assert bpq.get_max() == 9
+        bpq.modify_keys([b, b, b], [-4, -4, 5])
+        assert bpq.get_range()[0] <= -8
+        assert [it.data[0] + bpq._offset for it in bpq] == [9, -3]
+
+    def test_reject_stale_key(self) -> None:
+        bpq = GrowableBPQueue(0, 3)
+        a = Dllink([0, 1])
+        bpq.append(a, 2)
+        bpq.detach(a)
+        bpq.append(Dllink([0, 2]), -20)
+        with pytest.raises(AssertionError):
+            bpq.increase_key(a, 1)
+        with pytest.raises(AssertionError):
+            bpq.decrease_key(a, 1)
+        with pytest.raises(AssertionError):
+            bpq.modify_keys([a], [1])
+        bpq.append(a, 3)  # re-insert with a fresh key instead
+        assert bpq.get_max() == 3
+        assert [it.data[0] + bpq._offset for it in bpq] == [3, -20]
+
+    def test_empty_grow_down(self) -> None:
+        bpq = GrowableBPQueue(0, 0)
+        bpq.extend([], [])
+        bpq.modify_keys([], [])
+        assert bpq.get_range() == (0, 0)
+        a = Dllink([0, 1])
+        bpq.append(a, -3)
+        assert bpq.get_max() == -3
+        assert bpq.popleft() is a
+        assert bpq.is_empty()
+
+    @given(
+        st.lists(
+            st.tuples(
+                st.sampled_from(["append", "modify", "batch", "popleft"]),
+                st.integers(min_value=0, max_value=9),
+                st.integers(min_value=-200, max_value=200),
+            ),
+            max_size=40,
+        )
+    )
+    def test_matches_wide_bpqueue_property(
+        self, ops: list[tuple[str, int, int]]
+    ) -> None:
+        """A small GrowableBPQueue should behave like a BPQueue sized for all keys."""
+        ref = BPQueue(-400, 400)
+        bpq = GrowableBPQueue(0, 1)
+        nodes = [Dllink([0, i]) for i in range(10)]
+        twins = [Dllink([0, i]) for i in range(10)]
+        keys: dict[int, int] = {}
+        for op, i, k in ops:
+            if op == "append" and i not in keys:
+                ref.append(nodes[i], k)
+                bpq.append(twins[i], k)
+                keys[i] = k
+            elif op == "modify" and i in keys:
+                ref.modify_key(nodes[i], k - keys[i])
+                bpq.modify_key(twins[i], k - keys[i])
+                keys[i] = k
+            elif op == "batch" and i in keys:
+                ref.modify_keys([nodes[i]], [k - keys[i]])
+                bpq.modify_keys([twins[i]], [k - keys[i]])
+                keys[i] = k
+            elif op == "popleft" and keys:
+                j = ref.popleft().data[1]
+                assert bpq.popleft().data[1] == j
+                del keys[j]
+            assert ref.get_max() == bpq.get_max() or not keys
+            assert [n.data[1] for n in ref] == [n.data[1] for n in bpq]
+
+
+class TestCountingBPQueue:
+    def test_counts(self) -> None:
+        bpq = CountingBPQueue(-2, 2)
+        a = Dllink([0, 1])
+        b = Dllink([0, 2])
+        bpq.append(a, 2)
+        bpq.appendleft(b, 2)
+        assert len(bpq) == 2
+        assert bpq.count(2) == 2
+        c = Dllink([0, 3])
+        bpq.set_key(c, 1)
+        bpq.increase_key(c, 1)  # not in the queue yet
+        assert len(bpq) == 3
+        d = Dllink([0, 4])
+        bpq.set_key(d, 2)
+        bpq.decrease_key(d, 1)  # not in the queue yet
+        assert len(bpq) == 4
+        assert bpq.histogram() == [0, 0, 0, 1, 3]
+        bpq.clear()
+        assert len(bpq) == 0
+        assert bpq.histogram() == [0, 0, 0, 0, 0]
+
+    def test_popleft_empty(self) -> None:
+        bpq = CountingBPQueue(-2, 2)
+        with pytest.raises(AssertionError):
+            bpq.popleft()
+        assert len(bpq) == 0
+        assert bpq._count[0] == 0
+        bpq.append(Dllink([0, 1]), 0)
+        assert bpq.popleft().data[1] == 1
+        assert bpq.histogram() == [0, 0, 0, 0, 0]
+
+    @given(
+        st.lists(
+            st.tuples(
+                st.sampled_from(
+                    ["append", "appendleft", "modify", "batch", "detach", "popleft"]
+                ),
+                st.integers(min_value=0, max_value=9),
+                st.integers(min_value=-5, max_value=5),
+            ),
+            max_size=50,
+        )
+    )
+    def test_counts_property(self, ops: list[tuple[str, int, int]]) -> None:
+        """len, count and histogram should match the queued keys."""
+        bpq = CountingBPQueue(-5, 5)
+        nodes = [Dllink([0, i]) for i in range(10)]
+        keys: dict[int, int] = {}
+        for op, i, k in ops:
+            if op in ("append", "appendleft") and i not in keys:
+                getattr(bpq, op)(nodes[i], k)
+                keys[i] = k
+            elif op == "modify" and i in keys:
+                bpq.modify_key(nodes[i], k - keys[i])
+                keys[i] = k
+            elif op == "batch" and i in keys:
+                bpq.modify_keys([nodes[i]], [k - keys[i]])
+                keys[i] = k
+            elif op == "detach" and i in keys:
+                bpq.detach(nodes[i])
+                del keys[i]
+            elif op == "popleft" and keys:
+                del keys[bpq.popleft().data[1]]
+            assert len(bpq) == len(keys)
+            expected = [0] * 11
+            for key in keys.values():
+                expected[key + 5] += 1
+            assert bpq.histogram() == expected
+            assert all(bpq.count(key) == expected[key + 5] for key in range(-5, 6))
+
+    def test_reinsert_detached(self) -> None:
+        bpq = CountingBPQueue(-2, 2)
+        a = Dllink([0, 3])
+        bpq.append(a, 0)
+        bpq.detach(a)
+        bpq.increase_key(a, 1)
+        assert len(bpq) == 1
+        assert bpq.histogram() == [0, 0, 0, 1, 0]
+
+    def test_detach_twice(self) -> None:
+        bpq = CountingBPQueue(-2, 2)
+        a, b = Dllink([0, 3]), Dllink([0, 4])
+        bpq.extend([a, b], [0, 1])
+        bpq.detach(a)
+        bpq.detach(a)
+        assert bpq.popleft() is b
+        bpq.detach(b)
+        assert len(bpq) == 0
+        assert bpq.histogram() == [0, 0, 0, 0, 0]
+
+    def test_reinsert_popped_batch(self) -> None:
+        bpq = CountingBPQueue(-2, 2)
+        bpq.extend([Dllink([0, 3]), Dllink([0, 4])], [0, 1])
+        x = bpq.popleft()
+        bpq.modify_keys([x], [1])
+        assert len(bpq) == 2
+        assert bpq.histogram() == [0, 0, 1, 0, 1]
+
+    @given(
+        st.lists(st.integers(min_value=-5, max_value=5), min_size=1, max_size=10),
+        st.lists(
+            st.tuples(
+                st.sampled_from(["modify", "batch", "popleft", "detach"]),
+                st.integers(min_value=0, max_value=9),
+                st.integers(min_value=-3, max_value=3),
+                st.booleans(),
+            ),
+            max_size=40,
+        ),
+    )
+    def test_reinsert_matches_bpqueue(
+        self, keys: list[int], ops: list[tuple[str, int, int, bool]]
+    ) -> None:
+        """Re-inserting popped or detached items should count as inserts."""
+        counting = CountingBPQueue(-5, 5)
+        plain = BPQueue(-5, 5)
+        nodes_c = [Dllink([0, i]) for i in range(len(keys))]
+        nodes_p = [Dllink([0, i]) for i in range(len(keys))]
+        counting.extend(nodes_c, keys)
+        plain.extend(nodes_p, keys)
+
+        def reinsert(q: BPQueue, node: Dllink, delta: int, batch: bool) -> None:
+            delta = delta if 0 < node.data[0] + delta <= 11 else 0
+            if batch:
+                q.modify_keys([node], [delta])
+            else:
+                q.modify_key(node, delta)
+
+        for op, i, delta, batch in ops:
+            j = i % len(keys)
+            if op in ("modify", "batch"):
+                node = nodes_c[j]
+                if node.next is node or node.prev.next is not node:
+                    continue
+                for q, node in ((counting, nodes_c[j]), (plain, nodes_p[j])):
+                    reinsert(q, node, delta, op == "batch")
+            elif counting.is_empty():
+                continue
+            else:
+                if op == "popleft":
+                    x_c, x_p = counting.popleft(), plain.popleft()
+                else:
+                    x_c = x_p = None
+                    for a, b in zip(nodes_c, nodes_p):
+                        if a.next is not a and a.prev.next is a:
+                            x_c, x_p = a, b
+                            break
+                    counting.detach(x_c)
+                    plain.detach(x_p)
+                if batch:  # re-insert the removed item straight away
+                    delta = delta or 1
+                    reinsert(counting, x_c, delta, True)
+                    reinsert(plain, x_p, delta, True)
+            queued = [(it.data[1], it.data[0]) for it in plain]
+            assert [(it.data[1], it.data[0]) for it in counting] == queued
+            assert len(counting) == len(queued)
+            expected = [0] * 11
+            for _, key in queued:
+                expected[key - 1] += 1
+            assert counting.histogram() == expected
+
+
+class TestPolicyBPQueue:
+    def test_unknown_policy(self) -> None:
+        with pytest.raises(ValueError):
+            PolicyBPQueue(-3, 3, "random")
+
+    @pytest.mark.parametrize(
+        "policy, expected",
+        [("fm", [3, 1, 2, 0]), ("lifo", [3, 1, 0, 2]), ("fifo", [1, 3, 2, 0])],
+    )
+    def test_key_changes(self, policy, expected) -> None:
+        bpq = PolicyBPQueue(-3, 3, policy)
+        nodes = [Dllink([0, i]) for i in range(4)]
+        bpq.extend(nodes, [2, 1, 0, 0])
+        bpq.decrease_key(nodes[0], 2)  # to bucket 0, behind or before 2
+        bpq.increase_key(nodes[3], 1)  # to bucket 1, behind or before 1
+        assert [it.data[1] for it in bpq] == expected
+
+    @pytest.mark.parametrize(
+        "policy, expected",
+        [("fm", [3, 1, 2, 0]), ("lifo", [3, 1, 0, 2]), ("fifo", [1, 3, 2, 0])],
+    )
+    def test_from_keys_and_buffer(self, policy, expected) -> None:
+        nodes = [Dllink([0, i]) for i in range(4)]
+        bpq = PolicyBPQueue.from_keys(-3, 3, nodes, [2, 1, 0, 0], policy=policy)
+        copies = [Dllink([0, i]) for i in range(4)]
+        restored = PolicyBPQueue.from_buffer(copies, bpq.to_buffer(), policy)
+        for q, items in ((bpq, nodes), (restored, copies)):
+            q.decrease_key(items[0], 2)
+            q.increase_key(items[3], 1)
+            assert [it.data[1] for it in q] == expected
+
+    def test_modify_keys(self) -> None:
+        bpq = PolicyBPQueue(-3, 3, "lifo")
+        nodes = [Dllink([0, i]) for i in range(3)]
+        bpq.extend(nodes, [0, 2, 1])
+        bpq.modify_keys(nodes[1:], [-2, -1])
+        assert [it.data[1] for it in bpq] == [2, 1, 0]
+        assert bpq.get_max() == 0
+
+    def test_secondary_key(self) -> None:
+        weight = {0: 5, 1: 9, 2: 5, 3: 1, 4: 4}
+        bpq = PolicyBPQueue(-3, 3, lambda it: weight[it.data[1]])
+        nodes = [Dllink([0, i]) for i in range(4)]
+        bpq.extend(nodes, [1, 1, 1, 2])
+        assert [it.data[1] for it in bpq] == [3, 1, 0, 2]
+        bpq.modify_key(nodes[3], -1)
+        assert [it.data[1] for it in bpq] == [1, 0, 2, 3]
+        bpq.appendleft(Dllink([0, 4]), 1)  # sorted, not at the front
+        assert [it.data[1] for it in bpq] == [1, 0, 2, 4, 3]
+
+    @given(
+        st.lists(
+            st.tuples(
+                st.sampled_from(["append", "appendleft", "modify", "popleft"]),
+                st.integers(min_value=0, max_value=7),
+                st.integers(min_value=-4, max_value=4),
+            ),
+            max_size=40,
+        )
+    )
+    def test_fm_policy_matches_bpqueue(self, ops) -> None:
+        plain = BPQueue(-4, 4)
+        policy = PolicyBPQueue(-4, 4, "fm")
+        nodes1 = [Dllink([0, i]) for i in range(8)]
+        nodes2 = [Dllink([0, i]) for i in range(8)]
+        keys: dict[int, int] = {}
+        for op, i, k in ops:
+            if op in ("append", "appendleft") and i not in keys:
+                getattr(plain, op)(nodes1[i], k)
+                getattr(policy, op)(nodes2[i], k)
+                keys[i] = k
+            elif op == "modify" and i in keys:
+                plain.modify_key(nodes1[i], k - keys[i])
+                policy.modify_key(nodes2[i], k - keys[i])
+                keys[i] = k
+            elif op == "popleft" and keys:
+                del keys[plain.popleft().data[1]]
+                policy.popleft()
+            assert [it.data for it in policy] == [it.data for it in plain]
+
+    @given(
+        st.lists(
+            st.tuples(
+                st.integers(min_value=-3, max_value=3),
+                st.integers(min_value=0, max_value=3),
+            ),
+            max_size=30,
+        )
+    )
+    def test_secondary_key_sorted(self, pairs) -> None:
+        bpq = PolicyBPQueue(-3, 3, lambda it: it.data[2])
+        for i, (k, w) in enumerate(pairs):
+            bpq.append(Dllink([0, i, w]), k)
+        order = [(it.data[0], -it.data[2], it.data[1]) for it in bpq]
+        assert order == sorted(order, key=lambda t: (-t[0], t[1], t[2]))
+
+
+class TestMergeBucket:
+    @pytest.mark.parametrize(
+        "cls",
+        [
+            BPQueue,
+            BitmapBPQueue,
+            DoubleEndedBPQueue,
+            GrowableBPQueue,
+            CountingBPQueue,
+            PolicyBPQueue,
+        ],
+    )
+    def test_merge_down_and_up(self, cls) -> None:
+        bpq = cls(-80, 80)
+        nodes = [Dllink([0, i]) for i in range(5)]
+        bpq.extend(nodes, [70, -70, 70, 0, -70])
+        bpq.merge_bucket(70, 0)
+        assert bpq.get_max() == 0
+        assert [it.data[1] for it in bpq] == [3, 0, 2, 1, 4]
+        bpq.merge_bucket(-70, 80)
+        assert bpq.get_max() == 80
+        assert [it.data[1] for it in bpq] == [1, 4, 3, 0, 2]
+        assert all(bpq.get_max() >= it.data[0] + bpq._offset for it in bpq)
+        bpq.merge_bucket(5, 6)  # empty source
+        bpq.merge_bucket(0, 0)  # same bucket
+        assert [it.data[1] for it in bpq] == [1, 4, 3, 0, 2]
+        while not bpq.is_empty():
+            bpq.popleft()
+
+    def test_bitmap_bits(self) -> None:
+        bpq = BitmapBPQueue(-100, 100)
+        bpq.append(Dllink([0, 1]), 90)
+        bpq.append(Dllink([0, 2]), -90)
+        bpq.merge_bucket(90, -50)
+        assert bpq.get_max() == -50
+        assert bpq._lower_key(200) == -50 - bpq._offset
+
+    def test_double_ended_min(self) -> None:
+        bpq = DoubleEndedBPQueue(-5, 5)
+        bpq.extend([Dllink([0, i]) for i in range(2)], [-2, 3])
+        bpq.merge_bucket(-2, 1)
+        assert bpq.get_min() == 1
+        bpq.merge_bucket(1, -5)
+        assert bpq.get_min() == -5
+
+    def test_growable(self) -> None:
+        bpq = GrowableBPQueue(-2, 2)
+        bpq.append(Dllink([0, 1]), 1)
+        bpq.merge_bucket(1, -9)
+        assert bpq.get_max() == -9
+        bpq.merge_bucket(50, 1)  # out of range, nothing there
+        assert bpq.get_range()[0] <= -9
+
+    def test_counting(self) -> None:
+        bpq = CountingBPQueue(-5, 5)
+        bpq.extend([Dllink([0, i]) for i in range(3)], [2, 2, -1])
+        bpq.merge_bucket(2, -1)
+        assert bpq.count(2) == 0
+        assert bpq.count(-1) == 3
+        assert len(bpq) == 3
+
+    def test_policy_sorted(self) -> None:
+        bpq = PolicyBPQueue(-5, 5, lambda it: it.data[1])
+        bpq.extend([Dllink([0, i]) for i in range(4)], [1, 0, 1, 0])
+        bpq.merge_bucket(1, 0)
+        assert [it.data[1] for it in bpq] == [3, 2, 1, 0]
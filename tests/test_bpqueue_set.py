@@ -0,0 +1,80 @@
+from hypothesis import given
+from hypothesis import strategies as st
+
+from mywheel.bpqueue_set import BPQueueSet
+from mywheel.dllist import Dllink
+
+
+class TestBPQueueSet:
+    def test_single_part(self) -> None:
+        qset = BPQueueSet(1, -3, 3)
+        assert qset.is_empty()
+        a = Dllink([0, 1])
+        qset.append(0, a, 2)
+        assert qset.best() == (0, 2)
+        assert qset.pop_best() == (0, a)
+        assert qset.is_empty()
+        assert list(qset.exclude(0)) == []
+
+    def test_kway_move(self) -> None:
+        num_parts = 3
+        qset = BPQueueSet(num_parts, -5, 5)
+        part = [0, 1, 2, 0]
+        gains = [[0, 2, -1], [3, 0, 1], [-2, 4, 0], [1, 1, 0]]
+        links = [[Dllink([0, v]) for v in range(4)] for _ in range(num_parts)]
+        for v in range(4):
+            for k in qset.exclude(part[v]):
+                qset.append(k, links[k][v], gains[v][k])
+
+        assert qset.best() == (1, 4)
+        k, it = qset.pop_best()
+        assert (k, it.data[1]) == (1, 2)
+        for j in qset.exclude(part[2]):
+            if j != k:
+                qset.detach(j, links[j][2])
+        assert qset.best() == (0, 3)
+        qset.modify_key(2, links[2][1], 3)
+        assert qset.best() == (2, 4)
+        qset.modify_keys(2, [links[2][1], links[2][0]], [-5, 3])
+        assert qset.get_max() == 3
+        qset.clear()
+        assert qset.is_empty()
+
+    def test_direct_access_with_update(self) -> None:
+        qset = BPQueueSet(5, -5, 5)
+        qset[3].extend([Dllink([0, 1]), Dllink([0, 2])], [4, -4])
+        qset.update(3)
+        assert qset.best() == (3, 4)
+        assert qset.popleft(3).data[1] == 1
+        assert qset.best() == (3, -4)
+        qset.appendleft(4, Dllink([0, 3]), -4)
+        qset.extend(0, [Dllink([0, 4])], [-5])
+        assert qset.best() == (3, -4)
+        assert len(qset) == 5
+
+    @given(
+        st.integers(min_value=1, max_value=9),
+        st.lists(
+            st.tuples(
+                st.integers(min_value=0, max_value=8),
+                st.integers(min_value=-5, max_value=5),
+                st.booleans(),
+            ),
+            max_size=40,
+        ),
+    )
+    def test_best_matches_scan_property(
+        self, num_parts: int, ops: list[tuple[int, int, bool]]
+    ) -> None:
+        """best() should agree with scanning get_max() over every queue."""
+        qset = BPQueueSet(num_parts, -5, 5)
+        for i, (k, key, pop) in enumerate(ops):
+            k %= num_parts
+            if pop and not qset.is_empty():
+                qset.pop_best()
+            else:
+                qset.append(k, Dllink([0, i]), key)
+            maxima = [qset[j].get_max() for j in range(num_parts)]
+            part, best = qset.best()
+            assert best == max(maxima)
+            assert part == maxima.index(best)
@@ -0,0 +1,59 @@
+import heapq
+from typing import Dict, List, Optional
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from mywheel.dial import dial_shortest_paths
+from mywheel.map_adapter import MapAdapter
+
+
+def dijkstra(graph: List[Dict[int, int]], source: int) -> List[Optional[int]]:
+    dist: List[Optional[int]] = [None] * len(graph)
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d != dist[u]:
+            continue
+        for v, w in graph[u].items():
+            old = dist[v]
+            if old is None or d + w < old:
+                dist[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+    return dist
+
+
+class TestDial:
+    def test_single_vertex(self) -> None:
+        assert dial_shortest_paths([{}], 0, 0) == [0]
+
+    def test_zero_weights(self) -> None:
+        graph = [{1: 0}, {2: 0, 0: 0}, {0: 3}]
+        assert dial_shortest_paths(graph, 0, 3) == [0, 0, 0]
+
+    def test_decrease_key_path(self) -> None:
+        # vertex 3 is first reached with distance 9, then improved twice
+        graph = [{3: 9, 1: 1}, {3: 7, 2: 1}, {3: 1}, {}]
+        assert dial_shortest_paths(graph, 0, 9) == [0, 1, 2, 3]
+
+    def test_map_adapter_graph(self) -> None:
+        graph = MapAdapter([{1: 2}, {0: 2, 2: 2}, {}])
+        assert dial_shortest_paths(graph, 1, 2) == [2, 0, 2]
+
+    @given(
+        st.integers(min_value=1, max_value=15).flatmap(
+            lambda n: st.lists(
+                st.dictionaries(
+                    st.integers(min_value=0, max_value=n - 1),
+                    st.integers(min_value=0, max_value=8),
+                    max_size=4,
+                ),
+                min_size=n,
+                max_size=n,
+            )
+        )
+    )
+    def test_matches_dijkstra_property(self, graph: List[Dict[int, int]]) -> None:
+        """Dial's algorithm should agree with a heap-based Dijkstra."""
+        assert dial_shortest_paths(graph, 0, 8) == dijkstra(graph, 0)
@@ -1,8 +1,11 @@
+from collections import deque
+
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
-from mywheel.dllist import Dllink, Dllist, DllIterator
+from mywheel.bpqueue import BPQueue
+from mywheel.dllist import Dllink, DllinkPool, Dllist, DllIterator, DllPool
 
 
 class TestDllink:
@@ -119,6 +122,248 @@ class TestDllist:
         assert items == []
 
 
+class TestDllistBulk:
+    def test_extend(self) -> None:
+        dlist: Dllist[int] = Dllist(0)
+        dlist.extend([])
+        assert dlist.is_empty()
+        dlist.append(Dllink(1))
+        dlist.extend(Dllink(i) for i in range(2, 5))
+        assert [node.data for node in dlist] == [1, 2, 3, 4]
+        assert [node.data for node in reversed(dlist)] == [4, 3, 2, 1]
+        dlist.append(Dllink(5))
+        assert dlist.pop().data == 5
+        assert dlist.pop().data == 4
+
+    def test_from_nodes(self) -> None:
+        nodes = [Dllink(i) for i in range(3)]
+        dlist = Dllist.from_nodes(-1, nodes)
+        assert dlist.head.data == -1
+        assert [node for node in dlist] == nodes
+
+    def test_from_iterable(self) -> None:
+        dlist = Dllist.from_iterable("h", "abc")
+        assert [node.data for node in dlist] == ["a", "b", "c"]
+        assert Dllist.from_iterable(0, []).is_empty()
+
+
+@given(st.lists(st.integers(), max_size=30), st.lists(st.integers(), max_size=30))
+def test_extend_matches_append(xs, ys) -> None:
+    bulk = Dllist.from_iterable(0, xs)
+    bulk.extend(Dllink(y) for y in ys)
+    single: Dllist[int] = Dllist(0)
+    for x in xs + ys:
+        single.append(Dllink(x))
+    assert [node.data for node in bulk] == [node.data for node in single]
+    assert [node.data for node in reversed(bulk)] == (xs + ys)[::-1]
+
+
+class TestDllistSort:
+    def test_sort_empty_and_single(self) -> None:
+        dlist: Dllist[int] = Dllist(0)
+        dlist.sort()
+        assert dlist.is_empty()
+        node = Dllink(5)
+        dlist.append(node)
+        dlist.sort()
+        assert list(dlist) == [node]
+
+    def test_sort_relinks_nodes(self) -> None:
+        nodes = [Dllink(v) for v in [5, 3, 9, 1, 3]]
+        dlist = Dllist.from_nodes(0, nodes)
+        dlist.sort()
+        assert [node.data for node in dlist] == [1, 3, 3, 5, 9]
+        assert [node.data for node in reversed(dlist)] == [9, 5, 3, 3, 1]
+        assert {id(node) for node in dlist} == {id(node) for node in nodes}
+        assert dlist.head.data == 0
+
+    def test_sort_is_stable(self) -> None:
+        dlist = Dllist.from_iterable((0, ""), [(2, "a"), (1, "b"), (2, "c"), (1, "d")])
+        dlist.sort(key=lambda pair: pair[0])
+        assert [node.data[1] for node in dlist] == ["b", "d", "a", "c"]
+
+    def test_insert_sorted(self) -> None:
+        dlist: Dllist[int] = Dllist(0)
+        for v in [3, 1, 2, 3, 0]:
+            dlist.insert_sorted(Dllink(v))
+        assert [node.data for node in dlist] == [0, 1, 2, 3, 3]
+        pairs = Dllist.from_iterable((0, ""), [(1, "a"), (3, "b")])
+        pairs.insert_sorted(Dllink((1, "c")), key=lambda pair: pair[0])
+        assert [node.data[1] for node in pairs] == ["a", "c", "b"]
+
+
+@given(st.lists(st.tuples(st.integers(0, 5), st.integers()), max_size=40))
+def test_sort_matches_sorted(pairs) -> None:
+    dlist = Dllist.from_iterable((0, 0), pairs)
+    dlist.sort(key=lambda pair: pair[0])
+    expected = sorted(pairs, key=lambda pair: pair[0])
+    assert [node.data for node in dlist] == expected
+    assert [node.data for node in reversed(dlist)] == expected[::-1]
+    ordered: Dllist = Dllist((0, 0))
+    for pair in pairs:
+        ordered.insert_sorted(Dllink(pair), key=lambda pair: pair[0])
+    assert [node.data for node in ordered] == expected
+
+
+class TestDllistSplice:
+    def make(self, values) -> tuple:
+        dlist: Dllist[int] = Dllist(-1)
+        nodes = [Dllink(v) for v in values]
+        for node in nodes:
+            dlist.append(node)
+        return dlist, nodes
+
+    def test_splice(self) -> None:
+        a, _ = self.make([1, 2])
+        b, _ = self.make([3, 4, 5])
+        a.splice(b)
+        assert [node.data for node in a] == [1, 2, 3, 4, 5]
+        assert [node.data for node in reversed_list(a)] == [5, 4, 3, 2, 1]
+        assert b.is_empty()
+        b.append(Dllink(6))
+        assert [node.data for node in b] == [6]
+
+    def test_splice_empty(self) -> None:
+        a, _ = self.make([])
+        b, _ = self.make([1])
+        a.splice(b)
+        assert [node.data for node in a] == [1]
+        a.splice(b)  # b is empty now
+        assert [node.data for node in a] == [1]
+
+    def test_splice_self(self) -> None:
+        a, _ = self.make([1, 2, 3])
+        with pytest.raises(AssertionError):
+            a.splice(a)
+        assert [node.data for node in a] == [1, 2, 3]
+
+    def test_split_after(self) -> None:
+        a, nodes = self.make([1, 2, 3, 4])
+        b = a.split_after(nodes[1])
+        assert b.head.data == -1
+        assert [node.data for node in a] == [1, 2]
+        assert [node.data for node in b] == [3, 4]
+        assert [node.data for node in reversed_list(a)] == [2, 1]
+        assert [node.data for node in reversed_list(b)] == [4, 3]
+
+    def test_split_after_ends(self) -> None:
+        a, nodes = self.make([1, 2])
+        b = a.split_after(nodes[-1])
+        assert b.is_empty()
+        c = a.split_after(a.head)
+        assert a.is_empty()
+        assert [node.data for node in c] == [1, 2]
+
+
+def reversed_list(dlist: Dllist) -> list:
+    res = []
+    node = dlist.head.prev
+    while node is not dlist.head:
+        res.append(node)
+        node = node.prev
+    return res
+
+
+@given(st.lists(st.integers(), max_size=30), st.integers(min_value=0, max_value=30))
+def test_iteration_matches_list(xs, start) -> None:
+    dlist: Dllist[int] = Dllist(0)
+    nodes = [Dllink(x) for x in xs]
+    for node in nodes:
+        dlist.append(node)
+    assert [node.data for node in dlist] == xs
+    assert [node.data for node in reversed(dlist)] == xs[::-1]
+    assert [node.data for node in DllIterator(dlist.head)] == xs
+    if start < len(xs):
+        assert [node.data for node in dlist.iter_from(nodes[start])] == xs[start:]
+
+
+@given(
+    st.lists(st.integers(), max_size=20),
+    st.lists(st.integers(), max_size=20),
+    st.integers(min_value=0, max_value=40),
+)
+def test_splice_split_round_trip(xs, ys, cut) -> None:
+    a: Dllist[int] = Dllist(0)
+    b: Dllist[int] = Dllist(0)
+    for x in xs:
+        a.append(Dllink(x))
+    for y in ys:
+        b.append(Dllink(y))
+    a.splice(b)
+    assert [node.data for node in a] == xs + ys
+    cut = min(cut, len(xs) + len(ys))
+    node = a.head
+    for _ in range(cut):
+        node = node.next
+    c = a.split_after(node)
+    assert [node.data for node in a] == (xs + ys)[:cut]
+    assert [node.data for node in c] == (xs + ys)[cut:]
+
+
+class TestDllistToArray:
+    def test_data(self) -> None:
+        dlist = Dllist.from_iterable(0, [3, 1, 2])
+        res = dlist.to_array()
+        assert res.typecode == "q"
+        assert res.tolist() == [3, 1, 2]
+        assert len(Dllist(0).to_array()) == 0
+
+    def test_field_and_typecode(self) -> None:
+        dlist = Dllist.from_iterable([0, 0.0], [[1, 0.5], [2, 1.5]])
+        assert dlist.to_array(field=0).tolist() == [1, 2]
+        assert dlist.to_array(field=1, typecode="d").tolist() == [0.5, 1.5]
+
+    def test_bad_typecode_value(self) -> None:
+        with pytest.raises(TypeError):
+            Dllist.from_iterable(0.0, [0.5]).to_array()
+
+
+class TestDllinkPool:
+    def test_reuse(self) -> None:
+        pool: DllinkPool[int] = DllinkPool()
+        dlist: Dllist[int] = Dllist(0)
+        nodes = [pool.acquire(i) for i in range(3)]
+        dlist.extend(nodes)
+        while not dlist.is_empty():
+            pool.release(dlist.popleft())
+        assert pool.num_free() == 3
+        again = [pool.acquire(i) for i in range(10, 14)]
+        assert {id(node) for node in again[:3]} == {id(node) for node in nodes}
+        assert [node.data for node in again] == [10, 11, 12, 13]
+        assert all(node.is_locked() for node in again)
+        assert (pool.hits, pool.misses) == (3, 4)
+        pool.reset_stats()
+        assert (pool.hits, pool.misses) == (0, 0)
+
+    def test_release_drops_data(self) -> None:
+        pool: DllinkPool[object] = DllinkPool()
+        node = pool.acquire(object())
+        pool.release(node)
+        assert node.data is None
+        assert node.is_locked()
+
+    def test_max_free(self) -> None:
+        pool: DllinkPool[int] = DllinkPool(max_free=2)
+        for i in range(5):
+            pool.release(Dllink(i))
+        assert pool.num_free() == 2
+        pool.acquire(0)
+        pool.acquire(0)
+        pool.acquire(0)
+        assert (pool.hits, pool.misses) == (2, 1)
+
+    def test_with_bpqueue(self) -> None:
+        pool: DllinkPool = DllinkPool()
+        bpq = BPQueue(-3, 3)
+        for _ in range(3):
+            for i in range(4):
+                bpq.append(pool.acquire([0, i]), i - 2)
+            while not bpq.is_empty():
+                pool.release(bpq.popleft())
+        assert pool.misses == 4
+        assert pool.hits == 8
+
+
 class TestDllIterator:
     def test_constructor(self) -> None:
         dlist = Dllist("head")
@@ -145,6 +390,40 @@ class TestDllIterator:
         iterator = iter(dlist)
         assert iterator is iterator.__iter__()
 
+    def test_reversed(self) -> None:
+        dlist: Dllist[int] = Dllist(0)
+        assert list(reversed(dlist)) == []
+        for i in range(4):
+            dlist.append(Dllink(i))
+        assert [node.data for node in reversed(dlist)] == [3, 2, 1, 0]
+
+    def test_detach_during_iteration(self) -> None:
+        dlist: Dllist[int] = Dllist(0)
+        for i in range(6):
+            dlist.append(Dllink(i))
+        for node in dlist:
+            if node.data % 3 == 0:
+                node.detach()
+        assert [node.data for node in dlist] == [1, 2, 4, 5]
+        for node in reversed(dlist):
+            if node.data > 3:
+                node.detach()
+        assert [node.data for node in dlist] == [1, 2]
+
+    def test_iter_from(self) -> None:
+        dlist: Dllist[int] = Dllist(0)
+        nodes = [Dllink(i) for i in range(5)]
+        for node in nodes:
+            dlist.append(node)
+        assert [node.data for node in dlist.iter_from(nodes[3])] == [3, 4]
+        assert [node.data for node in dlist.iter_from(dlist.head)] == [0, 1, 2, 3, 4]
+        other: Dllist[int] = Dllist(0)
+        for node in dlist.iter_from(nodes[1]):
+            node.detach()
+            other.append(node)
+        assert [node.data for node in dlist] == [0]
+        assert [node.data for node in other] == [1, 2, 3, 4]
+
 
 class TestDllistProperties:
     """Property-based tests for Dllist using Hypothesis."""
@@ -328,3 +607,99 @@ class TestDllinkProperties:
                     if middle > 0
                     else links[-1]
                 )
+
+
+class TestDllPool:
+    def test_constructor(self) -> None:
+        pool: DllPool[int] = DllPool(3, 5)
+        assert pool.capacity() == 5
+        assert all(pool.is_empty(lst) for lst in range(3))
+
+    def test_list_operations(self) -> None:
+        pool: DllPool[str] = DllPool(2)
+        handles = {x: pool.alloc(x) for x in "abcd"}
+        pool.append(0, handles["b"])
+        pool.appendleft(0, handles["a"])
+        pool.append(0, handles["c"])
+        pool.append(1, handles["d"])
+        assert [pool.get_data(h) for h in pool.iter_list(0)] == ["a", "b", "c"]
+        pool.detach(handles["b"])
+        assert [pool.get_data(h) for h in pool.iter_list(0)] == ["a", "c"]
+        assert pool.get_data(pool.pop(0)) == "c"
+        assert pool.get_data(pool.popleft(0)) == "a"
+        assert pool.is_empty(0)
+        assert not pool.is_empty(1)
+        pool.clear(1)
+        assert pool.is_empty(1)
+
+    def test_free_list_reuse(self) -> None:
+        pool: DllPool[int] = DllPool(1, 2)
+        a = pool.alloc(1)
+        b = pool.alloc(2)
+        assert (a, b) == (1, 2)
+        pool.append(0, a)
+        pool.free(b)
+        c = pool.alloc(3)
+        assert c == b
+        assert pool.get_data(c) == 3
+        assert pool.is_locked(c)
+        d = pool.alloc(4)  # grows
+        assert pool.capacity() == 3
+        assert d == 3
+        with pytest.raises(AssertionError):
+            pool.free(a)  # still in a list
+        pool.free(pool.popleft(0))
+        assert pool.alloc(5) == a
+
+    def test_lock_and_set_data(self) -> None:
+        pool: DllPool[int] = DllPool(1)
+        h = pool.alloc(1)
+        pool.append(0, h)
+        pool.set_data(h, 7)
+        assert pool.get_data(h) == 7
+        pool.detach(h)
+        pool.lock(h)
+        assert pool.is_locked(h)
+        pool.free(h)
+
+    def test_steady_state_no_growth(self) -> None:
+        pool: DllPool[int] = DllPool(4, 8)
+        for step in range(1000):
+            lst = step % 4
+            pool.append(lst, pool.alloc(step))
+            if step >= 4:
+                pool.free(pool.popleft((step + 1) % 4))
+        assert pool.capacity() == 8
+
+    def test_iter_list_detach(self) -> None:
+        pool: DllPool[int] = DllPool(1)
+        for i in range(4):
+            pool.append(0, pool.alloc(i))
+        for h in pool.iter_list(0):
+            pool.detach(h)
+        assert pool.is_empty(0)
+
+
+@given(
+    st.lists(
+        st.tuples(
+            st.sampled_from(["append", "appendleft", "popleft", "pop"]),
+            st.integers(min_value=0, max_value=2),
+            st.integers(),
+        ),
+        max_size=60,
+    )
+)
+def test_dllpool_matches_deques(ops) -> None:
+    pool: DllPool[int] = DllPool(3)
+    models = [deque(), deque(), deque()]
+    for op, lst, value in ops:
+        if op in ("append", "appendleft"):
+            getattr(pool, op)(lst, pool.alloc(value))
+            getattr(models[lst], op)(value)
+        elif models[lst]:
+            h = getattr(pool, op)(lst)
+            assert pool.get_data(h) == getattr(models[lst], op)()
+            pool.free(h)
+        for i in range(3):
+            assert [pool.get_data(h) for h in pool.iter_list(i)] == list(models[i])
@@ -0,0 +1,163 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from mywheel.dllist import Dllink
+from mywheel.indexed_dllist import IndexedDllist
+
+
+def check_index(dlist: IndexedDllist) -> None:
+    """Check every level of the skip list against the positions of the nodes."""
+    pos = {id(node): i + 1 for i, node in enumerate(dlist)}
+    assert len(dlist) == len(pos)
+    top = dlist._top
+    for level in range(len(top.nxt)):
+        t = top
+        at = 0
+        while True:
+            nxt = t.nxt[level]
+            assert nxt.prv[level] is t
+            end = len(pos) + 1 if nxt is top else pos[id(nxt.node)]
+            assert t.width[level] == end - at
+            if nxt is top:
+                break
+            t, at = nxt, end
+
+
+class TestIndexedDllist:
+    def make(self, n: int, seed: int = 0) -> tuple:
+        dlist: IndexedDllist[int] = IndexedDllist(-1, seed=seed)
+        nodes = [Dllink(i) for i in range(n)]
+        dlist.extend(nodes)
+        return dlist, nodes
+
+    def test_at_and_index(self) -> None:
+        dlist, nodes = self.make(200)
+        check_index(dlist)
+        for i, node in enumerate(nodes):
+            assert dlist.at(i) is node
+            assert dlist.index(node) == i
+        assert dlist.at(-1) is nodes[-1]
+
+    def test_at_out_of_range(self) -> None:
+        dlist, _ = self.make(3)
+        with pytest.raises(IndexError):
+            dlist.at(3)
+        with pytest.raises(IndexError):
+            dlist.at(-4)
+        with pytest.raises(IndexError):
+            dlist.split_at(4)
+
+    def test_detach_and_pop(self) -> None:
+        dlist, nodes = self.make(50)
+        dlist.detach(nodes[10])
+        assert dlist.popleft() is nodes[0]
+        assert dlist.pop() is nodes[-1]
+        check_index(dlist)
+        assert len(dlist) == 47
+        assert dlist.at(9) is nodes[11]
+        assert dlist.index(nodes[-2]) == 46
+
+    def test_split_at(self) -> None:
+        dlist, nodes = self.make(100, seed=3)
+        right = dlist.split_at(40)
+        check_index(dlist)
+        check_index(right)
+        assert [node.data for node in dlist] == list(range(40))
+        assert [node.data for node in right] == list(range(40, 100))
+        assert right.index(nodes[70]) == 30
+        right.append(Dllink(100))
+        dlist.append(right.popleft())
+        check_index(dlist)
+        check_index(right)
+        assert dlist.at(40).data == 40
+
+    def test_split_at_ends(self) -> None:
+        dlist, _ = self.make(5)
+        empty = dlist.split_at(5)
+        assert len(empty) == 0 and empty.is_empty()
+        everything = dlist.split_at(0)
+        assert len(dlist) == 0 and dlist.is_empty()
+        assert [node.data for node in everything] == [0, 1, 2, 3, 4]
+        check_index(everything)
+
+    def test_split_after(self) -> None:
+        dlist, nodes = self.make(6)
+        right = dlist.split_after(nodes[2])
+        assert [node.data for node in right] == [3, 4, 5]
+        assert len(dlist) == 3
+
+    def test_reindex(self) -> None:
+        dlist, nodes = self.make(30)
+        nodes[5].detach()
+        nodes[6].detach()
+        dlist.head.attach(nodes[6])
+        dlist.reindex()
+        check_index(dlist)
+        assert len(dlist) == 29
+        assert dlist.at(0) is nodes[6]
+        assert dlist.index(nodes[7]) == 6
+
+    def test_sort_splice_clear(self) -> None:
+        dlist: IndexedDllist[int] = IndexedDllist(0)
+        dlist.extend(Dllink(v) for v in [5, 2, 8, 1])
+        dlist.sort()
+        dlist.insert_sorted(Dllink(4))
+        check_index(dlist)
+        assert [dlist.at(i).data for i in range(5)] == [1, 2, 4, 5, 8]
+        other: IndexedDllist[int] = IndexedDllist(0)
+        other.extend([Dllink(9)])
+        dlist.splice(other)
+        assert len(other) == 0
+        assert dlist.at(5).data == 9
+        check_index(dlist)
+        dlist.clear()
+        assert len(dlist) == 0
+        check_index(dlist)
+
+
+@given(
+    st.lists(
+        st.tuples(
+            st.sampled_from(
+                ["append", "appendleft", "pop", "popleft", "detach", "split"]
+            ),
+            st.integers(min_value=0, max_value=1000),
+        ),
+        max_size=80,
+    ),
+    st.integers(min_value=0, max_value=10),
+)
+def test_matches_list(ops, seed) -> None:
+    dlist: IndexedDllist[int] = IndexedDllist(-1, seed=seed)
+    model = []
+    for count, (op, value) in enumerate(ops):
+        if op == "append":
+            node = Dllink(count)
+            dlist.append(node)
+            model.append(node)
+        elif op == "appendleft":
+            node = Dllink(count)
+            dlist.appendleft(node)
+            model.insert(0, node)
+        elif not model:
+            continue
+        elif op == "pop":
+            assert dlist.pop() is model.pop()
+        elif op == "popleft":
+            assert dlist.popleft() is model.pop(0)
+        elif op == "detach":
+            dlist.detach(model.pop(value % len(model)))
+        else:
+            cut = value % (len(model) + 1)
+            right = dlist.split_at(cut)
+            assert list(right) == model[cut:]
+            if value % 2:
+                dlist, model = right, model[cut:]
+            else:
+                model = model[:cut]
+        check_index(dlist)
+        assert len(dlist) == len(model)
+        for i, node in enumerate(model):
+            assert dlist.at(i) is node
+            assert dlist.index(node) == i
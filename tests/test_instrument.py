@@ -0,0 +1,154 @@
+import json
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+from mywheel.bpqueue import BPQueue
+from mywheel.dllist import Dllink
+from mywheel.instrument import InstrumentedBPQueue, InstrumentedDllist, OpStats
+
+
+class TestOpStats:
+    def test_record_and_reset(self) -> None:
+        stats = OpStats()
+        stats.record("append", 3)
+        stats.record("append", 0)
+        stats.record_scan(4)
+        stats.record_scan(2)
+        assert stats.ops == {"append": 2}
+        assert stats.buckets_scanned == 6
+        assert stats.max_scan == 4
+        assert stats.max_moves == {3: 1, 0: 1}
+        stats.reset()
+        assert stats.to_dict() == {
+            "ops": {},
+            "buckets_scanned": 0,
+            "max_scan": 0,
+            "max_moves": {},
+        }
+
+    def test_to_json(self) -> None:
+        stats = OpStats()
+        stats.record("popleft", -2)
+        data = json.loads(stats.to_json(indent=2))
+        assert data["ops"] == {"popleft": 1}
+        assert data["max_moves"] == {"-2": 1}
+
+
+class TestInstrumentedBPQueue:
+    def test_counts(self) -> None:
+        bpq = InstrumentedBPQueue(-3, 3)
+        a = Dllink([0, 1])
+        b = Dllink([0, 2])
+        bpq.append(a, 0)
+        bpq.appendleft(b, 2)
+        bpq.modify_key(a, 3)  # increase_key
+        bpq.modify_key(a, -1)  # decrease_key
+        bpq.modify_key(a, 0)  # no change, not counted
+        bpq.detach(b)
+        bpq.popleft()
+        assert bpq.stats.ops == {
+            "append": 1,
+            "appendleft": 1,
+            "increase_key": 1,
+            "decrease_key": 1,
+            "detach": 1,
+            "popleft": 1,
+        }
+        assert bpq.is_empty()
+        assert sum(bpq.stats.max_moves.values()) == 6
+
+    def test_scan_lengths(self) -> None:
+        bpq = InstrumentedBPQueue(0, 9)
+        nodes = [Dllink([0, i]) for i in range(2)]
+        bpq.append(nodes[0], 9)
+        bpq.append(nodes[1], 0)
+        bpq.popleft()  # walks from 10 down to 1
+        assert bpq.stats.max_scan == 10
+        bpq.stats.reset()
+        bpq.popleft()  # walks from 1 down to the sentinel
+        assert bpq.stats.buckets_scanned == 2
+
+    def test_shared_stats(self) -> None:
+        stats = OpStats()
+        bpq1 = InstrumentedBPQueue(-3, 3, stats)
+        bpq2 = InstrumentedBPQueue(-3, 3, stats)
+        dl = InstrumentedDllist(0, stats)
+        bpq1.append(Dllink([0, 1]), 1)
+        bpq2.append(Dllink([0, 2]), 1)
+        dl.append(bpq1.popleft())
+        assert stats.ops == {"append": 3, "popleft": 1}
+
+    def test_extend_and_modify_keys(self) -> None:
+        bpq = InstrumentedBPQueue(-3, 3)
+        nodes = [Dllink([0, i]) for i in range(3)]
+        bpq.extend(nodes, [1, 2, 3])
+        bpq.modify_keys(nodes, [-1, -1, -5])
+        bpq.clear()
+        assert bpq.stats.ops == {"extend": 1, "modify_keys": 1, "clear": 1}
+        assert bpq.stats.to_dict()["max_moves"] == {-5: 1, -2: 1, 7: 1}
+
+    def test_merge_bucket(self) -> None:
+        bpq = InstrumentedBPQueue(-3, 3)
+        bpq.extend([Dllink([0, i]) for i in range(2)], [3, 1])
+        bpq.merge_bucket(3, -2)
+        assert bpq.stats.ops == {"extend": 1, "merge_bucket": 1}
+        assert bpq.get_max() == 1
+
+
+class TestInstrumentedDllist:
+    def test_counts(self) -> None:
+        dl = InstrumentedDllist(0)
+        dl.append(Dllink(1))
+        dl.appendleft(Dllink(2))
+        assert dl.popleft().data == 2
+        assert dl.pop().data == 1
+        dl.clear()
+        assert dl.stats.ops == {
+            "append": 1,
+            "appendleft": 1,
+            "popleft": 1,
+            "pop": 1,
+            "clear": 1,
+        }
+
+    def test_splice_and_split(self) -> None:
+        dl = InstrumentedDllist(0)
+        other = InstrumentedDllist(0, dl.stats)
+        node = Dllink(1)
+        dl.append(node)
+        other.append(Dllink(2))
+        dl.splice(other)
+        tail = dl.split_after(node)
+        assert tail.stats is dl.stats
+        assert [n.data for n in tail] == [2]
+        assert dl.stats.ops == {"append": 2, "splice": 1, "split_after": 1}
+
+    def test_extend(self) -> None:
+        dl = InstrumentedDllist(0)
+        dl.extend([Dllink(1), Dllink(2)])
+        assert [n.data for n in dl] == [1, 2]
+        assert dl.stats.ops == {"extend": 1}
+
+    def test_sort(self) -> None:
+        dl = InstrumentedDllist(0)
+        dl.extend([Dllink(2), Dllink(1)])
+        dl.sort()
+        dl.insert_sorted(Dllink(3))
+        assert [n.data for n in dl] == [1, 2, 3]
+        assert dl.stats.ops == {"extend": 1, "sort": 1, "insert_sorted": 1}
+
+
+@given(st.lists(st.integers(min_value=-5, max_value=5), min_size=1, max_size=30))
+def test_same_order_as_bpqueue(keys) -> None:
+    plain = BPQueue(-5, 5)
+    inst = InstrumentedBPQueue(-5, 5)
+    for i, key in enumerate(keys):
+        plain.append(Dllink([0, i]), key)
+        inst.append(Dllink([0, i]), key)
+    assert [it.data for it in plain] == [it.data for it in inst]
+    while not plain.is_empty():
+        assert plain.popleft().data == inst.popleft().data
+    assert inst.is_empty()
+    assert inst.stats.ops["popleft"] == len(keys)
+    assert inst.stats.max_scan <= 12
@@ -0,0 +1,213 @@
+from hypothesis import given
+from hypothesis import strategies as st
+
+from mywheel.dllist import Dllink
+from mywheel.journal import Journal, JournaledBPQueue, JournaledDllist
+
+
+def snapshot(bpq: JournaledBPQueue, waiting: JournaledDllist) -> tuple:
+    return (
+        bpq.get_max(),
+        [(it.data[1], it.data[0]) for it in bpq],
+        [node.data[1] for node in waiting],
+    )
+
+
+class TestJournal:
+    def test_empty_rollback(self) -> None:
+        journal = Journal()
+        cp = journal.checkpoint()
+        journal.rollback(cp)
+        assert len(journal) == cp
+
+    def test_shared_journal(self) -> None:
+        journal = Journal()
+        bpq = JournaledBPQueue(-5, 5, journal)
+        waiting = JournaledDllist([0, -1], journal)
+        nodes = [Dllink([0, i]) for i in range(4)]
+        bpq.extend(nodes, [2, -1, 2, 0])
+        before = snapshot(bpq, waiting)
+
+        cp = journal.checkpoint()
+        moved = bpq.popleft()
+        moved.lock()
+        waiting.append(moved)
+        bpq.modify_key(nodes[1], 4)
+        bpq.detach(nodes[3])
+        assert len(journal) == cp + 4
+
+        journal.rollback(cp)
+        assert snapshot(bpq, waiting) == before
+        assert len(journal) == cp
+
+    def test_nested_checkpoints(self) -> None:
+        bpq = JournaledBPQueue(-5, 5)
+        waiting = JournaledDllist([0, -1], bpq.journal)
+        nodes = [Dllink([0, i]) for i in range(3)]
+        bpq.extend(nodes, [1, 2, 3])
+        cp1 = bpq.checkpoint()
+        waiting.append(bpq.popleft())
+        state1 = snapshot(bpq, waiting)
+        cp2 = bpq.checkpoint()
+        waiting.appendleft(bpq.popleft())
+        waiting.pop()
+        bpq.rollback(cp2)
+        assert snapshot(bpq, waiting) == state1
+        waiting.clear()
+        bpq.clear()
+        assert bpq.is_empty()
+        bpq.rollback(cp1)
+        assert [it.data[1] for it in bpq] == [2, 1, 0]
+        assert waiting.is_empty()
+
+    def test_clear_commits(self) -> None:
+        bpq = JournaledBPQueue(-5, 5)
+        bpq.append(Dllink([0, 1]), 3)
+        bpq.journal.clear()
+        assert bpq.checkpoint() == 0
+        assert bpq.get_max() == 3
+
+    def test_splice_and_split(self) -> None:
+        waiting = JournaledDllist(0)
+        other = JournaledDllist(0, waiting.journal)
+        nodes = [Dllink(i) for i in range(5)]
+        for node in nodes[:2]:
+            waiting.append(node)
+        for node in nodes[2:]:
+            other.append(node)
+        cp = waiting.checkpoint()
+        waiting.splice(other)
+        assert [node.data for node in waiting] == [0, 1, 2, 3, 4]
+        assert other.is_empty()
+        tail = waiting.split_after(nodes[0])
+        assert tail.journal is waiting.journal
+        assert [node.data for node in waiting] == [0]
+        assert [node.data for node in tail] == [1, 2, 3, 4]
+        waiting.rollback(cp)
+        assert [node.data for node in waiting] == [0, 1]
+        assert [node.data for node in other] == [2, 3, 4]
+        assert tail.is_empty()
+
+    def test_extend_rollback(self) -> None:
+        waiting = JournaledDllist(0)
+        waiting.append(Dllink(1))
+        cp = waiting.checkpoint()
+        waiting.extend([Dllink(2), Dllink(3)])
+        assert [node.data for node in waiting] == [1, 2, 3]
+        waiting.rollback(cp)
+        assert [node.data for node in waiting] == [1]
+
+    def test_sort_rollback(self) -> None:
+        waiting = JournaledDllist(0)
+        waiting.extend([Dllink(v) for v in [3, 1, 2]])
+        cp = waiting.checkpoint()
+        waiting.sort()
+        waiting.insert_sorted(Dllink(0))
+        assert [node.data for node in waiting] == [0, 1, 2, 3]
+        waiting.rollback(cp)
+        assert [node.data for node in waiting] == [3, 1, 2]
+
+    def test_merge_bucket_rollback(self) -> None:
+        bpq = JournaledBPQueue(-5, 5)
+        nodes = [Dllink([0, i]) for i in range(4)]
+        bpq.extend(nodes, [4, 1, 4, -2])
+        before = [(it.data[1], it.data[0]) for it in bpq]
+        cp = bpq.checkpoint()
+        bpq.merge_bucket(4, -2)
+        assert bpq.get_max() == 1
+        assert [it.data[1] for it in bpq] == [1, 3, 0, 2]
+        bpq.rollback(cp)
+        assert bpq.get_max() == 4
+        assert [(it.data[1], it.data[0]) for it in bpq] == before
+
+    def test_reinsert_popped_rollback(self) -> None:
+        bpq = JournaledBPQueue(-5, 5)
+        a, b = Dllink([0, 4]), Dllink([0, 5])
+        bpq.extend([a, b], [0, 1])
+        before = [(it.data[1], it.data[0]) for it in bpq]
+        cp = bpq.checkpoint()
+        x = bpq.popleft()
+        bpq.decrease_key(x, 2)
+        assert [it.data[1] for it in bpq] == [4, 5]
+        bpq.rollback(cp)
+        assert bpq.get_max() == 1
+        assert [(it.data[1], it.data[0]) for it in bpq] == before
+
+    def test_reinsert_detached_rollback(self) -> None:
+        bpq = JournaledBPQueue(-5, 5)
+        a = Dllink([0, 3])
+        bpq.append(a, 0)
+        cp = bpq.checkpoint()
+        bpq.detach(a)
+        bpq.increase_key(a, 1)
+        assert bpq.get_max() == 1
+        bpq.rollback(cp)
+        assert bpq.get_max() == 0
+        assert [(it.data[1], it.data[0]) for it in bpq] == [(3, 6)]
+
+    def test_reinsert_modify_keys_rollback(self) -> None:
+        bpq = JournaledBPQueue(-5, 5)
+        a, b = Dllink([0, 4]), Dllink([0, 5])
+        bpq.extend([a, b], [0, 1])
+        before = [(it.data[1], it.data[0]) for it in bpq]
+        cp = bpq.checkpoint()
+        x = bpq.popleft()
+        bpq.modify_keys([x, a], [1, 2])
+        assert [it.data[1] for it in bpq] == [4, 5]
+        bpq.rollback(cp)
+        assert bpq.get_max() == 1
+        assert [(it.data[1], it.data[0]) for it in bpq] == before
+
+
+class TestJournalProperties:
+    @given(
+        st.lists(st.integers(min_value=-5, max_value=5), min_size=1, max_size=10),
+        st.lists(
+            st.tuples(
+                st.sampled_from(["move", "modify", "detach", "batch", "merge"]),
+                st.integers(min_value=0, max_value=9),
+                st.integers(min_value=-3, max_value=3),
+            ),
+            max_size=30,
+        ),
+        st.integers(min_value=0, max_value=30),
+    )
+    def test_rollback_restores_state_property(
+        self, keys: list[int], ops: list[tuple[str, int, int]], split: int
+    ) -> None:
+        """Rolling back should restore the exact bucket order, keys and waiting list."""
+        bpq = JournaledBPQueue(-5, 5)
+        waiting = JournaledDllist([0, -1], bpq.journal)
+        nodes = [Dllink([0, i]) for i in range(len(keys))]
+        bpq.extend(nodes, keys)
+
+        def apply(op: str, i: int, delta: int) -> None:
+            node = nodes[i % len(nodes)]
+            in_queue = node.next is not node
+            if op == "move" and not bpq.is_empty():
+                moved = bpq.popleft()
+                moved.lock()
+                waiting.append(moved)
+            elif op == "modify" and in_queue:
+                if 0 < node.data[0] + delta <= 11:
+                    bpq.modify_key(node, delta)
+            elif op == "detach" and in_queue:
+                bpq.detach(node)
+                node.lock()
+            elif op == "merge" and in_queue:
+                if 0 < node.data[0] + delta <= 11:
+                    src = node.data[0] + bpq._offset
+                    bpq.merge_bucket(src, src + delta)
+            elif op == "batch":
+                batch = [n for n in nodes if n.next is not n]
+                deltas = [delta if 0 < n.data[0] + delta <= 11 else 0 for n in batch]
+                bpq.modify_keys(batch, deltas)
+
+        for op in ops[:split]:
+            apply(*op)
+        before = snapshot(bpq, waiting)
+        cp = bpq.checkpoint()
+        for op in ops[split:]:
+            apply(*op)
+        bpq.rollback(cp)
+        assert snapshot(bpq, waiting) == before
@@ -0,0 +1,139 @@
+from hypothesis import given
+from hypothesis import strategies as st
+
+from mywheel.bpqueue import BPQueue
+from mywheel.dllist import Dllink, Dllist
+from mywheel.multi_dllist import MultiDllink, MultiDllist
+
+
+class TestMultiDllink:
+    def test_new_node_is_locked(self) -> None:
+        node = MultiDllink("a")
+        assert node.is_locked() and node.is_locked(1)
+        assert isinstance(node, Dllink)
+
+    def test_slots_are_independent(self) -> None:
+        a = MultiDllink(1)
+        b = MultiDllink(2)
+        c = MultiDllink(3)
+        a.attach(b, 0)
+        a.attach(c, 1)
+        assert a.next is b and a.next1 is c
+        b.detach(0)
+        assert a.is_locked(0)
+        assert a.next1 is c and c.prev1 is a
+        c.lock(1)
+        assert c.is_locked(1)
+
+    def test_in_dllist(self) -> None:
+        lst: Dllist = Dllist(0)
+        part = MultiDllist(0, slot=1)
+        nodes = [MultiDllink(i) for i in range(3)]
+        lst.extend(nodes)
+        part.extend(nodes)
+        nodes[1].detach()
+        lst.appendleft(nodes[1])
+        assert [node.data for node in lst] == [1, 0, 2]
+        assert [node.data for node in part] == [0, 1, 2]
+
+
+class TestMultiDllinkInBPQueue:
+    def test_gain_bucket_and_partition_list(self) -> None:
+        """A cell sits in a gain bucket and in the list of its partition at once."""
+        bpq = BPQueue(-3, 3)
+        parts = [MultiDllist([0, -1], slot=1) for _ in range(2)]
+        cells = [MultiDllink([0, i]) for i in range(4)]
+        bpq.extend(cells, [2, -1, 0, 2])
+        for cell in cells:
+            parts[cell.data[1] % 2].append(cell)
+        bpq.modify_key(cells[1], 3)
+        bpq.decrease_key(cells[0], 3)
+        assert [cell.data[1] for cell in bpq] == [1, 3, 2, 0]
+        moved = bpq.popleft()
+        assert moved is cells[1]
+        parts[1].detach(moved)  # move the cell to the other partition
+        parts[0].append(moved)
+        assert [cell.data[1] for cell in parts[0]] == [0, 2, 1]
+        assert [cell.data[1] for cell in parts[1]] == [3]
+        assert [cell.data[1] for cell in bpq] == [3, 2, 0]
+        bpq.detach(cells[2])
+        assert [cell.data[1] for cell in bpq] == [3, 0]
+        assert [cell.data[1] for cell in parts[0]] == [0, 2, 1]
+
+
+class TestMultiDllist:
+    def test_two_lists_share_nodes(self) -> None:
+        bucket = MultiDllist(0, slot=0)
+        part = MultiDllist(0, slot=1)
+        nodes = [MultiDllink(i) for i in range(4)]
+        bucket.extend(nodes)
+        part.extend(reversed(nodes))
+        assert [node.data for node in bucket] == [0, 1, 2, 3]
+        assert [node.data for node in part] == [3, 2, 1, 0]
+        bucket.detach(nodes[1])
+        part.detach(nodes[2])
+        assert [node.data for node in bucket] == [0, 2, 3]
+        assert [node.data for node in part] == [3, 1, 0]
+        assert [node.data for node in reversed(bucket)] == [3, 2, 0]
+
+    def test_pop_and_clear(self) -> None:
+        lst = MultiDllist(0, slot=1)
+        a = MultiDllink(1)
+        b = MultiDllink(2)
+        lst.append(a)
+        lst.appendleft(b)
+        assert lst.popleft() is b
+        assert lst.pop() is a
+        assert lst.is_empty()
+        lst.append(a)
+        lst.clear()
+        assert lst.is_empty()
+
+    def test_move_between_lists_of_one_slot(self) -> None:
+        gain = [MultiDllist(0, slot=0) for _ in range(2)]
+        part = MultiDllist(0, slot=1)
+        cell = MultiDllink("c")
+        gain[0].append(cell)
+        part.append(cell)
+        gain[0].detach(cell)
+        gain[1].appendleft(cell)
+        assert gain[0].is_empty()
+        assert list(gain[1]) == [cell]
+        assert list(part) == [cell]
+
+    def test_detach_during_iteration(self) -> None:
+        lst = MultiDllist(0)
+        lst.extend(MultiDllink(i) for i in range(6))
+        for node in lst:
+            if node.data % 2:
+                lst.detach(node)
+        assert [node.data for node in lst] == [0, 2, 4]
+
+
+@given(
+    st.lists(
+        st.tuples(st.sampled_from(["append", "appendleft", "detach"]), st.booleans()),
+        max_size=60,
+    )
+)
+def test_matches_python_lists(ops) -> None:
+    lists = [MultiDllist(0, slot=0), MultiDllist(0, slot=1)]
+    models: list = [[], []]
+    for count, (op, second) in enumerate(ops):
+        slot = 1 if second else 0
+        if op == "detach":
+            if models[slot]:
+                node = models[slot].pop(count % len(models[slot]))
+                lists[slot].detach(node)
+            continue
+        node = MultiDllink(count)
+        for s in (0, 1):  # every new node joins both lists
+            if op == "append":
+                lists[s].append(node)
+                models[s].append(node)
+            else:
+                lists[s].appendleft(node)
+                models[s].insert(0, node)
+    for lst, model in zip(lists, models):
+        assert list(lst) == model
+        assert list(reversed(lst)) == model[::-1]
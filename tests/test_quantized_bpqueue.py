@@ -0,0 +1,102 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from mywheel.dllist import Dllink
+from mywheel.quantized_bpqueue import QuantizedBPQueue
+
+
+class TestQuantizedBPQueue:
+    def test_constructor(self) -> None:
+        qpq = QuantizedBPQueue(-2.0, 2.0, 0.5)
+        assert qpq.is_empty()
+        assert qpq.get_range() == (0, 8)
+        assert qpq.get_resolution() == 0.5
+
+    def test_approximate_order(self) -> None:
+        qpq = QuantizedBPQueue(0.0, 1.0, 0.1)
+        nodes = [Dllink([0, i, 0.0]) for i in range(3)]
+        for node, key in zip(nodes, [0.51, 0.58, 0.2]):
+            qpq.append(node, key)
+        # same slice: FIFO, not exact
+        assert qpq.popleft() is nodes[0]
+        assert qpq.popleft() is nodes[1]
+        assert qpq.popleft() is nodes[2]
+        assert qpq.is_empty()
+
+    def test_exact_tie_break(self) -> None:
+        qpq = QuantizedBPQueue(0.0, 1.0, 0.1, exact=True)
+        nodes = [Dllink([0, i, 0.0]) for i in range(4)]
+        for node, key in zip(nodes, [0.51, 0.58, 0.55, 0.58]):
+            qpq.appendleft(node, key)
+        assert qpq.get_max() == 0.58
+        assert qpq.popleft() is nodes[3]
+        assert qpq.popleft() is nodes[1]
+        assert qpq.popleft() is nodes[2]
+        assert qpq.popleft() is nodes[0]
+
+    def test_modify_key_and_detach(self) -> None:
+        qpq = QuantizedBPQueue(-1.0, 1.0, 0.25, exact=True)
+        a = Dllink([0, 1, 0.0])
+        b = Dllink([0, 2, 0.0])
+        qpq.append(a, -0.9)
+        qpq.append(b, 0.3)
+        qpq.modify_key(a, 1.5)
+        assert a.data[2] == -0.9 + 1.5
+        assert qpq.popleft() is a
+        qpq.modify_key(b, -0.01)  # same slice, stays in place
+        assert qpq.get_max() == 0.3 - 0.01
+        qpq.detach(b)
+        assert qpq.is_empty()
+
+    def test_out_of_range(self) -> None:
+        qpq = QuantizedBPQueue(-1.0, 1.0, 0.25)
+        a = Dllink([0, 1, 0.0])
+        with pytest.raises(AssertionError):
+            qpq.append(a, 1.6)
+        with pytest.raises(AssertionError):
+            qpq.appendleft(a, -1.1)
+        qpq.append(a, 1.0)  # both bounds are inclusive
+        qpq.appendleft(Dllink([0, 2, 0.0]), -1.0)
+        with pytest.raises(AssertionError):
+            qpq.modify_key(a, 0.5)
+        assert a.data[2] == 1.0
+        assert qpq.popleft() is a
+
+    def test_locked(self) -> None:
+        qpq = QuantizedBPQueue(0.0, 1.0, 0.1)
+        a = Dllink([0, 1, 0.5])
+        a.lock()
+        qpq.modify_key(a, 0.2)
+        assert a.data[2] == 0.5
+        assert qpq.is_empty()
+
+    def test_iter(self) -> None:
+        qpq = QuantizedBPQueue(0.0, 1.0, 0.1)
+        nodes = [Dllink([0, i, 0.0]) for i in range(3)]
+        for node, key in zip(nodes, [0.2, 0.9, 0.5]):
+            qpq.append(node, key)
+        assert [it.data[1] for it in qpq] == [1, 2, 0]
+
+
+@given(st.lists(st.floats(min_value=-5.0, max_value=5.0), min_size=1, max_size=50))
+def test_exact_matches_sorted(keys) -> None:
+    qpq = QuantizedBPQueue(-5.0, 5.0, 0.75, exact=True)
+    for i, key in enumerate(keys):
+        qpq.append(Dllink([0, i, 0.0]), key)
+    popped = [qpq.popleft().data[2] for _ in keys]
+    assert popped == sorted(keys, reverse=True)
+    assert qpq.is_empty()
+
+
+@given(st.lists(st.floats(min_value=-5.0, max_value=5.0), min_size=1, max_size=50))
+def test_approximate_within_resolution(keys) -> None:
+    qpq = QuantizedBPQueue(-5.0, 5.0, 0.75)
+    for i, key in enumerate(keys):
+        qpq.append(Dllink([0, i, 0.0]), key)
+    remaining = sorted(keys)
+    while remaining:
+        key = qpq.popleft().data[2]
+        assert remaining[-1] - key < 0.75
+        remaining.remove(key)
+    assert qpq.is_empty()
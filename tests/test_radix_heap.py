@@ -0,0 +1,75 @@
+import heapq
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from mywheel.dllist import Dllink
+from mywheel.radix_heap import RadixHeap
+
+
+class TestRadixHeap:
+    def test_constructor(self) -> None:
+        heap = RadixHeap(10)
+        assert heap.is_empty()
+        assert len(heap) == 0
+        assert heap.get_last() == 10
+
+    def test_push_pop(self) -> None:
+        heap = RadixHeap()
+        nodes = [Dllink([0, i]) for i in range(5)]
+        for node, key in zip(nodes, [10**12, 3, 3, 0, 77]):
+            heap.push(node, key)
+        popped = [heap.pop().data for _ in range(5)]
+        assert popped == [[0, 3], [3, 1], [3, 2], [77, 4], [10**12, 0]]
+        assert heap.is_empty()
+
+    def test_monotone(self) -> None:
+        heap = RadixHeap()
+        heap.push(Dllink([0, 0]), 5)
+        heap.pop()
+        with pytest.raises(AssertionError):
+            heap.push(Dllink([0, 1]), 4)
+
+    def test_decrease_key_and_detach(self) -> None:
+        heap = RadixHeap()
+        a = Dllink([0, 1])
+        b = Dllink([0, 2])
+        c = Dllink([0, 3])
+        heap.push(a, 50)
+        heap.push(b, 60)
+        heap.push(c, 70)
+        assert heap.get_min() == 50
+        heap.decrease_key(c, 55)
+        heap.detach(a)
+        assert len(heap) == 2
+        assert heap.pop() is c
+        assert heap.pop() is b
+        heap.push(a, 60)
+        heap.clear()
+        assert heap.is_empty()
+
+
+class TestRadixHeapProperties:
+    @given(
+        st.lists(
+            st.tuples(st.booleans(), st.integers(min_value=0, max_value=10**6)),
+            max_size=60,
+        )
+    )
+    def test_matches_heapq_property(self, ops: list[tuple[bool, int]]) -> None:
+        """RadixHeap should pop the same keys as heapq for monotone pushes."""
+        heap = RadixHeap()
+        ref: list[int] = []
+        for i, (pop, offset) in enumerate(ops):
+            if pop and ref:
+                assert heap.get_min() == ref[0]
+                assert heap.pop().data[0] == heapq.heappop(ref)
+            else:
+                key = heap.get_last() + offset
+                heap.push(Dllink([0, i]), key)
+                heapq.heappush(ref, key)
+            assert len(heap) == len(ref)
+        while ref:
+            assert heap.pop().data[0] == heapq.heappop(ref)
+        assert heap.is_empty()